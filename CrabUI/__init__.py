@@ -19,6 +19,41 @@ __version__ = '0.38'
 
 from .ui import *
 
+# 菜单和组件按需导入: 只有在第一次访问时才会编译/加载对应的模块
+# 例如只使用ListMenu的程序不会加载upbm和IconMenu
+_lazy_modules = {
+    'Label': 'label',
+    'DynamicLabel': 'label',
+    'ListMenu': 'list_menu',
+    'YScrollBar': 'list_menu',
+    'IconMenu': 'icon_menu',
+    'XScrollBar': 'icon_menu',
+    'Icon': 'icon_menu',
+    'CheckBox': 'widgets',
+    'ListSelect': 'widgets',
+    'NumSelect': 'widgets',
+    'NumRange': 'widgets',
+    'TextDialog': 'dialog',
+    'Chart': 'chart',
+}
+
+def __getattr__(name):
+    """
+    延迟导入菜单和组件
+
+    Args:
+        name: 属性名
+
+    Returns:
+        对应模块中的类
+    """
+    module = _lazy_modules.get(name)
+    if module is None:
+        raise AttributeError(name)
+    value = getattr(__import__(__name__ + '.' + module, None, None, (name,)), name)
+    globals()[name] = value  # 缓存, 下次访问不再经过__getattr__
+    return value
+
 
 """
    ______           __       __  ______
@@ -0,0 +1,341 @@
+"""
+canvas with a clip-rect stack
+last edited: 2025.8.27
+"""
+from .config import *
+from .libs import drawer
+from array import array
+import framebuf
+
+# 原生模块(见shapes目录), 在一次调用中绘制整个图形列表, 不存在时使用drawer.rasterize(结果相同)
+# 不存在时为ImportError, 为其他架构编译时为ValueError
+try:
+    from .libs import shapes
+except (ImportError, ValueError):
+    shapes = None
+
+class Canvas:
+    """
+    画布类, 在帧缓冲区上绘制时遵守裁剪矩形
+
+    组件通过画布绘制, 超出当前裁剪矩形的像素不会被绘制, 因此不再需要先绘制再用矩形遮挡
+    裁剪矩形可以嵌套(clip/unclip), 嵌套的裁剪矩形取交集
+    所有坐标都是屏幕坐标, 输出到帧缓冲区时y坐标加上原点oy(见begin)
+    """
+    def __init__(self, fbuf, w=display_w, h=display_h, buffer=None, fmt=framebuf.MONO_VLSB, buf_h=None):
+        """
+        初始化画布
+
+        Args:
+            fbuf: 目标帧缓冲区(FrameBuffer或兼容对象)
+            w: 宽度
+            h: 高度(屏幕)
+            buffer: 帧缓冲区的数据(默认为fbuf.buffer), 用于原生模块直接绘制
+            fmt: 帧缓冲区的格式
+            buf_h: 帧缓冲区的高度(默认与屏幕相同)
+        """
+        self.fbuf = fbuf
+        self.buffer = buffer if buffer is not None else getattr(fbuf, 'buffer', None)
+        self.fmt = fmt
+        self.w = w
+        self.h = h
+        self.buf_h = h if buf_h is None else buf_h
+        # 每层保存4个值(x0, y0, x1, y1), 预先分配, clip/unclip时不分配内存
+        self.stack = array('h', bytes(clip_depth*8))
+        self.depth = 0
+        # 当前裁剪矩形, 右边和下边不包括在内
+        self.x0 = 0
+        self.y0 = 0
+        self.x1 = w
+        self.y1 = h
+        self.oy = 0  # 原点: 屏幕的第y行绘制到帧缓冲区的第y+oy行
+        self.scratch = None  # 用于裁剪blit的临时缓冲区, 第一次需要时创建
+        self.char_fbuf = None  # 用于裁剪单个字符的缓冲区
+
+    def clip(self, x, y, w, h):
+        """
+        压入裁剪矩形(与当前的裁剪矩形取交集)
+
+        Args:
+            x: 左上角x坐标
+            y: 左上角y坐标
+            w: 宽度
+            h: 高度
+        """
+        depth = self.depth
+        if depth >= clip_depth:
+            raise IndexError('clip stack overflow')
+        stack = self.stack
+        i = depth*4
+        stack[i] = self.x0
+        stack[i+1] = self.y0
+        stack[i+2] = self.x1
+        stack[i+3] = self.y1
+        self.depth = depth+1
+        if x > self.x0: self.x0 = x
+        if y > self.y0: self.y0 = y
+        if x+w < self.x1: self.x1 = x+w
+        if y+h < self.y1: self.y1 = y+h
+
+    def clip_to(self, pos):
+        """
+        压入与Pos对象相同的裁剪矩形
+
+        Args:
+            pos: 位置对象
+        """
+        self.clip(pos.x, pos.y, pos.w, pos.h)
+
+    def unclip(self):
+        """弹出裁剪矩形"""
+        depth = self.depth-1
+        self.depth = depth
+        stack = self.stack
+        i = depth*4
+        self.x0 = stack[i]
+        self.y0 = stack[i+1]
+        self.x1 = stack[i+2]
+        self.y1 = stack[i+3]
+
+    def begin(self, y0=0, y1=None, oy=0):
+        """
+        清空裁剪矩形, 开始绘制屏幕上的一个区域
+
+        例如显示器使用起始行(start line)时, 或者分块(band)绘制时, 屏幕的一部分位于帧缓冲区中的其他位置
+
+        Args:
+            y0: 区域的上边(屏幕坐标)
+            y1: 区域的下边(不包括, 默认为屏幕高度)
+            oy: 原点, 屏幕的第y行绘制到帧缓冲区的第y+oy行
+        """
+        self.depth = 0
+        self.x0 = 0
+        self.y0 = y0
+        self.x1 = self.w
+        self.y1 = self.h if y1 is None else y1
+        self.oy = oy
+
+    def visible(self, x, y, w, h) -> bool:
+        """
+        判断矩形是否与当前裁剪矩形相交
+
+        Returns:
+            bool: 是否有像素需要绘制
+        """
+        return x < self.x1 and y < self.y1 and x+w > self.x0 and y+h > self.y0
+
+    def fill(self, c):
+        """
+        填充当前裁剪矩形
+
+        Args:
+            c: 颜色
+        """
+        self.fbuf.fill_rect(self.x0, self.y0+self.oy, self.x1-self.x0, self.y1-self.y0, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        """
+        填充矩形
+
+        Args:
+            x: 左上角x坐标
+            y: 左上角y坐标
+            w: 宽度
+            h: 高度
+            c: 颜色
+        """
+        x1 = x+w
+        y1 = y+h
+        if x < self.x0: x = self.x0
+        if y < self.y0: y = self.y0
+        if x1 > self.x1: x1 = self.x1
+        if y1 > self.y1: y1 = self.y1
+        if x < x1 and y < y1:
+            self.fbuf.fill_rect(x, y+self.oy, x1-x, y1-y, c)
+
+    def hline(self, x, y, w, c):
+        """绘制水平线"""
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        """绘制垂直线"""
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        """
+        绘制矩形
+
+        Args:
+            x: 左上角x坐标
+            y: 左上角y坐标
+            w: 宽度
+            h: 高度
+            c: 颜色
+            f: 是否填充
+        """
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y+h-1, w, 1, c)
+        self.fill_rect(x, y+1, 1, h-2, c)
+        self.fill_rect(x+w-1, y+1, 1, h-2, c)
+
+    def draw_shapes(self, shapes_list):
+        """
+        绘制图形列表(drawer.Shapes)
+
+        Args:
+            shapes_list: 图形列表
+        """
+        if shapes is not None and self.buffer is not None:
+            oy = self.oy
+            shapes.draw(self.buffer, self.fmt, self.w, self.buf_h, shapes_list.ops, shapes_list.count,
+                        self.x0, self.y0+oy, self.x1, self.y1+oy, oy)
+        else:
+            drawer.rasterize(self, shapes_list.ops, shapes_list.count)
+
+    def line(self, x1, y1, x2, y2, c):
+        """
+        绘制直线(水平和垂直线精确裁剪, 斜线使用Cohen-Sutherland算法裁剪)
+
+        Args:
+            x1: 起点x坐标
+            y1: 起点y坐标
+            x2: 终点x坐标
+            y2: 终点y坐标
+            c: 颜色
+        """
+        if y1 == y2:
+            if x1 > x2: x1, x2 = x2, x1
+            self.fill_rect(x1, y1, x2-x1+1, 1, c)
+            return
+        if x1 == x2:
+            if y1 > y2: y1, y2 = y2, y1
+            self.fill_rect(x1, y1, 1, y2-y1+1, c)
+            return
+        # 裁剪矩形内的坐标范围(包括边界)
+        cx0 = self.x0
+        cy0 = self.y0
+        cx1 = self.x1-1
+        cy1 = self.y1-1
+        while True:
+            code1 = (x1 < cx0) | (x1 > cx1) << 1 | (y1 < cy0) << 2 | (y1 > cy1) << 3
+            code2 = (x2 < cx0) | (x2 > cx1) << 1 | (y2 < cy0) << 2 | (y2 > cy1) << 3
+            if not code1 | code2:
+                self.fbuf.line(x1, y1+self.oy, x2, y2+self.oy, c)
+                return
+            if code1 & code2:
+                return
+            code = code1 if code1 else code2
+            if code & 8:
+                x = x1+(x2-x1)*(cy1-y1)//(y2-y1)
+                y = cy1
+            elif code & 4:
+                x = x1+(x2-x1)*(cy0-y1)//(y2-y1)
+                y = cy0
+            elif code & 2:
+                y = y1+(y2-y1)*(cx1-x1)//(x2-x1)
+                x = cx1
+            else:
+                y = y1+(y2-y1)*(cx0-x1)//(x2-x1)
+                x = cx0
+            if code == code1:
+                x1 = x
+                y1 = y
+            else:
+                x2 = x
+                y2 = y
+
+    def blit(self, src, x, y, w, h, key=-1):
+        """
+        绘制帧缓冲区
+
+        完全在裁剪矩形内时直接blit, 完全在外时跳过,
+        部分可见时借助临时缓冲区只绘制可见部分
+
+        Args:
+            src: 源帧缓冲区
+            x: 左上角x坐标
+            y: 左上角y坐标
+            w: 源的宽度
+            h: 源的高度
+            key: 透明色, -1表示不透明
+        """
+        x0 = self.x0
+        y0 = self.y0
+        x1 = self.x1
+        y1 = self.y1
+        if x >= x0 and y >= y0 and x+w <= x1 and y+h <= y1:
+            self.fbuf.blit(src, x, y+self.oy, key)
+            return
+        # 可见部分
+        if x > x0: x0 = x
+        if y > y0: y0 = y
+        if x+w < x1: x1 = x+w
+        if y+h < y1: y1 = y+h
+        if x0 >= x1 or y0 >= y1: return
+        self._blit_clipped(src, x, y, x0, y0, x1, y1, key)
+
+    def _blit_clipped(self, src, x, y, x0, y0, x1, y1, key):
+        """
+        只绘制源的一部分(x0, y0, x1, y1为屏幕上的可见区域)
+
+        framebuf无法直接blit源的一部分, 所以先把源blit到临时缓冲区, 让可见区域对齐到临时缓冲区的左上角,
+        再把可见区域以外的部分填充为透明色, 最后以透明色blit到屏幕上
+        不透明的blit先把可见区域清零, 再以0为透明色blit
+        """
+        scratch = self.scratch
+        if scratch is None:
+            scratch = self.scratch = framebuf.FrameBuffer(bytearray(display_w*clip_scratch_h//8),
+                                                          display_w, clip_scratch_h, framebuf.MONO_VLSB)
+        fbuf = self.fbuf
+        oy = self.oy
+        bg = key
+        if key < 0:
+            bg = 0
+            fbuf.fill_rect(x0, y0+oy, x1-x0, y1-y0, 0)
+        # 可见区域可能比临时缓冲区大, 按临时缓冲区的大小分块绘制
+        by = y0
+        while by < y1:
+            bh = y1-by
+            if bh > clip_scratch_h: bh = clip_scratch_h
+            bx = x0
+            while bx < x1:
+                bw = x1-bx
+                if bw > display_w: bw = display_w
+                scratch.fill(bg)
+                scratch.blit(src, x-bx, y-by, key)
+                if bw < display_w: scratch.fill_rect(bw, 0, display_w-bw, clip_scratch_h, bg)
+                if bh < clip_scratch_h: scratch.fill_rect(0, bh, bw, clip_scratch_h-bh, bg)
+                fbuf.blit(scratch, bx, by+oy, bg)
+                bx += bw
+            by += bh
+
+    def text(self, string, x, y, c=1):
+        """
+        使用内置8x8字体绘制文本
+
+        Args:
+            string: 文本
+            x: 左上角x坐标
+            y: 左上角y坐标
+            c: 颜色
+        """
+        w = len(string)*8
+        if x >= self.x0 and y >= self.y0 and x+w <= self.x1 and y+8 <= self.y1:
+            self.fbuf.text(string, x, y+self.oy, c)
+        elif self.visible(x, y, w, 8):
+            # 部分可见时逐个字符绘制, 跨过裁剪矩形边缘的字符先绘制到临时缓冲区再裁剪
+            for char in string:
+                if x >= self.x0 and y >= self.y0 and x+8 <= self.x1 and y+8 <= self.y1:
+                    self.fbuf.text(char, x, y+self.oy, c)
+                elif self.visible(x, y, 8, 8):
+                    char_fbuf = self.char_fbuf
+                    if char_fbuf is None:
+                        char_fbuf = self.char_fbuf = framebuf.FrameBuffer(bytearray(8), 8, 8, framebuf.MONO_VLSB)
+                    # 背景使用另一种颜色, 作为透明色
+                    char_fbuf.fill(1-c)
+                    char_fbuf.text(char, 0, 0, c)
+                    self.blit(char_fbuf, x, y, 8, 8, 1-c)
+                x += 8
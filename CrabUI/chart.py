@@ -0,0 +1,191 @@
+"""
+chart widget
+last edited: 2025.8.27
+"""
+from .config import *
+from .ui import BaseWidget
+from array import array
+import framebuf
+
+class Chart(BaseWidget):
+    """
+    实时曲线组件, 可以作为ListMenu的一行或放在自定义Page中
+
+    样本保存在固定大小的array环形缓冲区中, 曲线绘制在自己的缓冲区里, 每个样本占一列:
+    添加样本时缓冲区左移一列, 只绘制新的一列, 耗时与样本数无关;
+    自动缩放时只有纵轴的范围改变才重新绘制整条曲线
+    """
+    def __init__(self, parent, w: int | bool=False, h: int=chart_h, min_value=None, max_value=None,
+                 fill: bool=False, typecode: str='h', link=None, auto_add: bool=True, offset_pos: bool=True):
+        """
+        Args:
+            parent: 父组件
+            w: 宽度(也是保存的样本数), 默认为列表的宽度
+            h: 高度
+            min_value: 纵轴的最小值, None表示按可见的样本自动缩放
+            max_value: 纵轴的最大值, None表示按可见的样本自动缩放
+            fill: 是否填充曲线下方的区域
+            typecode: 样本的array类型, 例如'h'(16位整数), 'f'(小数)
+            link: 回调函数
+            auto_add: 是否自动将self添加到父组件
+            offset_pos: 是否按页面的相机偏移位置
+        """
+        super().__init__(parent, link)
+        self.type = 6
+        w = list_max_w-list_selector_left_gap*2 if w is False else w
+        pos = self.pos
+        pos.w = w
+        pos.h = h
+        self.samples = array(typecode, bytes(array(typecode).itemsize*w))
+        self.is_float = typecode in 'fd'
+        self.head = 0   # 下一个样本写入的位置
+        self.count = 0  # 已保存的样本数
+        self.fixed_min = min_value
+        self.fixed_max = max_value
+        self.lo = 0 if min_value is None else min_value
+        self.hi = 0 if max_value is None else max_value
+        self.min = self.max = 0  # 已保存的样本的最小值/最大值(自动缩放时使用)
+        self.last_y = -1
+        self.fill = fill
+        self.offset = offset_pos
+        self.buf = bytearray((w+7)//8*h)
+        self.fbuf = framebuf.FrameBuffer(self.buf, w, h, framebuf.MONO_HLSB)
+        self.redraws = 0  # 重新绘制整条曲线的次数
+        if auto_add: parent.add(self)
+
+    def value_y(self, value) -> int:
+        """
+        Args:
+            value: 样本
+
+        Returns:
+            int: 样本在缓冲区中的y坐标(超出纵轴范围时位于上下边缘)
+        """
+        lo = self.lo
+        span = self.hi-lo
+        bottom = self.pos.h-1
+        if span <= 0: return bottom >> 1
+        if value <= lo: return bottom
+        if value >= self.hi: return 0
+        return bottom-int((value-lo)*bottom//span)  # 整数样本只使用整数运算
+
+    def column(self, x, value):
+        """
+        绘制一列
+
+        Args:
+            x: x坐标
+            value: 样本
+        """
+        fbuf = self.fbuf
+        y = self.value_y(value)
+        if self.fill:
+            fbuf.vline(x, y, self.pos.h-y, 1)
+        else:
+            # 与上一列的点连成线
+            last = self.last_y
+            if last < 0: last = y
+            if last < y: fbuf.vline(x, last, y-last+1, 1)
+            else: fbuf.vline(x, y, last-y+1, 1)
+        self.last_y = y
+
+    def add(self, value):
+        """
+        添加一个样本
+
+        Args:
+            value: 样本
+        """
+        samples = self.samples
+        n = len(samples)
+        head = self.head
+        old = samples[head]
+        evicted = self.count == n
+        samples[head] = value
+        self.head = head+1 if head+1 < n else 0
+        if not evicted: self.count += 1
+        if self.fixed_min is None or self.fixed_max is None:
+            lo, hi = self.min, self.max
+            if self.count == 1:
+                lo = hi = value
+            else:
+                if value < lo: lo = value
+                elif value > hi: hi = value
+                # 移出的样本是最小值/最大值时, 重新计算范围
+                if evicted and (old <= lo or old >= hi):
+                    lo, hi = self.value_range()
+            self.min, self.max = lo, hi
+            # 固定的一端不参与缩放
+            if self.fixed_min is not None: lo = self.fixed_min
+            if self.fixed_max is not None: hi = self.fixed_max
+            # 超出纵轴范围, 或样本的范围不到纵轴的一半时才缩放; 缩放时(自动缩放的一端)留1/8的余量,
+            # 缓慢变化的数据不会每个样本都重新绘制
+            if self.count == 1 or lo < self.lo or hi > self.hi or (hi-lo)*2 < self.hi-self.lo:
+                margin = (hi-lo)/8 if self.is_float else (hi-lo)>>3
+                if self.fixed_min is None: lo -= margin
+                if self.fixed_max is None: hi += margin
+                if lo != self.lo or hi != self.hi:
+                    self.lo, self.hi = lo, hi
+                    self.redraw()
+                    return
+        fbuf = self.fbuf
+        x = self.pos.w-1
+        fbuf.scroll(-1, 0)
+        fbuf.vline(x, 0, self.pos.h, 0)  # scroll不会清除移出的一列
+        self.column(x, value)
+
+    def value_range(self) -> tuple:
+        """
+        Returns:
+            tuple: 已保存的样本的(最小值, 最大值)
+        """
+        samples = self.samples
+        n = len(samples)
+        i = self.head-self.count
+        if i < 0: i += n
+        lo = hi = samples[i]
+        for _ in range(self.count):
+            value = samples[i]
+            if value < lo: lo = value
+            elif value > hi: hi = value
+            i = i+1 if i+1 < n else 0
+        return lo, hi
+
+    def redraw(self):
+        """重新绘制整条曲线(纵轴范围改变时)"""
+        self.redraws += 1
+        self.fbuf.fill(0)
+        samples = self.samples
+        n = len(samples)
+        count = self.count
+        i = self.head-count
+        if i < 0: i += n
+        self.last_y = -1
+        # 最新的样本在最右侧
+        for x in range(self.pos.w-count, self.pos.w):
+            self.column(x, samples[i])
+            i = i+1 if i+1 < n else 0
+
+    def clear(self):
+        """清除所有样本"""
+        self.head = 0
+        self.count = 0
+        self.last_y = -1
+        self.fbuf.fill(0)
+
+    def assets(self) -> tuple:
+        """
+        Returns:
+            tuple: 没有加载时创建的缓存项, 见Label.assets
+        """
+        return ()
+
+    def update(self):
+        """更新曲线显示"""
+        pos = self.pos
+        x, y = pos.x, pos.y
+        if self.offset:
+            menu = self.manager.current_menu
+            x = menu.offset_x(x)
+            y = menu.offset_y(y)
+        self.manager.canvas.blit(self.fbuf, x, y, pos.w, pos.h, 0)
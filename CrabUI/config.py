@@ -74,6 +74,10 @@ widget_gap = const(2)
 # 显示器配置
 display_w = const(128)
 display_h = const(64)
+clip_depth = const(4)        # 裁剪矩形最多的嵌套层数
+clip_scratch_h = const(16)   # 裁剪blit使用的临时缓冲区高度(像素), 越大绘制部分可见的图像越快, 占用display_w*clip_scratch_h/8字节
+hw_scroll = const(False)     # 列表滚动时使用显示器的起始行(需要驱动支持set_start_line, 例如examples/oled.py), 减少需要发送的数据, 列表的行较宽时效果明显
+band_h = const(0)            # 分块绘制: 每次只绘制屏幕的band_h行并通过驱动的write_band发送(8的倍数), 帧缓冲区只占用display_w*band_h/8字节, 0为不分块
 
 ##########################################
 
@@ -81,6 +85,7 @@ display_h = const(64)
 # 字体配置
 font_size = const(12)
 font_path = 'files/output.bmf'
+glyph_cache_size = const(64)  # 缓存的字符点阵数量, 经常修改文本(set_text)时可以减少读取文件
 
 ##########################################
 
@@ -88,7 +93,9 @@ font_path = 'files/output.bmf'
 # 菜单配置
 menu_loop = const(True)
 check_fps = const(True)
+debug_alloc = const(False)  # 调试: 统计每一帧及每个阶段的内存分配, 并提示分配内存的位置
 icon_size = const(30)
+icon_keep_compressed = const(False)  # 压缩的图标(R4格式, 见tools/compress_assets.py)在内存中保持压缩, 每次绘制时解压, 图标较多时节省内存
 icon_selector_length = const(3)
 icon_dashline_split_length = const(3)  # 虚线每一段的长度
 
@@ -107,6 +114,9 @@ selector_fill = const(True)  # 是否将选择器填充
 # startup config
 # 启动配置
 show_startup_page = const(True)
+lazy_load = const(False)        # 启动时只加载第一个页面的文本和图标, 其他页面在第一次打开时(或预加载时)加载, 启动更快
+prefetch_per_frame = const(4)   # 选中的项目指向其他页面(item的page参数)时, 每个空闲帧预加载该页面的项目数, 0为不预加载
+unload_threshold = const(0)     # gc.mem_free()低于此值(字节)时, 切换页面前卸载不在屏幕上且不在历史记录中的页面的文本和图标(再次打开时重新加载), 0为不卸载
 logo_text = '欢迎使用!'
 
 ##########################################
@@ -114,10 +124,13 @@ logo_text = '欢迎使用!'
 # animation config
 # 动画设置
 expand_ani = const(True)
+expand_margin = const(1)    # 切换页面时, 相机窗口外(前后各)额外播放展开动画的子项数
 base_ani_fps = const(100)   # 动画的最大帧数
 
 # 动画时长
 
+# 动画按时间插值: 绘制较慢时会跳过中间的画面, 总时长保持不变
+# 下面的配置仍以帧数表示(按base_ani_fps换算为毫秒, 见内部值中的*_duration)
 # 在指定帧数内到达目的地
 # default_speed = const(20)
 # camera_speed = const(20)
@@ -138,8 +151,24 @@ dialog_speed = const(20)
 # expand_speed = const(10)
 # dialog_speed = const(7)
 
+# 帧率控制
+# 开启后, Manager.update会在每帧剩余的时间内休眠, 而不是以最快的速度重复绘制相同的画面
+frame_pacing = const(False)
+target_fps = const(60)      # 有动画或按键操作时的帧率
+idle_fps = const(10)        # 空闲时的帧率
+idle_delay = const(500)     # 最后一次按键/动画之后, 经过多长时间进入空闲状态 ms
+pacing_poll_ms = const(2)   # 休眠时检查按钮的间隔 ms, 按下按钮会立即结束休眠
+pacing_lightsleep = const(False)  # 使用machine.lightsleep休眠(需要自行配置按钮引脚为唤醒源)
+
+# 按住按钮重复触发(ButtonEvent.add的repeat参数)
+btn_repeat_delay = const(150)     # 按住多久后开始重复触发 ms
+btn_repeat_interval = const(32)   # 重复触发的间隔 ms
+btn_repeat_accel = const(1)       # 每重复触发多少次, 步长翻倍(1为每次都翻倍)
+btn_repeat_max_step = const(256)  # 最大步长
+
 string_scroll_speed = const(2)  # px(速度:像素)
 widget_flash_speed = const(250) # 闪烁间隙(当子控件被激活时) ms(时间:毫秒)
+chart_h = const(16)             # Chart的默认高度 px
 
 # 动画函数 (https://easings.net)
 # x取值0~1之间的浮点数
@@ -203,8 +232,7 @@ yscrollbar_mask_x = const(yscrollbar_x-list_scrollbar_gap)
 yscrollbar_mask_w = const(yscrollbar_w+list_scrollbar_gap)
 yscrollbar_bottom_line_y = const(yscrollbar_line_yh-1)
 
-xscrollbar_mask_y = const(top_gap-icon_scrollbar_gap)
-xscrollbar_mask_h = const(xscrollbar_h)
+icon_view_y = const(top_gap+xscrollbar_space)  # 图标菜单可视区域的顶部
 
 dialog_base_x = const(display_w-dialog_in_gap*2-dialog_out_gap-2)  # TextDialog的基础x坐标, -2是因为弹窗矩形两条边框各占用1像素
 dialog_in_gap_m2 = const(dialog_in_gap*2)
@@ -213,5 +241,14 @@ widget_gap_m2 = const(widget_gap*2)
 disw_wgap = const(display_w+widget_gap)
 
 base_ani_sleep = const(1000//base_ani_fps)  # ms
+ease_shift = const(10)  # 缓动表的定点数精度, 缓动值放大2^10倍后以整数保存
+ease_steps = const(32)  # 缓动表的采样数, 采样点之间线性插值
+
+# 动画时长 ms, 由以帧数表示的配置换算而来
+default_duration = const(default_speed*base_ani_sleep)
+camera_duration = const(camera_speed*base_ani_sleep)
+selector_duration = const(selector_speed*base_ani_sleep)
+expand_duration = const(expand_speed*base_ani_sleep)
+dialog_duration = const(dialog_speed*base_ani_sleep)
 
 ##########################################
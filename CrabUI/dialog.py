@@ -0,0 +1,157 @@
+"""
+dialogs
+last edited: 2025.8.27
+"""
+from .config import *
+from .libs import drawer
+from .ui import Pos
+from .label import Label
+from . import ui
+import utime
+
+# class Dialog:
+#     def __init__(self):
+#         # TODO: 一个可以自定义的Dialog组件
+#         pass
+
+class TextDialog:
+    """
+    文本对话框类
+    """
+    def __init__(self, text: str='', duration=False, manager=None):
+        """
+        初始化文本对话框
+
+        Args:
+            text: 显示的文本
+            duration: 显示持续时间
+            manager: 所属的管理器(默认为当前的默认管理器)
+        """
+        # 此类原来应继承于Dialog
+        self.manager = manager if manager else ui.default_manager
+        self.type = 'TextDialog'
+        self.duration = duration if duration else dialog_default_duration
+        self.text = text
+        self.pos = Pos()
+        # TextDialog目前仅支持显示一个Label组件
+        self.child = Label(self, text, auto_add=False, offset_pos=False, load=False)
+        self.shapes = drawer.Shapes(2)  # 背景和边框
+        self.closing = False
+        self.opening = False
+        self.opened = False
+        self.open_time = False
+        self.appended = False
+        if self.child.pos.w > dialog_max_w:
+            print('Dialog text too long')
+        self.manager.load_list.append(self)
+        self.manager.pages.append(self)
+
+    def open(self, text):
+        """
+        打开对话框并显示文本
+
+        Args:
+            text: 要显示的文本
+        """
+        self.set_text(text)
+        self.pop()
+
+    # @timeit
+    def init(self, reset_pos=True):
+        """
+        初始化对话框
+
+        Args:
+            reset_pos: 是否重置位置
+        """
+        self.child.init()
+        cpos = self.child.pos
+        pos = self.pos
+        if reset_pos:
+            pos.x = display_w
+            pos.y = dialog_out_gap
+        pos.w = min(dialog_max_w, cpos.w+dialog_in_gap_m2)
+        pos.h = cpos.h+dialog_in_gap_m2
+        pos.dx = max(dialog_max_x, dialog_base_x-cpos.w)
+        pos.dy = dialog_out_gap
+        if reset_pos:
+            cpos.x = display_w
+            cpos.y = dialog_out_gap+dialog_in_gap
+        cpos.dx = pos.dx+dialog_in_gap
+        cpos.dy = cpos.y
+
+    def assets(self) -> tuple:
+        """
+        Returns:
+            tuple: 正在使用的缓存项, 卸载页面时保留(见Manager.release)
+        """
+        return self.child.assets()
+
+    def set_text(self, text):
+        """
+        设置对话框文本
+
+        Args:
+            text: 新的文本内容
+        """
+        self.text = text
+        self.child.set_text(text)
+        self.init(False)
+        self.animation()
+
+    def animation(self):
+        """设置对话框动画"""
+        cpos = self.child.pos
+        pos = self.pos
+        pos.animation((pos.dx, pos.dy), ease_func=dialog_ease, only_xy=True, duration=dialog_duration)
+        cpos.animation((cpos.dx, cpos.dy), ease_func=dialog_ease, only_xy=True, duration=dialog_duration)
+
+    # @timeit
+    def pop(self):
+        """弹出对话框"""
+        self.animation()
+        self.opening = True
+        if not self.appended:
+            self.manager.others.append(self)
+            self.appended = True
+
+    # @timeit
+    def close(self, _timer=None):
+        """关闭对话框"""
+        self.closing = True
+        self.opened = False
+        cpos = self.child.pos
+        pos = self.pos
+        pos.animation((display_w, dialog_out_gap), ease_func=dialog_ease, only_xy=True, duration=dialog_duration)
+        cpos.animation((display_w, dialog_out_gap+dialog_in_gap), ease_func=dialog_ease, only_xy=True,
+                       duration=dialog_duration)
+
+    # @timeit
+    def update(self):
+        """更新对话框显示"""
+        pos = self.pos
+        manager = self.manager
+        now = manager.now
+        if self.opened and utime.ticks_diff(now, self.open_time)>self.duration:
+            self.close()
+        if pos.animating: pos.update()
+        elif self.closing and pos.x == display_w:
+            self.appended = False
+            self.closing = False
+            manager.others.remove(self)
+        elif self.opening:
+            self.opening = False
+            self.opened = True
+            self.open_time = now
+        # 文本不会覆盖边框, 所以背景和边框可以一起绘制
+        canvas = manager.canvas
+        shapes = self.shapes
+        shapes.count = 0
+        shapes.round_rect(pos.x-2, pos.y-2, pos.w+5, pos.h+5, 0, 1)
+        shapes.round_rect(pos.x, pos.y, pos.w, pos.h, 1, 0)
+        canvas.draw_shapes(shapes)
+        if self.child.pos.animating: self.child.pos.update()
+        # 文本只显示在弹窗内
+        canvas.clip(pos.x, pos.y, pos.w-2, pos.h)
+        self.child.update()
+        canvas.unclip()
@@ -0,0 +1,238 @@
+"""
+icon menu
+last edited: 2025.8.27
+"""
+from .config import *
+from .libs import upbm, drawer
+from .ui import Pos, Page, BaseWidget
+from .label import Label
+
+class XScrollBar:
+    """
+    水平滚动条类
+    """
+    def __init__(self, manager):
+        """
+        初始化水平滚动条
+
+        Args:
+            manager: 所属的管理器
+        """
+        self.manager = manager
+        self.pos = Pos()
+
+    def update(self):
+        """更新滚动条显示"""
+        # x: out_gap
+        # y: top_gap
+        self.manager.canvas.fill_rect(out_gap, top_gap, self.pos.w, self.pos.h, 1)
+
+    def update_val(self):
+        """更新滚动条值"""
+        menu = self.manager.current_menu
+        if menu.count_children == 1:
+            w = xscrollbar_w
+        else:
+            w = (menu.selected_id + 1 ) / menu.count_children * xscrollbar_w
+
+        self.pos.animation((out_gap, top_gap, round(w), xscrollbar_h), ease_func=scrollbar_ease)
+
+class IconMenu(Page):
+    """
+    图标菜单类
+    """
+    def __init__(self, manager=None):
+        """
+        初始化图标菜单
+
+        Args:
+            manager: 所属的管理器(默认为当前的默认管理器)
+        """
+        super().__init__(page_type=1, manager=manager)
+        self.scrollbar = XScrollBar(self.manager)
+        self.title_label = Label(self, '', auto_add=False, offset_pos=False)
+        self.title_label.pos.y = display_h
+        self.others.append(self.title_label)
+        self.others.append(self.scrollbar)
+        manager = self.manager
+        if manager.icon_menu_dashline is None:
+            manager.icon_menu_dashline = _XDashLine(manager)
+        self.others.append(manager.icon_menu_dashline)
+        self.camera.w = icon_max_w
+        self.x_offset = icon_selector_left_space
+        self.y_offset = icon_selector_top_space
+        # 不包括滚动条
+        self.view.y = icon_view_y
+        self.view.h = display_h-icon_view_y
+
+    def update(self):
+        """更新菜单显示"""
+        cam = self.camera
+        if cam.animating: cam.update()
+        canvas = self.manager.canvas
+        canvas.clip_to(self.view)
+        # 图标等距排列, 直接计算相机窗口内的子项
+        children = self.children
+        end = (cam.x+display_w)//icon_item_space+1
+        if end > self.count_children: end = self.count_children
+        i = (cam.x-icon_size)//icon_item_space
+        if i < 0: i = 0
+        while i < end:
+            child = children[i]
+            _pos = child.pos
+            if _pos.animating: _pos.update()
+            child.update()
+            if debug_alloc: self.manager.alloc_mark(child)
+            i += 1
+        canvas.unclip()
+        for other in self.others:
+            if other.pos.animating: other.pos.update()
+            other.update()
+
+    def change_selection(self, child):
+        """
+        更改选中项
+
+        Args:
+            child: 新的选中项
+        """
+        self.title_label.set_text(child.title)
+        pos = self.title_label.pos
+        pos.y = display_h
+        pos.x = half_disw - pos.w // 2
+        pos.dx = pos.x
+        pos.dy = display_h - pos.h - icon_title_bottom
+        pos.animation((pos.dx, pos.dy), only_xy=True, ease_func=icon_title_ease)
+
+    def visible_range(self, x, y) -> tuple[int, int]:
+        """
+        获取相机位于(x, y)时可见的子项范围
+
+        Args:
+            x: 相机x坐标
+            y: 相机y坐标
+
+        Returns:
+            tuple: (第一个可见子项的索引, 最后一个可见子项的索引+1)
+        """
+        return max(0, (x-icon_size)//icon_item_space), min(self.count_children, (x+display_w)//icon_item_space+1)
+
+    def update_camera(self):
+        """更新相机位置"""
+        pos = self.manager.selector.selected.pos
+        cam = self.camera
+        cam.animation((pos.dx-half_disw+pos.w//2, cam.y), only_xy=True, ease_func=camera_ease, duration=camera_duration)
+
+    def add(self, child):
+        """
+        添加子项到菜单
+
+        Args:
+            child: 要添加的子项
+        """
+        child.parent = self
+        child.id = self.count_children
+        pos = child.pos
+        pos.dx = icon_item_space*self.count_children
+        pos.dy = pos.y
+        # 子项默认位于目标位置, 展开动画只作用于可见的子项(见Manager.expand)
+        pos.x = pos.dx
+        self.children.append(child)
+        self.count_children += 1
+
+class Icon(BaseWidget):
+    """
+    图标组件类
+    """
+    def __init__(self, parent, filepath=None, title='', link=None, auto_add: bool=True, offset_pos: bool=True,
+                 page=None):
+        """
+        初始化图标组件
+
+        Args:
+            parent: 父组件
+            filepath: 图片文件路径
+            title: 图标标题
+            link: 点击回调函数
+            auto_add: 是否自动添加到父组件
+            offset_pos: 是否使用偏移坐标
+            page: 确认时打开的页面(没有link时), 选中时会预加载该页面
+        """
+        super().__init__(parent)
+        self.target = page
+        if page is not None and link is None: link = lambda: self.manager.page(page)
+        self.type = 1
+        self.pbm = upbm.pbm_image
+        self.filepath = filepath
+        self.link = link
+        self.pos.h, self.pos.w = icon_size, icon_size
+        # 图片的实际大小(载入后更新), 图标的位置和选择器仍按icon_size排列
+        self.img_w, self.img_h = icon_size, icon_size
+        self.drw = self.pbm.draw
+        self.title = title
+        self.offset = offset_pos
+        # 在启动时加载图片
+        self.manager.load_list.append(self)
+        if auto_add: parent.add(self)
+
+    def init(self):
+        """初始化图标，加载图片"""
+        # 耗时操作,会在启动时被manager调用加载
+        self.pbm.init(self.filepath)
+        self.img_w, self.img_h = self.pbm.size(self.filepath)
+        # 选中时显示的标题(只有IconMenu显示标题)
+        title_label = getattr(self.parent, 'title_label', None)
+        if self.title and title_label is not None: title_label.font.init(self.title)
+
+    def assets(self) -> tuple:
+        """
+        Returns:
+            tuple: 加载时创建的缓存项(图片和标题), 见Label.assets
+        """
+        title_label = getattr(self.parent, 'title_label', None)
+        title = ((title_label.font.str_cache, self.title),) if self.title and title_label is not None else ()
+        if not self.filepath or '#' in self.filepath: return title  # 图集中的图标共用图集的数据, 不单独卸载
+        return ((self.pbm.img_cache, self.filepath),) + title
+
+    def set_image(self, filepath):
+        """
+        设置图标图片
+
+        Args:
+            filepath: 新的图片文件路径
+        """
+        self.filepath = filepath
+        self.pbm.init(filepath)
+        self.img_w, self.img_h = self.pbm.size(filepath)
+
+    def update(self):
+        """更新图标显示"""
+        pos = self.pos
+        manager = self.manager
+        x, y = pos.x, pos.y
+        if self.offset:
+            menu = manager.current_menu
+            x = menu.offset_x(x)
+            y = menu.offset_y(y)
+        self.drw(manager.canvas, self.filepath, x, y, self.img_w, self.img_h)
+
+class _XDashLine:
+    """
+    内置水平虚线类
+    """
+    def __init__(self, manager):
+        """
+        初始化虚线
+
+        Args:
+            manager: 所属的管理器
+        """
+        self.type = 5
+        self.manager = manager
+        self.pos = Pos()  # 所有组件必须拥有Pos
+        self.shapes = drawer.Shapes(1)
+        self.shapes.dash(0, dashline_h, display_w, icon_dashline_split_length)
+
+    def update(self):
+        """更新虚线显示"""
+        self.manager.canvas.draw_shapes(self.shapes)
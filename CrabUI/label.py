@@ -0,0 +1,297 @@
+"""
+label widget
+last edited: 2025.8.27
+"""
+from .config import *
+from .libs import ufont
+from .ui import Pos, BaseWidget
+import utime
+import framebuf
+from array import array
+
+class Label(BaseWidget):
+    """
+    标签组件类
+    """
+    def __init__(self, parent, text=None, link=None, auto_add: bool=True, offset_pos: bool=True,
+                 always_scroll: bool=False, scroll_w: int | bool=False, try_scroll: bool=True,
+                 scroll_speed: int | bool=False, load: bool=True, font: str | bool=False, size: int | bool=False,
+                 page=None, cache: bool=True, width: int=0):
+        """
+        Label标签组件
+        Args:
+            parent(AnyWidget): 父组件
+            text(str): 显示的内容
+            link(callback): 单击后运行的函数
+            auto_add(bool): 是否自动调用父组件的add方法 (Builtin)
+            offset_pos(bool): 是否根据相机等偏移量进行坐标偏移 (Builtin)
+            always_scroll(bool): 是否在未被选中时进行滚动
+            scroll_w(int): 触发滚动文本的宽度阈值 (Builtin)
+            try_scroll(bool): 是否开启文本滚动
+            scroll_speed(int): 滚动速度(每秒偏移的像素)
+            load(int): 是否自动将self添加到manager的启动加载列表 (Builtin)
+            page(Page): 确认时打开的页面(没有link时), 选中时会预加载该页面
+            cache(bool): 是否使用字体的字符串缓存; 为False时文本绘制到自己的缓冲区, 经常变化的文本不会使缓存增长
+            width(int): cache为False时预先分配的缓冲区宽度(像素), 文本更宽时才重新分配
+        """
+        super().__init__(parent)
+        self.target = page
+        if page is not None and link is None: link = lambda: self.manager.page(page)
+        self.type = 0
+        self.font = ufont.bitmap_font(font, size)
+        self.pos.w = self.font.update_width(text)
+        self.text = text
+        self.title = text
+        self.link = link
+        self.link_ = link
+        self.pos.h = font_size if size is False else size
+        self.drw = self.font.draw
+        self.cache = cache
+        self.capacity = width
+        self.fbuf = None  # cache为False时的文本缓冲区, 见render
+        self.fbuf_w = 0
+        if not cache: self.drw = self.draw_buffer
+        self.xscroll = 0
+        self.offset = offset_pos
+        self.widget = None
+        self.always_scroll = always_scroll
+        self.try_scroll = try_scroll
+        self.last_time = False
+        self.scroll_w = disw_gap_bar if scroll_w is False else scroll_w
+        self.scroll_speed = string_scroll_speed if scroll_speed is False else scroll_speed
+        
+        # 在启动时加载字体
+        if load: self.manager.load_list.append(self)
+        if auto_add: parent.add(self)
+
+    def add(self, widget):
+        """
+        添加子组件
+
+        Args:
+            widget: 要添加的组件
+        """
+        self.link = self.widget_callback
+        self.widget = widget
+
+    def init(self):
+        """初始化标签，加载字体"""
+        # 耗时操作,会在启动时被manager调用加载
+        if not self.cache:
+            self.render()
+            return
+        self.pos.w = self.font.init(self.text)
+
+    def render(self):
+        """把文本绘制到自己的缓冲区(cache为False时使用), 缓冲区不够宽时才重新分配"""
+        font = self.font
+        w = font.update_width(self.text)
+        if self.fbuf is None or w > self.fbuf_w:
+            self.fbuf_w = max(w, self.capacity, font.font_size)
+            buf = bytearray((self.fbuf_w + 7) // 8 * font.font_size)
+            self.fbuf = framebuf.FrameBuffer(buf, self.fbuf_w, font.font_size, framebuf.MONO_HLSB)
+        else:
+            self.fbuf.fill(0)
+        font.blit_text(self.fbuf.blit, self.text)
+        self.pos.w = w
+
+    def draw_buffer(self, canvas, _string, x, y, w):
+        """
+        显示自己缓冲区中的文本(cache为False时代替font.draw)
+
+        Args:
+            canvas: 画布对象
+            _string: 文本(已绘制在缓冲区中)
+            x: x坐标
+            y: y坐标
+            w: 文本宽度
+        """
+        canvas.blit(self.fbuf, x, y, w, self.font.font_size, 0)
+
+    def assets(self) -> tuple:
+        """
+        Returns:
+            tuple: 加载时创建的缓存项, ((缓存, 键), ...), 卸载页面时删除(见Manager.unload)
+        """
+        if not self.cache: return ()
+        return ((self.font.str_cache, self.text),)
+
+    def widget_callback(self):
+        """组件回调函数"""
+        self.widget.widget_callback()
+        if callable(self.link_): self.link_()
+
+    def set_text(self, text):
+        """
+        设置标签文本
+
+        Args:
+            text: 新的文本内容
+        """
+        self.text = text
+        self.init()
+        selector = self.manager.selector
+        if selector.selected is self:
+            selector.select(self)
+
+    def scroll_text(self):
+        """滚动文本显示"""
+        _pos = self.pos
+        now = self.manager.now
+        if utime.ticks_diff(now, self.last_time) < base_ani_sleep: return
+        self.last_time = now
+        if self.manager.selector.selected is self or self.always_scroll or self.xscroll:
+            scr_w = self.scroll_w
+            _child_w = 0
+            if self.widget:
+                _child_w = self.widget.pos.w+widget_gap
+                scr_w -= _child_w
+            if _pos.w+out_gap > scr_w:
+                self.xscroll += self.scroll_speed
+                Pos.moved = True  # 滚动中的文本也算作动画, 不进入空闲帧率
+                if self.manager.selector.selected is not self and abs(self.xscroll) < self.scroll_speed: self.xscroll = 0
+                elif self.xscroll > _pos.w: self.xscroll = -list_max_w+_child_w
+
+    # @timeit
+    def update(self):
+        """更新标签显示"""
+        if self.try_scroll:
+            self.scroll_text()
+        manager = self.manager
+        canvas = manager.canvas
+        pos = self.pos
+        x, y = pos.x, pos.y
+        if self.offset:
+            menu = manager.current_menu
+            x = menu.offset_x(x)
+            y = menu.offset_y(y)
+        widget = self.widget
+        if widget:
+            # 文本只显示在组件的左侧
+            canvas.clip(0, 0, manager.current_menu.offset_x(widget.pos.x)-widget_gap, display_h)
+            self.drw(canvas, self.text, x-self.xscroll, y, pos.w)
+            canvas.unclip()
+            widget.update()
+        else:
+            self.drw(canvas, self.text, x-self.xscroll, y, pos.w)
+
+# DynamicLabel(digits=True)常驻字形表中的字符
+DIGIT_CHARS = '0123456789.-+:% '
+
+class DynamicLabel(Label):
+    """
+    经常变化的文本(传感器读数、时钟、计数器), 文本绘制在预先分配的缓冲区中, 修改时只重新绘制变化的字符
+    """
+    def __init__(self, parent, text='', max_chars: int=8, digits: bool=False, align_right: bool=False,
+                 link=None, auto_add: bool=True, offset_pos: bool=True, load: bool=True,
+                 font: str | bool=False, size: int | bool=False, page=None):
+        """
+        与Label不同, set_text不会创建新的缓存, 宽度固定, 也不会重新选择
+
+        Args:
+            parent: 父组件
+            text: 初始文本
+            max_chars: 最多显示的字符数, 超出的部分不显示
+            digits: 是否只显示数字和DIGIT_CHARS中的符号, 为True时缓冲区按半个字宽分配,
+                    这些字符的字形常驻内存(见BMFont.glyph_table), 其他字符仍可显示但需要读取字形
+            align_right: 是否右对齐
+            其他参数见Label
+        """
+        super().__init__(parent, text, link, auto_add, offset_pos, try_scroll=False, load=load, font=font,
+                         size=size, page=page, cache=False)
+        font = self.font
+        self.max_chars = max_chars
+        self.digits = digits
+        self.align_right = align_right
+        self.capacity = max_chars*(font.half_font_size if digits else font.font_size)
+        self.pos.w = self.capacity
+        self.glyphs = None
+        self.glyph = None
+        # 已绘制的每个字符的编码和x坐标, 用来找出变化的字符
+        self.codes = array('H', bytes(2*max_chars))
+        self.xs = array('h', bytes(2*max_chars))
+        self.count = 0
+
+    def init(self):
+        """分配缓冲区并绘制文本"""
+        font = self.font
+        if self.fbuf is None:
+            self.fbuf_w = self.capacity
+            buf = bytearray((self.fbuf_w + 7) // 8 * font.font_size)
+            self.fbuf = framebuf.FrameBuffer(buf, self.fbuf_w, font.font_size, framebuf.MONO_HLSB)
+            if self.digits: self.glyphs = font.glyph_table(DIGIT_CHARS)
+            # 读取字形表以外的字符时使用, 只创建一次
+            self.glyph = memoryview(font.glyph_buf)[:font.bitmap_size]
+        self.render()
+
+    def render(self):
+        """只重新绘制编码或位置变化的字符"""
+        fbuf = self.fbuf
+        if fbuf is None: return  # 尚未加载
+        font = self.font
+        half = font.half_font_size
+        full = font.font_size
+        h = full
+        limit = self.fbuf_w
+        codes = self.codes
+        xs = self.xs
+        text = self.text
+        # 超出缓冲区的字符不显示
+        w = font.update_width(text)
+        n = 0
+        if w > limit:
+            w = 0
+            for char in text:
+                cw = half if ord(char) < 128 else full
+                if w+cw > limit or n == self.max_chars: break
+                w += cw
+                n += 1
+        else:
+            n = min(len(text), self.max_chars)
+        start = limit-w if self.align_right else 0
+
+        # 先清除变化的字符原来的位置, 再绘制, 移动的字符不会擦掉刚绘制的字符
+        old = self.count
+        x = start
+        i = 0
+        for char in text:
+            if i == n: break
+            code = ord(char)
+            if i < old and (codes[i] != code or xs[i] != x):
+                fbuf.fill_rect(xs[i], 0, half if codes[i] < 128 else full, h, 0)
+            x += half if code < 128 else full
+            i += 1
+        for i in range(n, old):
+            fbuf.fill_rect(xs[i], 0, half if codes[i] < 128 else full, h, 0)
+
+        glyphs = self.glyphs
+        x = start
+        i = 0
+        for char in text:
+            if i == n: break
+            code = ord(char)
+            cw = half if code < 128 else full
+            if i >= old or codes[i] != code or xs[i] != x:
+                fbuf.fill_rect(x, 0, cw, h, 0)
+                glyph_fbuf = glyphs.get(code) if glyphs else None
+                if glyph_fbuf is None:
+                    font.read_glyph(char, self.glyph)
+                    glyph_fbuf = font.glyph_fbuf
+                fbuf.blit(glyph_fbuf, x, 0, 0)
+                codes[i] = code
+                xs[i] = x
+            x += cw
+            i += 1
+        self.count = n
+
+    def set_text(self, text):
+        """
+        设置文本, 只重新绘制变化的字符
+
+        不会转换类型, 数值需要调用者先转换为字符串(例如预先分配的格式), 避免每次更新都创建新对象
+
+        Args:
+            text(str): 新的文本
+        """
+        self.text = text
+        self.render()
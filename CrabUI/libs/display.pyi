@@ -28,4 +28,23 @@ class Display(FrameBuffer):
             w: 矩形宽度
             h: 矩形高度
             c: 填充颜色
-        """
\ No newline at end of file
+        """
+
+    def set_start_line(self, line):
+        """
+        (可选)设置显示器的起始行, 屏幕的第y行显示缓冲区的第(y+line)%高度行
+
+        在下一次show时生效, config.hw_scroll开启且驱动提供此方法时, 列表滚动使用起始行
+
+        Args:
+            line: 起始行
+        """
+
+    def write_band(self, y, buf):
+        """
+        (可选)发送屏幕的一块, 分块绘制(config.band_h)时代替show
+
+        Args:
+            y: 块的第一行(band_h的倍数)
+            buf: 块的内容, MONO_VLSB格式, 宽度为display_w, 高度为band_h
+        """
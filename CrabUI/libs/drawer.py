@@ -5,6 +5,15 @@ last edited: 2025.8.27
 """
 
 from ..config import icon_selector_length, icon_selector_gap
+from micropython import const
+from array import array
+
+# 图形列表(Shapes)中的图形类型, 与原生模块shapes.c相同
+SHAPE_FILL_RECT = const(0)
+SHAPE_ROUND_RECT = const(1)
+SHAPE_ICON_SELECTOR = const(2)
+SHAPE_DASH = const(3)
+SHAPE_SIZE = const(8)  # 每个图形占用的int16个数: op, x, y, w, h, c, a, b
 
 def round_rect(fbuf, x, y, w, h, c=1, f=0):
     """
@@ -19,17 +28,22 @@ def round_rect(fbuf, x, y, w, h, c=1, f=0):
         c: 颜色值
         f: 是否填充矩形
     """
-    x, y, w, h = int(x), int(y), int(w), int(h)
-    line = fbuf.line
+    # 这个函数每帧都会被调用:
+    # 4个元素的元组赋值会创建元组, `line = fbuf.line`会创建绑定方法对象,
+    # 所以分开赋值并直接调用fbuf的方法, 避免每帧分配内存
+    x = int(x)
+    y = int(y)
+    w = int(w)
+    h = int(h)
     if f:
-        line(x+1, y, x+w-2, y, c)
+        fbuf.line(x+1, y, x+w-2, y, c)
         fbuf.fill_rect(x, y+1, w, h-2, c)
-        line(x+1, y+h-1, x+w-2, y+h-1, c)
+        fbuf.line(x+1, y+h-1, x+w-2, y+h-1, c)
     else:
-        line(x+1, y, x+w-2, y, c)
-        line(x, y+1, x, y+h-1, c)
-        line(x+w-1, y+1, x+w-1, y+h-1, c)
-        line(x+1, y+h, x+w-2, y+h, c)
+        fbuf.line(x+1, y, x+w-2, y, c)
+        fbuf.line(x, y+1, x, y+h-1, c)
+        fbuf.line(x+w-1, y+1, x+w-1, y+h-1, c)
+        fbuf.line(x+1, y+h, x+w-2, y+h, c)
 
 def icon_selector(fbuf, x, y, w, h, c=1, _f=0):
     """
@@ -44,24 +58,152 @@ def icon_selector(fbuf, x, y, w, h, c=1, _f=0):
         c: 颜色值
         _f: 未使用参数
     """
-    x, y, w, h = int(x), int(y), int(w), int(h)
+    x = int(x)
+    y = int(y)
+    w = int(w)
+    h = int(h)
 
     length = icon_selector_length
     gap = icon_selector_gap
     x_sub = x-gap
     y_sub = y-gap
-    
-    line = fbuf.line
-    
+
     # left up
-    line(x_sub, y_sub, x_sub+length, y_sub, c)
-    line(x_sub, y_sub+1, x_sub, y_sub+length, c)
+    fbuf.line(x_sub, y_sub, x_sub+length, y_sub, c)
+    fbuf.line(x_sub, y_sub+1, x_sub, y_sub+length, c)
     # right up
-    line(x+w-length, y_sub, x+w, y_sub, c)
-    line(x+w, y_sub+1, x+w, y_sub+length, c)
+    fbuf.line(x+w-length, y_sub, x+w, y_sub, c)
+    fbuf.line(x+w, y_sub+1, x+w, y_sub+length, c)
     # left bottom
-    line(x_sub, y+h, x_sub+length, y+h, c)
-    line(x_sub, y+h-length, x_sub, y+h, c)
+    fbuf.line(x_sub, y+h, x_sub+length, y+h, c)
+    fbuf.line(x_sub, y+h-length, x_sub, y+h, c)
     # right bottom
-    line(x+w-length, y+h, x+w, y+h, c)
-    line(x+w, y+h-length, x+w, y+h, c)
\ No newline at end of file
+    fbuf.line(x+w-length, y+h, x+w, y+h, c)
+    fbuf.line(x+w, y+h-length, x+w, y+h, c)
+
+class Shapes:
+    """
+    图形列表
+
+    图形按顺序保存在预先分配的array('h')中, 通过Canvas.draw_shapes一次提交,
+    有原生模块shapes时在一次调用中完成绘制, 否则使用rasterize
+    列表不会自动清空, 每帧不变的图形只需添加一次
+    """
+    def __init__(self, size):
+        """
+        初始化图形列表
+
+        Args:
+            size: 最多保存的图形数量
+        """
+        self.ops = array('h', bytes(size*SHAPE_SIZE*2))
+        self.size = size
+        self.count = 0
+
+    def clear(self):
+        """清空图形列表"""
+        self.count = 0
+
+    def add(self, op, x, y, w, h, c, a=0, b=0):
+        """
+        添加图形
+
+        Args:
+            op: 图形类型(SHAPE_*)
+            x: x坐标
+            y: y坐标
+            w: 宽度
+            h: 高度
+            c: 颜色值
+            a: 参数a(见各图形)
+            b: 参数b(见各图形)
+        """
+        i = self.count
+        if i >= self.size:
+            raise IndexError('too many shapes')
+        ops = self.ops
+        i *= SHAPE_SIZE
+        ops[i] = op
+        ops[i+1] = int(x)
+        ops[i+2] = int(y)
+        ops[i+3] = int(w)
+        ops[i+4] = int(h)
+        ops[i+5] = c
+        ops[i+6] = a
+        ops[i+7] = b
+        self.count += 1
+
+    def fill_rect(self, x, y, w, h, c=1):
+        """添加填充矩形"""
+        self.add(SHAPE_FILL_RECT, x, y, w, h, c)
+
+    def round_rect(self, x, y, w, h, c=1, f=0):
+        """添加圆角矩形, 参数与round_rect相同"""
+        self.add(SHAPE_ROUND_RECT, x, y, w, h, c, f)
+
+    def icon_selector(self, x, y, w, h, c=1, _f=0):
+        """添加图标选择器, 参数与icon_selector相同"""
+        self.add(SHAPE_ICON_SELECTOR, x, y, w, h, c, icon_selector_length, icon_selector_gap)
+
+    def dash(self, x, y, w, length, c=1):
+        """
+        添加水平虚线(从空白段开始)
+
+        Args:
+            x: 起点x坐标
+            y: y坐标
+            w: 长度
+            length: 每一段的长度
+            c: 颜色值
+        """
+        self.add(SHAPE_DASH, x, y, w, 1, c, length)
+
+def rasterize(target, ops, count):
+    """
+    绘制图形列表(原生模块shapes的Python实现, 结果相同)
+
+    Args:
+        target: 提供fill_rect方法的对象(Canvas)
+        ops: Shapes.ops
+        count: 图形数量
+    """
+    for i in range(0, count*SHAPE_SIZE, SHAPE_SIZE):
+        op = ops[i]
+        x = ops[i+1]
+        y = ops[i+2]
+        w = ops[i+3]
+        h = ops[i+4]
+        c = ops[i+5]
+        a = ops[i+6]
+        if op == SHAPE_FILL_RECT:
+            target.fill_rect(x, y, w, h, c)
+        elif op == SHAPE_ROUND_RECT:
+            if a:
+                target.fill_rect(x+1, y, w-2, 1, c)
+                target.fill_rect(x, y+1, w, h-2, c)
+                target.fill_rect(x+1, y+h-1, w-2, 1, c)
+            else:
+                target.fill_rect(x+1, y, w-2, 1, c)
+                target.fill_rect(x, y+1, 1, h-1, c)
+                target.fill_rect(x+w-1, y+1, 1, h-1, c)
+                target.fill_rect(x+1, y+h, w-2, 1, c)
+        elif op == SHAPE_ICON_SELECTOR:
+            b = ops[i+7]
+            xs = x-b
+            ys = y-b
+            xw = x+w
+            yh = y+h
+            target.fill_rect(xs, ys, a+1, 1, c)
+            target.fill_rect(xs, ys+1, 1, a, c)
+            target.fill_rect(xw-a, ys, a+1, 1, c)
+            target.fill_rect(xw, ys+1, 1, a, c)
+            target.fill_rect(xs, yh, a+1, 1, c)
+            target.fill_rect(xs, yh-a, 1, a+1, c)
+            target.fill_rect(xw-a, yh, a+1, 1, c)
+            target.fill_rect(xw, yh-a, 1, a+1, c)
+        elif op == SHAPE_DASH and a > 0:
+            end = x+w
+            px = x+a
+            while px < end:
+                target.fill_rect(px, y, a if px+a <= end else end-px, 1, c)
+                px += a*2
@@ -0,0 +1,28 @@
+"""
+[pyi] composite glyph runs
+
+last edited: 2025.8.27
+"""
+
+def run(dst: bytearray, fmt: int, dst_w: int, dst_h: int, string: str, glyphs: bytes,
+        size: int, glyph_bytes: int, x: int, y: int) -> int:
+    """
+    把一串字形合成到目标缓冲区(按位或, 与透明色为0的blit相同)
+
+    ASCII字符前进半个字宽, 其他字符前进一个字宽
+
+    Args:
+        dst: 目标缓冲区
+        fmt: 目标缓冲区的格式, framebuf.MONO_HLSB或framebuf.MONO_VLSB
+        dst_w: 目标宽度
+        dst_h: 目标高度
+        string: 文本, 每个字符对应glyphs中的一个字形
+        glyphs: 按顺序排列的字形点阵(MONO_HLSB), 每个占用glyph_bytes字节
+        size: 字体大小
+        glyph_bytes: 每个字形的字节数
+        x: 起始x坐标
+        y: 起始y坐标
+
+    Returns:
+        int: 合成结束后的x坐标
+    """
@@ -0,0 +1,185 @@
+"""
+hot kernels
+频繁调用的计算(缓冲区异或、文本宽度、字形合成、RLE解压、动画缓动)的多种实现, 导入时选择最快的可用实现:
+    natmod  预编译的原生模块(bufxor, glyphrun), 需要按架构编译, 可能不存在
+    viper   kernels_viper.py, 需要固件启用原生代码生成(大多数开发板都支持)
+    native  kernels_native.py, 同上
+    python  本文件中的实现, 任何环境都可以使用
+
+选择结果见backends(名称 -> 实现), 全部可用的实现见implementations(名称 -> [(实现, 函数), ...]),
+benchmarks/kernel_check.py使用它们比较各个实现的结果和耗时
+
+last edited: 2025.8.27
+"""
+
+import framebuf
+from ..config import ease_steps
+
+NATMOD = 'natmod'
+VIPER = 'viper'
+NATIVE = 'native'
+PYTHON = 'python'
+
+# 原生模块不存在时为ImportError, 为其他架构编译时为ValueError
+try:
+    from . import bufxor
+except (ImportError, ValueError):
+    bufxor = None
+try:
+    from . import glyphrun
+except (ImportError, ValueError):
+    glyphrun = None
+# 固件未启用原生代码生成时, 编译@micropython.viper/native会产生SyntaxError
+try:
+    from . import kernels_viper
+except (ImportError, SyntaxError, AttributeError, NameError):
+    kernels_viper = None
+try:
+    from . import kernels_native
+except (ImportError, SyntaxError, AttributeError, NameError):
+    kernels_native = None
+
+def xor(buf1, buf2):
+    """
+    buf1与buf2按字节异或, 结果保存在buf1中
+
+    Args:
+        buf1: 目标缓冲区
+        buf2: 长度不小于buf1的缓冲区
+    """
+    for i in range(len(buf1)):
+        buf1[i] ^= buf2[i]
+
+def text_width(string, half, full) -> int:
+    """
+    文本宽度, ASCII字符占半个字宽, 其他字符占一个字宽
+
+    Args:
+        string: 文本
+        half: 半个字宽
+        full: 一个字宽
+
+    Returns:
+        int: 宽度
+    """
+    w = 0
+    for char in string:
+        w += half if ord(char) < 128 else full
+    return w
+
+def glyph_run(dst, fmt, dst_w, dst_h, string, glyphs, size, glyph_bytes, x, y) -> int:
+    """
+    把一串字形合成到目标缓冲区, 参数和结果与原生模块glyphrun.run相同(见glyphrun.pyi)
+
+    Returns:
+        int: 合成结束后的x坐标
+    """
+    fbuf = framebuf.FrameBuffer(dst, dst_w, dst_h, fmt)
+    glyph = bytearray((size + 7) // 8 * size)
+    glyph_fbuf = framebuf.FrameBuffer(glyph, size, size, framebuf.MONO_HLSB)
+    n = min(glyph_bytes, len(glyph))
+    mv = memoryview(glyphs)
+    offset = 0
+    for char in string:
+        if offset + glyph_bytes > len(glyphs): break
+        glyph[:n] = mv[offset:offset+n]
+        fbuf.blit(glyph_fbuf, x, y, 0)
+        offset += glyph_bytes
+        x += size >> 1 if ord(char) < 128 else size
+    return x
+
+def rle_decode(dst, src, stride) -> int:
+    """
+    解压RLE数据(见tools/compress_assets.py), 直到src结束或dst写满
+
+    控制字节c < 0x80: 之后的c+1个字节原样复制; c >= 0x80: 之后的一个字节重复c-0x7e次
+    stride不为0时, 压缩前每行与上一行异或过(大部分行与上一行相同的图标可以压缩得更小), 解压后还原
+
+    Args:
+        dst: 目标缓冲区
+        src: 压缩的数据
+        stride: 每行的字节数, 0表示没有按行异或
+
+    Returns:
+        int: 写入的字节数
+    """
+    n = len(src)
+    m = len(dst)
+    src = memoryview(src)
+    i = j = 0
+    while i < n and j < m:
+        c = src[i]
+        i += 1
+        if c < 0x80:
+            k = min(c + 1, m - j, n - i)
+            dst[j:j+k] = src[i:i+k]
+            i += k
+            j += k
+        elif i < n:
+            value = src[i]
+            i += 1
+            for _ in range(min(c - 0x7e, m - j)):
+                dst[j] = value
+                j += 1
+        else:
+            break
+    if stride:
+        for i in range(stride, j):
+            dst[i] ^= dst[i - stride]
+    return j
+
+def ease(table, elapsed, duration) -> int:
+    """
+    按经过的时间在缓动表中插值
+
+    Args:
+        table: 缓动表(见ui.ease_table), ease_steps+1个放大了2^ease_shift倍的整数
+        elapsed: 经过的时间 ms, 0 <= elapsed < duration
+        duration: 动画时长 ms
+
+    Returns:
+        int: 缓动值, 放大了2^ease_shift倍
+    """
+    progress = elapsed * (ease_steps << 8) // duration
+    i = progress >> 8
+    eased = table[i]
+    return eased + ((table[i+1] - eased) * (progress & 0xff) >> 8)
+
+implementations = {}
+backends = {}
+
+def select(name, *candidates):
+    """
+    记录可用的实现, 并返回第一个(最快的)
+
+    Args:
+        name: 名称
+        *candidates: (实现, 函数)按从快到慢的顺序, 函数为None表示不可用
+
+    Returns:
+        最快的可用实现
+    """
+    found = [(tier, func) for tier, func in candidates if func is not None]
+    implementations[name] = found
+    backends[name] = found[0][0]
+    return found[0][1]
+
+xor = select('xor',
+             (NATMOD, bufxor and bufxor.xor),
+             (VIPER, kernels_viper and kernels_viper.xor),
+             (NATIVE, kernels_native and kernels_native.xor),
+             (PYTHON, xor))
+text_width = select('text_width',
+                    (VIPER, kernels_viper and kernels_viper.text_width),
+                    (NATIVE, kernels_native and kernels_native.text_width),
+                    (PYTHON, text_width))
+glyph_run = select('glyph_run',
+                   (NATMOD, glyphrun and glyphrun.run),
+                   (VIPER, kernels_viper and kernels_viper.glyph_run),
+                   (PYTHON, glyph_run))
+rle_decode = select('rle_decode',
+                    (VIPER, kernels_viper and kernels_viper.rle_decode),
+                    (PYTHON, rle_decode))
+ease = select('ease',
+              (NATIVE, kernels_native and kernels_native.ease),
+              (PYTHON, ease))
@@ -0,0 +1,28 @@
+"""
+hot kernels (native)
+kernels.py中计算的native实现(代码与Python实现相同, 编译为机器码), 由kernels在导入时选择
+
+last edited: 2025.8.27
+"""
+
+import micropython
+from ..config import ease_steps
+
+@micropython.native
+def xor(buf1, buf2):
+    for i in range(len(buf1)):
+        buf1[i] ^= buf2[i]
+
+@micropython.native
+def text_width(string, half, full):
+    w = 0
+    for char in string:
+        w += half if ord(char) < 128 else full
+    return w
+
+@micropython.native
+def ease(table, elapsed, duration):
+    progress = elapsed * (ease_steps << 8) // duration
+    i = progress >> 8
+    eased = table[i]
+    return eased + ((table[i+1] - eased) * (progress & 0xff) >> 8)
@@ -0,0 +1,129 @@
+"""
+hot kernels (viper)
+kernels.py中计算的viper实现, 结果与Python实现相同, 由kernels在导入时选择
+
+last edited: 2025.8.27
+"""
+
+import micropython
+
+@micropython.viper
+def xor(buf1, buf2):
+    """buf1 ^= buf2, 两个缓冲区都按4字节对齐时每次处理4字节"""
+    n = int(len(buf1))
+    a8 = ptr8(buf1)
+    b8 = ptr8(buf2)
+    i = 0
+    if ((int(a8) | int(b8)) & 3) == 0:
+        a32 = ptr32(buf1)
+        b32 = ptr32(buf2)
+        words = n >> 2
+        while i < words:
+            a32[i] = a32[i] ^ b32[i]
+            i += 1
+        i = words << 2
+    while i < n:
+        a8[i] = a8[i] ^ b8[i]
+        i += 1
+
+@micropython.viper
+def text_width(string, half: int, full: int) -> int:
+    """文本宽度, 直接遍历字符串的UTF-8数据"""
+    s = ptr8(string)
+    n = int(len(string))  # 字符数
+    w = 0
+    i = 0
+    while n > 0:
+        c = int(s[i])
+        i += 1
+        if c < 0x80:
+            w += half
+            n -= 1
+        elif c >= 0xc0:
+            w += full
+            n -= 1
+    return w
+
+@micropython.viper
+def glyph_run(dst, fmt: int, dst_w: int, dst_h: int, string, glyphs, size: int, glyph_bytes: int,
+              x: int, y: int) -> int:
+    """字形合成, 与glyphrun.c相同"""
+    d = ptr8(dst)
+    s = ptr8(string)
+    g = ptr8(glyphs)
+    n = int(len(string))
+    glyphs_len = int(len(glyphs))
+    stride = (size + 7) >> 3
+    dst_stride = (dst_w + 7) >> 3
+    offset = 0
+    i = 0
+    while n > 0:
+        c = int(s[i])
+        i += 1
+        if (c & 0xc0) == 0x80:
+            continue  # UTF-8的后续字节
+        n -= 1
+        if offset + glyph_bytes > glyphs_len:
+            break
+        row = 0
+        while row < size:
+            py = y + row
+            if py >= 0 and py < dst_h:
+                src = offset + row * stride
+                col = 0
+                while col < size:
+                    if int(g[src + (col >> 3)]) & (0x80 >> (col & 7)):
+                        px = x + col
+                        if px >= 0 and px < dst_w:
+                            if fmt == 3:  # MONO_HLSB
+                                j = py * dst_stride + (px >> 3)
+                                d[j] = int(d[j]) | (0x80 >> (px & 7))
+                            else:
+                                j = (py >> 3) * dst_w + px
+                                d[j] = int(d[j]) | (1 << (py & 7))
+                    col += 1
+            row += 1
+        offset += glyph_bytes
+        if c < 0x80:
+            x += size >> 1
+        else:
+            x += size
+    return x
+
+@micropython.viper
+def rle_decode(dst, src, stride: int) -> int:
+    """RLE解压, 与kernels.rle_decode相同"""
+    d = ptr8(dst)
+    s = ptr8(src)
+    n = int(len(src))
+    m = int(len(dst))
+    i = 0
+    j = 0
+    while i < n and j < m:
+        c = int(s[i])
+        i += 1
+        if c < 0x80:
+            end = j + c + 1
+            if end > m:
+                end = m
+            while j < end and i < n:
+                d[j] = s[i]
+                i += 1
+                j += 1
+        elif i < n:
+            value = int(s[i])
+            i += 1
+            end = j + c - 0x7e
+            if end > m:
+                end = m
+            while j < end:
+                d[j] = value
+                j += 1
+        else:
+            break
+    if stride:
+        i = stride
+        while i < j:
+            d[i] = d[i] ^ d[i - stride]
+            i += 1
+    return j
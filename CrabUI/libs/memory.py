@@ -0,0 +1,241 @@
+"""
+memory report
+按缓存和对象类型估算内存占用, 见Manager.memory_report
+
+last edited: 2025.8.27
+"""
+
+import gc
+from array import array
+from micropython import const
+from ..config import display_w, clip_scratch_h
+from . import ufont, upbm
+
+# 估算使用的大小(32位MicroPython): 堆按16字节的块分配, 对象头和字典每项的大小
+BLOCK = const(16)
+OBJ_HEAD = const(16)       # 实例(type指针和字典)
+DICT_ITEM = const(8)       # 字典/实例属性的每一项(键和值)
+LIST_ITEM = const(4)       # 列表的每一项
+FBUF_HEAD = const(32)      # FrameBuffer对象(不包括数据)
+
+def blocks(n) -> int:
+    """
+    按堆的块大小向上取整
+
+    Args:
+        n: 字节数
+
+    Returns:
+        int: 实际占用的字节数
+    """
+    return (n+BLOCK-1)//BLOCK*BLOCK
+
+def buffer_size(buf) -> int:
+    """
+    估算bytes/bytearray/array/str占用的内存
+
+    Args:
+        buf: 缓冲区
+
+    Returns:
+        int: 字节数
+    """
+    if buf is None: return 0
+    if isinstance(buf, str): return blocks(len(buf)+OBJ_HEAD)
+    try:
+        itemsize = memoryview(buf).itemsize
+    except (TypeError, AttributeError):
+        itemsize = 1
+    return blocks(len(buf)*itemsize+OBJ_HEAD)
+
+def object_size(obj) -> int:
+    """
+    估算实例本身(不包括属性引用的对象)占用的内存
+
+    Args:
+        obj: 实例
+
+    Returns:
+        int: 字节数
+    """
+    attrs = getattr(obj, '__dict__', None)
+    n = len(attrs) if attrs is not None else 0
+    return blocks(OBJ_HEAD) + blocks(n*DICT_ITEM*3//2)  # 字典通常保留一半的空位
+
+def largest_free_block() -> int:
+    """
+    通过尝试分配, 二分查找当前可以分配的最大连续内存
+
+    Returns:
+        int: 字节数
+    """
+    gc.collect()
+    lo = 0
+    hi = gc.mem_free()
+    while lo < hi:
+        mid = (lo+hi+1)//2
+        try:
+            buf = bytearray(mid)
+            del buf
+            lo = mid
+        except MemoryError:
+            hi = mid-1
+        gc.collect()
+    return lo
+
+class Walker:
+    """
+    遍历界面对象(页面、组件、位置对象等), 按类型统计数量和估算大小
+    """
+    def __init__(self, skip):
+        """
+        Args:
+            skip: 不遍历的对象(例如管理器、字体和显示器, 它们单独统计)
+        """
+        self.seen = set(id(obj) for obj in skip)
+        self.counts = {}
+        self.sizes = {}
+        self.bytes = 0
+        self.animating = 0
+
+    def visit(self, obj):
+        """
+        统计对象及其属性引用的对象
+
+        Args:
+            obj: 要统计的对象
+        """
+        stack = [obj]
+        seen = self.seen
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen: continue
+            seen.add(id(obj))
+            if isinstance(obj, (list, tuple)):
+                self.bytes += blocks(OBJ_HEAD+len(obj)*LIST_ITEM)
+                stack.extend(obj)
+                continue
+            if isinstance(obj, (bytes, bytearray, str, array)):
+                self.bytes += buffer_size(obj)
+                continue
+            attrs = getattr(obj, '__dict__', None)
+            if attrs is None or callable(obj): continue
+            name = type(obj).__name__
+            size = object_size(obj)
+            self.counts[name] = self.counts.get(name, 0)+1
+            self.sizes[name] = self.sizes.get(name, 0)+size
+            self.bytes += size
+            if getattr(obj, 'animating', False): self.animating += 1
+            for value in attrs.values():
+                if value is not None and not isinstance(value, (int, float, bool)):
+                    stack.append(value)
+
+def fonts() -> list:
+    """
+    Returns:
+        list: 所有已创建的字体(ufont.bmf_cache: 字体文件 -> 大小 -> BMFont)
+    """
+    return [font for sizes in ufont.bmf_cache.values() for font in sizes.values()]
+
+def font_report(report):
+    """统计所有字体的字符串点阵缓存和字形缓存"""
+    strings = glyphs = 0
+    count = 0
+    for font in fonts():
+        for string in font.str_cache:
+            w = max(font.update_width(string), font.font_size)
+            strings += buffer_size(string) + FBUF_HEAD + blocks((w+7)//8*font.font_size+OBJ_HEAD) + DICT_ITEM
+            count += 1
+        for glyph in font.glyph_cache.values():
+            glyphs += blocks(len(glyph)+OBJ_HEAD) + DICT_ITEM
+        glyphs += buffer_size(font.glyph_buf) + FBUF_HEAD
+        glyphs += buffer_size(getattr(font, 'block_buf', None))  # 压缩字体解压的块
+        for buf, table in font.glyph_tables.values():
+            glyphs += buffer_size(buf) + len(table)*(FBUF_HEAD+DICT_ITEM)
+    report['string bitmaps'] = strings
+    report['strings'] = count
+    report['glyph cache'] = glyphs
+
+def icon_report(report):
+    """统计图标缓存(未压缩的图标按文件大小估算)"""
+    import os
+    size = 0
+    cache = upbm.pbm_image.img_cache
+    for filepath, img in cache.items():
+        if isinstance(img, tuple):
+            size += buffer_size(img[0]) + blocks(OBJ_HEAD+3*LIST_ITEM) + DICT_ITEM
+            continue
+        if '#' in filepath:
+            size += FBUF_HEAD + DICT_ITEM  # 图集中的图标, 数据在下面统计
+            continue
+        try:
+            size += blocks(os.stat(filepath)[6]+OBJ_HEAD) + FBUF_HEAD + DICT_ITEM
+        except OSError:
+            pass
+    for buf, _ in upbm.pbm_image.scratch.values():
+        size += buffer_size(buf) + FBUF_HEAD
+    for data in upbm.pbm_image.atlases.values():
+        size += buffer_size(data)
+    report['icons'] = size
+    report['icon count'] = len(cache)
+
+def framebuffer_report(manager, report):
+    """统计帧缓冲区和绘制用的临时缓冲区"""
+    size = 0
+    seen = []
+    canvases = [manager.canvas]
+    if manager.selector.canvas is not None: canvases.append(manager.selector.canvas)
+    display = manager.display
+    for buf in [canvas.buffer for canvas in canvases] + [getattr(display, 'buffer', None)]:
+        if buf is not None and not any(buf is b for b in seen):
+            seen.append(buf)
+            size += buffer_size(buf) + FBUF_HEAD
+    for canvas in canvases:
+        if canvas.scratch is not None:
+            size += blocks(display_w*clip_scratch_h//8+OBJ_HEAD) + FBUF_HEAD
+        if canvas.char_fbuf is not None:
+            size += blocks(8+OBJ_HEAD) + FBUF_HEAD
+    # 显示器驱动的其他缓冲区(例如examples/oled.py中用于比较的副本)
+    size += buffer_size(getattr(display, 'shadow', None))
+    report['framebuffers'] = size
+
+def report(manager) -> dict:
+    """
+    估算管理器的内存占用
+
+    Args:
+        manager: 管理器
+
+    Returns:
+        dict: 类别 -> 字节数(或数量), 见Manager.memory_report
+    """
+    result = {}
+    font_report(result)
+    icon_report(result)
+    framebuffer_report(manager, result)
+    skip = [manager, manager.display, manager.selector, manager.btn_event, manager.canvas, upbm.pbm_image]
+    skip.extend(fonts())
+    if manager.selector.canvas is not None: skip.append(manager.selector.canvas)
+    walker = Walker(skip)
+    # 页面历史和启动列表只统计列表本身, 其中的对象在遍历页面时统计
+    result['history'] = blocks(OBJ_HEAD+len(manager.history)*LIST_ITEM)
+    result['load list'] = blocks(OBJ_HEAD+len(manager.load_list)*LIST_ITEM)
+    walker.seen.add(id(manager.history))
+    walker.seen.add(id(manager.load_list))
+    for obj in manager.pages:
+        walker.visit(obj)
+    walker.visit(manager.others)
+    for obj in manager.load_list:
+        walker.visit(obj)
+    walker.visit(manager.selector.pos)
+    result['widget objects'] = walker.bytes
+    result['objects'] = walker.counts
+    result['object bytes'] = walker.sizes
+    result['animating'] = walker.animating
+    result['unloads'] = manager.unloads
+    result['reloads'] = manager.reloads
+    gc.collect()
+    result['mem_free'] = gc.mem_free()
+    result['mem_alloc'] = gc.mem_alloc()
+    result['largest_free'] = largest_free_block()
+    return result
@@ -0,0 +1,25 @@
+"""
+[pyi] draw shape lists
+
+last edited: 2025.8.27
+"""
+
+def draw(buf: bytearray, fmt: int, w: int, h: int, ops, count: int, x0: int, y0: int, x1: int, y1: int, oy: int):
+    """
+    依次绘制图形列表中的图形(y坐标加上oy), 只绘制裁剪矩形内的像素
+
+    图形的格式见drawer.Shapes, 结果与drawer.rasterize相同
+
+    Args:
+        buf: 帧缓冲区的数据
+        fmt: 帧缓冲区的格式, framebuf.MONO_VLSB或framebuf.MONO_HLSB
+        w: 帧缓冲区的宽度
+        h: 帧缓冲区的高度
+        ops: 图形列表(array('h'))
+        count: 图形数量
+        x0: 裁剪矩形左边(帧缓冲区坐标, 下同)
+        y0: 裁剪矩形上边
+        x1: 裁剪矩形右边(不包括)
+        y1: 裁剪矩形下边(不包括)
+        oy: 原点, 图形的第y行绘制到帧缓冲区的第y+oy行
+    """
@@ -1,7 +1,7 @@
 """
 font display
 
-last edited: 2025.8.24
+last edited: 2025.8.27
 MIT License
 Copyright (c) 2022 AntonVanke
 Copyright (c) 2025 kaixin168sxz
@@ -9,9 +9,23 @@ Copyright (c) 2025 kaixin168sxz
 
 import struct
 import framebuf
-from ..config import font_size, font_path, half_font_size, display_h
+from ..config import font_size, font_path, half_font_size, display_h, glyph_cache_size
 from micropython import const
 
+from . import kernels
+
+# 原生模块(见glyphrun目录)或viper实现可以一次合成整个字符串, 都不可用时逐个字形blit(结果相同, 不需要保存所有字形)
+glyph_run = kernels.glyph_run if kernels.backends['glyph_run'] != kernels.PYTHON else None
+text_width = kernels.text_width
+try:
+    import deflate
+except ImportError:
+    deflate = None  # MicroPython 1.21之前没有deflate模块, 只能使用未压缩的字体
+
+# 字体中不存在的字符
+MISSING_GLYPH = b'\xff\xff\xff\xff\xff\xff\xff\xff\xf0\x0f\xcf\xf3\xcf\xf3\xff\xf3\xff\xcf\xff?\xff?\xff\xff\xff' \
+                b'?\xff?\xff\xff\xff\xff'
+
 class BMFont:
     """
     点阵字体类，用于显示BMFont格式的字体
@@ -35,10 +49,28 @@ class BMFont:
         # 点阵所占字节
         # 用来定位字体数据位置
         self.bitmap_size = const(self.bmf_info[8])
+        # 压缩的字体(见tools/compress_assets.py): 保留字节9为1, 每2^bmf_info[10]个字形为一块,
+        # 块用deflate压缩(窗口2^bmf_info[11]字节), 读取字形时解压所在的块, 最近的一块保留在内存中
+        self.block_shift = self.bmf_info[10] if self.bmf_info[9] == 1 else 0
+        if self.block_shift:
+            if deflate is None:
+                raise ImportError('compressed font needs the deflate module')
+            self.wbits = self.bmf_info[11]
+            self.block = -1
+            self.block_buf = bytearray(self.bitmap_size << self.block_shift)
+            self.offset_buf = bytearray(4)
         del self.bmf_info
 
         self.font_size = font_size if size is False else size
         self.half_font_size = half_font_size if size is False else size//2
+        # 常用字符的点阵缓存, 避免每次set_text都读取文件
+        self.glyph_cache = {}
+        self.missing_glyph = (MISSING_GLYPH + bytes(self.bitmap_size))[:self.bitmap_size]
+        # 复用的单个字形缓冲区(Python实现使用)
+        self.glyph_buf = bytearray(max(self.bitmap_size, ((self.font_size + 7) // 8) * self.font_size))
+        self.glyph_fbuf = framebuf.FrameBuffer(self.glyph_buf, self.font_size, self.font_size, framebuf.MONO_HLSB)
+        # 常驻的字形表(见glyph_table), 字符集 -> (缓冲区, {字符编码: FrameBuffer})
+        self.glyph_tables = {}
 
     def blit_text(self, blit_func, string, x=0, y=0):
         """
@@ -50,11 +82,39 @@ class BMFont:
             x: x坐标
             y: y坐标
         """
+        glyph = memoryview(self.glyph_buf)[:self.bitmap_size]
+        glyph_fbuf = self.glyph_fbuf
         for char in string:
-            blit_func(framebuf.FrameBuffer(bytearray(list(self.get_bitmap(char))),
-                                           self.font_size, self.font_size, framebuf.MONO_HLSB), x, y, 0)
+            self.read_glyph(char, glyph)
+            blit_func(glyph_fbuf, x, y, 0)
             x += self.half_font_size if ord(char) < 128 else self.font_size
 
+    def glyph_table(self, chars) -> dict:
+        """
+        把一组字符的字形读入一个常驻的缓冲区, 每个字形是其中一段上的FrameBuffer,
+        绘制时直接blit, 不需要读取文件或复制字形(同一字符集只创建一次)
+
+        Args:
+            chars: 字符集, 例如'0123456789'
+
+        Returns:
+            dict: 字符编码 -> FrameBuffer
+        """
+        table = self.glyph_tables.get(chars)
+        if table is not None: return table[1]
+        size = len(self.glyph_buf)
+        buf = bytearray(size * len(chars))
+        mv = memoryview(buf)
+        fbufs = {}
+        offset = 0
+        for char in chars:
+            self.read_glyph(char, mv[offset:offset+self.bitmap_size])
+            fbufs[ord(char)] = framebuf.FrameBuffer(mv[offset:offset+size], self.font_size, self.font_size,
+                                                    framebuf.MONO_HLSB)
+            offset += size
+        self.glyph_tables[chars] = (buf, fbufs)
+        return fbufs
+
     def text(self, blit_func, string, x, y):
         """
         显示缓存的文本
@@ -67,6 +127,19 @@ class BMFont:
         """
         blit_func(self.str_cache[string], x, y, 0)
 
+    def draw(self, canvas, string, x, y, w):
+        """
+        通过画布显示缓存的文本(超出裁剪矩形的部分不绘制)
+
+        Args:
+            canvas: 画布对象
+            string: 要显示的字符串
+            x: x坐标
+            y: y坐标
+            w: 字符串宽度
+        """
+        canvas.blit(self.str_cache[string], x, y, w, self.font_size, 0)
+
     def init(self, string) -> int:
         """
         初始化字符串，创建缓存
@@ -78,19 +151,31 @@ class BMFont:
             int: 字符串宽度
         """
         w = self.update_width(string)
+        if string in self.str_cache: return w  # 已经创建过(例如预加载时)
         buf = bytearray(max(((w + 7) // 8) * self.font_size, ((self.font_size + 7) // 8) * self.font_size))
-        fbuf = framebuf.FrameBuffer(buf, max(w, self.font_size), self.font_size, framebuf.MONO_HLSB)
-        self.blit_text(fbuf.blit, string)
+        fbuf_w = max(w, self.font_size)
+        fbuf = framebuf.FrameBuffer(buf, fbuf_w, self.font_size, framebuf.MONO_HLSB)
+        if glyph_run:
+            # 先读取所有字形, 再在一次调用中合成
+            size = self.bitmap_size
+            glyphs = bytearray(len(string) * size)
+            mv = memoryview(glyphs)
+            offset = 0
+            for char in string:
+                self.read_glyph(char, mv[offset:offset+size])
+                offset += size
+            glyph_run(buf, framebuf.MONO_HLSB, fbuf_w, self.font_size, string, glyphs,
+                         self.font_size, size, 0, 0)
+            del glyphs, mv
+        else:
+            self.blit_text(fbuf.blit, string)
         self.str_cache[string] = fbuf
         del fbuf, buf
         return w
 
     def update_width(self, string) -> int:
-        w = 0
-        for char in string:
-            # 英文字符半格显示
-            w += self.half_font_size if ord(char) < 128 else self.font_size
-        return w
+        # 英文字符半格显示
+        return text_width(string, self.half_font_size, self.font_size)
 
     def _get_index(self, word: str) -> int:
         """
@@ -114,6 +199,27 @@ class BMFont:
                 start = mid + 2
         return -1
 
+    def read_glyph(self, word: str, dst):
+        """
+        把字符的点阵读入dst(带缓存)
+
+        Args:
+            word: 字符
+            dst: 长度为bitmap_size的memoryview
+        """
+        bitmap = self.glyph_cache.get(word)
+        if bitmap is not None:
+            dst[:] = bitmap
+            return
+        index = self._get_index(word)
+        if index == -1:
+            dst[:] = self.missing_glyph
+            return
+        self.read_record(index, dst)
+        cache = self.glyph_cache
+        if len(cache) >= glyph_cache_size: cache.clear()
+        cache[word] = bytes(dst)
+
     def get_bitmap(self, word: str) -> bytes:
         """获取点阵图
 
@@ -126,11 +232,50 @@ class BMFont:
         index = self._get_index(word)
 
         if index == -1:
-            return b'\xff\xff\xff\xff\xff\xff\xff\xff\xf0\x0f\xcf\xf3\xcf\xf3\xff\xf3\xff\xcf\xff?\xff?\xff\xff\xff' \
-                   b'?\xff?\xff\xff\xff\xff'
+            return MISSING_GLYPH
+
+        bitmap = bytearray(self.bitmap_size)
+        self.read_record(index, bitmap)
+        return bytes(bitmap)
 
-        self.font.seek(self.start_bitmap + index * self.bitmap_size, 0)
-        return self.font.read(self.bitmap_size)
+    def read_record(self, index, dst):
+        """
+        读取第index个字形的点阵
+
+        Args:
+            index: 字形的序号
+            dst: 长度为bitmap_size的缓冲区
+        """
+        if not self.block_shift:
+            self.font.seek(self.start_bitmap + index * self.bitmap_size, 0)
+            self.font.readinto(dst)
+            return
+        block = index >> self.block_shift
+        if block != self.block:
+            self.read_block(block)
+        offset = (index - (block << self.block_shift)) * self.bitmap_size
+        dst[:] = memoryview(self.block_buf)[offset:offset+self.bitmap_size]
+
+    def read_block(self, block):
+        """
+        解压一块字形到block_buf
+
+        Args:
+            block: 块的序号
+        """
+        font = self.font
+        # 块表位于start_bitmap, 每块的起始位置为4字节(大端)
+        font.seek(self.start_bitmap + block * 4, 0)
+        font.readinto(self.offset_buf)
+        font.seek(struct.unpack('>I', self.offset_buf)[0], 0)
+        stream = deflate.DeflateIO(font, deflate.RAW, self.wbits)
+        buf = memoryview(self.block_buf)
+        n = 0
+        while n < len(buf):
+            count = stream.readinto(buf[n:])
+            if not count: break  # 最后一块的字形数可能较少
+            n += count
+        self.block = block
 
 bmf_cache = {}
 
@@ -1,11 +1,21 @@
 """
 draw icons
 
-last edited: 2025.8.24
+支持两种格式:
+    P4  PBM二进制格式, 数据与framebuf.MONO_HLSB相同
+    R4  头部与P4相同(第一行为R4), 数据为每行与上一行异或后RLE压缩的P4数据(见tools/compress_assets.py和kernels.rle_decode)
+    A4  图集, 多个图标上下排列在一张P4图像中(见tools/make_atlas.py), 使用"图集路径#图标名称"作为图标的路径:
+            A4
+            宽度 高度 图标数量
+            名称 y 宽度 高度        (每个图标一行)
+            P4数据
+
+last edited: 2025.8.27
 """
 
 import framebuf
-from ..config import icon_size
+from ..config import icon_size, icon_keep_compressed
+from .kernels import rle_decode
 
 class PBMImage:
     """
@@ -13,10 +23,48 @@ class PBMImage:
     """
     def __init__(self):
         """初始化PBM图像处理器"""
+        # 文件路径 -> FrameBuffer, 或保持压缩时为(压缩的数据, 宽度, 高度)
         self.img_cache = {}
+        # 保持压缩时解压用的缓冲区, (宽度, 高度) -> (bytearray, FrameBuffer), 相同大小的图标共用
+        self.scratch = {}
+        # 每个图像的宽高, 文件路径 -> (宽度, 高度)
+        self.sizes = {}
+        # 已载入的图集, 图集路径 -> 图像数据(所有图标共用)
+        self.atlases = {}
         self.w = icon_size
         self.h = icon_size
-        self.image = lambda blit_func, filepath, x, y: blit_func(self.img_cache[filepath], x, y)
+        self.image = lambda blit_func, filepath, x, y: blit_func(self.fbuf(filepath), x, y)
+
+    def fbuf(self, filepath):
+        """
+        获取图像的FrameBuffer(保持压缩的图像先解压到共用的缓冲区)
+
+        Args:
+            filepath: PBM文件路径
+
+        Returns:
+            FrameBuffer: 图像
+        """
+        img = self.img_cache[filepath]
+        if not isinstance(img, tuple): return img
+        data, w, h = img
+        buf, fbuf = self.scratch[(w, h)]
+        rle_decode(buf, data, (w + 7) // 8)
+        return fbuf
+
+    def draw(self, canvas, filepath, x, y, w, h):
+        """
+        通过画布显示缓存的图像(超出裁剪矩形的部分不绘制)
+
+        Args:
+            canvas: 画布对象
+            filepath: PBM文件路径
+            x: x坐标
+            y: y坐标
+            w: 图像宽度
+            h: 图像高度
+        """
+        canvas.blit(self.fbuf(filepath), x, y, w, h)
 
     def init(self, filepath):
         """
@@ -26,13 +74,73 @@ class PBMImage:
             filepath: PBM文件路径
         """
         if filepath in self.img_cache.keys(): return
+        if '#' in filepath:
+            atlas = filepath.split('#')[0]
+            if atlas not in self.atlases: self.load_atlas(atlas)
+            if filepath not in self.img_cache:
+                raise ValueError('no icon {} in atlas'.format(filepath))
+            self.w, self.h = self.sizes[filepath]
+            return
         # pbm file
         with open(filepath, 'rb') as f:
-            f.readline() # 忽略 pbm 文件首行内容
+            magic = f.readline().strip()  # P4或R4
             # 从文件第二行获取图片长宽
             size = f.readline().replace(b'\n', b'').split(b' ')
             self.w, self.h = int(size[0]), int(size[1])
             # 文件其余内容为图像数据
-            self.img_cache[filepath] = framebuf.FrameBuffer(bytearray(f.read()), self.w, self.h, framebuf.MONO_HLSB)
-            
-pbm_image = PBMImage()
\ No newline at end of file
+            data = f.read()
+        self.sizes[filepath] = (self.w, self.h)
+        if magic != b'R4':
+            self.img_cache[filepath] = framebuf.FrameBuffer(bytearray(data), self.w, self.h, framebuf.MONO_HLSB)
+            return
+        if icon_keep_compressed:
+            if (self.w, self.h) not in self.scratch:
+                buf = bytearray((self.w + 7) // 8 * self.h)
+                self.scratch[(self.w, self.h)] = buf, framebuf.FrameBuffer(buf, self.w, self.h, framebuf.MONO_HLSB)
+            self.img_cache[filepath] = (data, self.w, self.h)
+            return
+        # 直接解压到图像的缓冲区
+        buf = bytearray((self.w + 7) // 8 * self.h)
+        rle_decode(buf, data, (self.w + 7) // 8)
+        self.img_cache[filepath] = framebuf.FrameBuffer(buf, self.w, self.h, framebuf.MONO_HLSB)
+
+    def load_atlas(self, atlas):
+        """
+        载入图集中的所有图标, 之后可以通过"图集路径#图标名称"使用
+
+        图像数据只读取一次, 保存在一个缓冲区中, 每个图标是指向其中一部分的FrameBuffer(不复制数据)
+
+        Args:
+            atlas: 图集文件路径
+        """
+        with open(atlas, 'rb') as f:
+            if f.readline().strip() != b'A4':
+                raise ValueError('not an icon atlas: ' + atlas)
+            w, h, count = (int(n) for n in f.readline().split())
+            icons = [f.readline().split() for _ in range(count)]
+            stride = (w + 7) // 8
+            data = bytearray(stride * h)
+            f.readinto(data)
+        mv = memoryview(data)
+        for name, y, icon_w, icon_h in icons:
+            y, icon_w, icon_h = int(y), int(icon_w), int(icon_h)
+            filepath = atlas + '#' + name.decode()
+            # 每行仍按图集的宽度存放, 所以stride为图集的宽度
+            self.img_cache[filepath] = framebuf.FrameBuffer(mv[y*stride:(y+icon_h)*stride], icon_w, icon_h,
+                                                            framebuf.MONO_HLSB, w)
+            self.sizes[filepath] = (icon_w, icon_h)
+        self.atlases[atlas] = data
+
+    def size(self, filepath) -> tuple:
+        """
+        图像的宽高(需要先init)
+
+        Args:
+            filepath: 文件路径
+
+        Returns:
+            tuple: (宽度, 高度)
+        """
+        return self.sizes[filepath]
+
+pbm_image = PBMImage()
@@ -0,0 +1,171 @@
+"""
+list menu
+last edited: 2025.8.27
+"""
+from .config import *
+from .libs import drawer
+from .ui import Pos, Page
+
+class YScrollBar:
+    """
+    垂直滚动条类
+    """
+    def __init__(self, manager):
+        """
+        初始化垂直滚动条
+
+        Args:
+            manager: 所属的管理器
+        """
+        self.manager = manager
+        self.pos = Pos()
+        # 轨道的两条线不变, 只需添加一次, 滑块在每帧更新
+        self.shapes = drawer.Shapes(3)
+        self.shapes.fill_rect(yscrollbar_line_x, top_gap, 1, yscrollbar_line_yh-top_gap+1)
+        self.shapes.fill_rect(yscrollbar_x, yscrollbar_bottom_line_y, yscrollbar_w+1, 1)
+
+    def update(self):
+        """更新滚动条显示"""
+        # x: yscrollbar_x
+        # y: top_gap
+        shapes = self.shapes
+        shapes.count = 2
+        shapes.fill_rect(yscrollbar_x, top_gap, self.pos.w, self.pos.h)
+        self.manager.canvas.draw_shapes(shapes)
+
+    # @timeit
+    def update_val(self):
+        """更新滚动条值"""
+        menu = self.manager.current_menu
+        if menu.count_children == 1:
+            h = yscrollbar_h
+        else:
+            h = (menu.selected_id + 1 ) / menu.count_children * yscrollbar_h
+
+        self.pos.animation((yscrollbar_x, top_gap, yscrollbar_w, round(h)), ease_func=scrollbar_ease)
+
+class ListMenu(Page):
+    """
+    列表菜单类
+    """
+    def __init__(self, manager=None):
+        """
+        初始化列表菜单
+
+        Args:
+            manager: 所属的管理器(默认为当前的默认管理器)
+        """
+        super().__init__(page_type=0, manager=manager)
+        self.scrollbar = YScrollBar(self.manager)
+        self.others.append(self.scrollbar)
+        self.camera.h = list_max_h
+        self.x_offset = list_selector_left_space+1
+        self.y_offset = list_selector_top_space
+        self.view.w = yscrollbar_mask_x-out_gap  # 不包括滚动条
+
+    def update(self):
+        """更新菜单显示"""
+        cam = self.camera
+        if cam.animating: cam.update()
+        canvas = self.manager.canvas
+        canvas.clip_to(self.view)
+        # 只遍历相机窗口内的子项, 绘制的耗时与菜单的大小无关
+        # 分块绘制时跳过位于当前块上方的子项(展开动画中子项的y坐标不会超过dy, 所以按dy判断即可)
+        children = self.children
+        bottom = cam.y+cam.h
+        i = self.first_visible(cam.y-self.y_offset+canvas.y0)
+        while i < self.count_children:
+            child = children[i]
+            _pos = child.pos
+            if _pos.dy >= bottom: break
+            if _pos.animating: _pos.update()
+            child.update()
+            if debug_alloc: self.manager.alloc_mark(child)
+            i += 1
+        canvas.unclip()
+        for other in self.others:
+            if other.pos.animating: other.pos.update()
+            other.update()
+
+    # @timeit
+    def change_selection(self, child):
+        """
+        更改选中项
+
+        Args:
+            child: 新的选中项
+        """
+        pass
+
+    def first_visible(self, y) -> int:
+        """
+        二分查找相机位于y时第一个可见的子项(子项按dy排列)
+
+        Args:
+            y: 相机y坐标
+
+        Returns:
+            int: 子项索引
+        """
+        children = self.children
+        lo = 0
+        hi = self.count_children
+        while lo < hi:
+            mid = (lo+hi)//2
+            pos = children[mid].pos
+            if pos.dy+pos.h+list_space <= y: lo = mid+1
+            else: hi = mid
+        return lo
+
+    def visible_range(self, x, y) -> tuple[int, int]:
+        """
+        获取相机位于(x, y)时可见的子项范围
+
+        Args:
+            x: 相机x坐标
+            y: 相机y坐标
+
+        Returns:
+            tuple: (第一个可见子项的索引, 最后一个可见子项的索引+1)
+        """
+        first = end = self.first_visible(y)
+        bottom = y+self.camera.h
+        children = self.children
+        while end < self.count_children and children[end].pos.dy < bottom:
+            end += 1
+        return first, end
+
+    # @timeit
+    def update_camera(self):
+        """更新相机位置"""
+        pos = self.manager.selector.selected.pos
+        cam = self.camera
+        y = pos.dy
+        yh = y + pos.h + list_space
+        x = cam.x
+        # 1是选择器的宽度
+        if y < cam.y:
+            cam.animation((x, y), only_xy=True, ease_func=camera_ease, duration=camera_duration)
+        elif yh > cam.y+cam.h:
+            cam.animation((x, yh-dish_gap+1), only_xy=True, ease_func=camera_ease, duration=camera_duration)
+
+    def add(self, child):
+        """
+        添加子项到菜单
+
+        Args:
+            child: 要添加的子项
+        """
+        child.parent = self
+        child.id = self.count_children
+        pos = child.pos
+        pos.dx = pos.x
+        dy = 0
+        if self.count_children:
+            last = self.children[-1].pos
+            dy = last.dy+last.h+list_space
+        pos.dy = dy
+        # 子项默认位于目标位置, 展开动画只作用于可见的子项(见Manager.expand)
+        pos.y = dy
+        self.children.append(child)
+        self.count_children += 1
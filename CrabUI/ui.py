@@ -1,15 +1,26 @@
 """
 main file
+核心部分: 位置/动画, 选择器, 按钮事件, 管理器和页面基类
+菜单与组件位于各自的模块中, 在首次使用时才会被导入(见`__init__.py`)
 last edited: 2025.8.27
 """
-import time
-
 from .config import *
-from .libs import ufont, upbm, drawer, bufxor
+from .libs import drawer
+from .canvas import Canvas
 import utime
-from machine import Pin, Timer
+try:
+    from machine import Pin
+except ImportError:
+    Pin = None  # 例如unix port, 没有按钮, 只能直接调用manager.up等方法
+try:
+    from machine import lightsleep
+except ImportError:
+    lightsleep = None
 import framebuf
-from gc import collect
+from array import array
+from gc import collect, mem_alloc, mem_free
+# 热点计算(异或、缓动等), 导入时选择最快的可用实现, 见kernels.backends
+from .libs import kernels
 
 # 判断环境, micropython无法导入pyi
 try:
@@ -39,10 +50,45 @@ def timeit(f, *_args, **_kwargs):
         return result
     return new_func
 
+_ease_tables = {}
+
+def ease_table(ease_func):
+    """
+    获取缓动表(带缓存)
+
+    Args:
+        ease_func: 缓动函数
+
+    Returns:
+        array: ease_steps+1个采样点的缓动值, 放大了2^ease_shift倍的整数
+    """
+    table = _ease_tables.get(ease_func)
+    if table is None:
+        scale = 1 << ease_shift
+        # 缓动函数的结果可能略小于0或大于1(如ease_in_out_back), 所以使用有符号数组
+        table = array('h', [round(ease_func(i / ease_steps) * scale) for i in range(ease_steps + 1)])
+        _ease_tables[ease_func] = table
+    return table
+
+def alloc_name(where) -> str:
+    """
+    获取内存分配统计中位置的名称
+
+    Args:
+        where: 阶段名称或组件对象
+    """
+    if isinstance(where, str): return where
+    return '{}({})'.format(type(where).__name__, getattr(where, 'title', ''))
+
 class Pos:
     """
     位置类，用于管理组件的位置和动画
     """
+    # 本帧是否有动画在进行, 由Manager在每帧开始时清除, 用于判断界面是否空闲
+    moved = False
+    # 当前帧的时间, 由Manager在每帧开始时设置, 所有动画按这个时间插值
+    now = 0
+
     def __init__(self, x=0, y=0, w=0, h=0):
         """
         初始化位置对象
@@ -56,62 +102,66 @@ class Pos:
         self.x, self.y, self.w, self.h = x, y, w, h
         # 用于保存目标坐标(destination pos)
         self.dx, self.dy, self.dw, self.dh = x, y, w, h
-        self.generator = None
-        self.last_time = False
-
-    def animation(self, pos: tuple, num_frames=None, only_xy=False, ease_func=None):
+        # 动画状态, 动画进行时直接修改x,y,w,h, 每一帧不创建新对象
+        self.animating = False
+        self.only_xy = False
+        self.start = None  # 动画开始的时间, 在动画的第一帧设置
+        self.duration = 0
+        self.table = None
+        self.sx, self.sy, self.sw, self.sh = x, y, w, h  # 动画起点(start)
+        self.tx, self.ty, self.tw, self.th = x, y, w, h  # 动画终点(target)
+
+    def animation(self, pos: tuple, num_frames=None, only_xy=False, ease_func=None, duration=None):
         """
         设置位置动画
 
         Args:
             pos: 目标位置元组 (x, y, w, h)
-            num_frames: 动画帧数
+            num_frames: 动画帧数(兼容旧的接口, 按base_ani_fps换算为时长)
             only_xy: 是否只动画x,y坐标
             ease_func: 缓动函数
+            duration: 动画时长 ms, 优先于num_frames
         """
-        self.generator = self._animation_generator(pos, num_frames, only_xy, ease_func)
-
-    def _animation_generator(self, pos: tuple, num_frames=None, only_xy=False, ease_func=None):
-        """
-        位置动画生成器
-
-        Args:
-            pos: 目标位置元组
-            num_frames: 动画帧数
-            only_xy: 是否只动画x,y坐标
-            ease_func: 缓动函数
-
-        Yields:
-            每一帧的位置信息
-        """
-        ease_func = ease_func if ease_func else default_ease
-        if num_frames is None: num_frames = default_speed
-        x, y, w, h = self.x, self.y, self.w, self.h
-        _num_frames_sub1 = num_frames - 1
-        if only_xy:
-            dx, dy = pos[0]-x, pos[1]-y
-            for i in range(num_frames):
-                eased = ease_func(i / _num_frames_sub1)
-                yield [int(x+dx*eased), int(y+dy*eased), w, h]
-        else:
-            dx, dy, dw, dh = pos[0]-x, pos[1]-y, pos[2]-w, pos[3]-h
-            for i in range(num_frames):
-                eased = ease_func(i / _num_frames_sub1)
-                yield [int(x+dx*eased), int(y+dy*eased), int(w+dw*eased), int(h+dh*eased)]
+        if duration is None:
+            duration = default_duration if num_frames is None else num_frames*base_ani_sleep
+        self.sx, self.sy, self.sw, self.sh = self.x, self.y, self.w, self.h
+        self.tx, self.ty = pos[0], pos[1]
+        if not only_xy: self.tw, self.th = pos[2], pos[3]
+        self.only_xy = only_xy
+        self.table = ease_table(ease_func if ease_func else default_ease)
+        self.duration = duration if duration > 0 else 1
+        self.start = None
+        self.animating = True
 
     def update(self):
         """更新位置动画"""
-        # 可以写成 `if not self.generator: break`的形式，但或许会增加性能消耗？
-        if self.generator:
-            # 防止动画因为帧数过高而变快
-            now = utime.ticks_ms()
-            if utime.ticks_diff(now, self.last_time) < base_ani_sleep: return
-            self.last_time = now
-
-            try:
-                self.x, self.y, self.w, self.h = next(self.generator)
-            except StopIteration:
-                self.generator = None
+        if self.animating:
+            Pos.moved = True
+            now = Pos.now
+            if self.start is None: self.start = now
+            elapsed = utime.ticks_diff(now, self.start)
+
+            # 按经过的时间插值: 某一帧绘制较慢时, 下一帧直接跳到对应的位置, 动画总时长不变
+            if elapsed >= self.duration:
+                self.animating = False
+                self.x = self.tx
+                self.y = self.ty
+                if not self.only_xy:
+                    self.w = self.tw
+                    self.h = self.th
+                return
+
+            # 定点数插值: 缓动表中的值已放大2^ease_shift倍, 全程只使用小整数, 不分配内存
+            eased = kernels.ease(self.table, elapsed, self.duration)
+            start = self.sx
+            self.x = start + ((self.tx - start) * eased >> ease_shift)
+            start = self.sy
+            self.y = start + ((self.ty - start) * eased >> ease_shift)
+            if not self.only_xy:
+                start = self.sw
+                self.w = start + ((self.tw - start) * eased >> ease_shift)
+                start = self.sh
+                self.h = start + ((self.th - start) * eased >> ease_shift)
 
     def centre(self, x:int=0, y:int=0) -> tuple[int, int]:
         """
@@ -128,26 +178,44 @@ class Selector:
     """
     选择器类，用于在菜单中显示当前选中项
     """
-    def __init__(self):
-        """初始化选择器"""
+    def __init__(self, manager):
+        """
+        初始化选择器
+
+        Args:
+            manager: 所属的管理器
+        """
+        self.manager = manager
         self.pos = Pos()
-        self.fbuf = display
+        self.canvas = None  # 不填充时直接绘制到管理器的画布上
         if selector_fill:
-            self.buf = bytearray(display_fb_size)
-            self.fbuf = framebuf.FrameBuffer(self.buf, display_w, display_h, framebuf.MONO_VLSB)
-        self.drw = drawer.round_rect
+            # 与管理器的画布大小相同(分块绘制时只有一个块的大小)
+            buf_h = manager.canvas.buf_h
+            self.buf = bytearray(display_w*buf_h//8)
+            self.fbuf = framebuf.FrameBuffer(self.buf, display_w, buf_h, framebuf.MONO_VLSB)
+            self.canvas = Canvas(self.fbuf, buffer=self.buf, buf_h=buf_h)
+        # 选择器的图形, 每帧重新添加后一次提交
+        self.shapes = drawer.Shapes(1)
+        self.drw = self.shapes.round_rect
         self.selected = None
 
     # @timeit
     def update(self):
         """更新选择器显示"""
         pos = self.pos
-        cam = manager.current_menu.camera
-        if pos.generator:
+        menu = self.manager.current_menu
+        cam = menu.camera
+        canvas = self.canvas or self.manager.canvas
+        if pos.animating:
             pos.update()
         if selector_fill:
             self.fbuf.fill(0)
-        self.drw(self.fbuf, pos.x-cam.x+out_gap, pos.y-cam.y+top_gap, pos.w, pos.h, 1, selector_fill)
+        self.shapes.count = 0
+        self.drw(pos.x-cam.x+out_gap, pos.y-cam.y+top_gap, pos.w, pos.h, 1, selector_fill)
+        # 选择器只显示在菜单的可视区域内
+        canvas.clip_to(menu.view)
+        canvas.draw_shapes(self.shapes)
+        canvas.unclip()
 
     # @timeit
     def select(self, child, update_cam=True):
@@ -159,7 +227,7 @@ class Selector:
             update_cam: 是否更新相机位置
         """
         pos: Pos = child.pos
-        menu = manager.current_menu
+        menu = self.manager.current_menu
         if menu.type == 0:
             child_w = 0  # child pos w
             if hasattr(child, 'widget') and child.widget:
@@ -167,42 +235,85 @@ class Selector:
             w = min(list_max_w-child_w, pos.w+list_selector_left_gap*2+1)
             # 1是选择器的宽度
             self.pos.animation((pos.dx, pos.dy, w, pos.h+list_selector_top_gap*2+1),
-                               selector_speed, ease_func=selector_ease)
+                               ease_func=selector_ease, duration=selector_duration)
         elif menu.type == 1:
             # 1是选择器的宽度
             self.pos.animation((pos.dx, pos.dy+xscrollbar_space+1, pos.w+icon_selector_gap*2,
-                                pos.h+icon_selector_gap*2), selector_speed, ease_func=selector_ease)
+                                pos.h+icon_selector_gap*2), ease_func=selector_ease, duration=selector_duration)
         if hasattr(menu, 'change_selection'): menu.change_selection(child)
         self.selected = child
         menu.selected_id = self.selected.id
         menu.scrollbar.update_val()
         if update_cam: menu.update_camera()
 
-    def up(self):
-        """选择上一个项目"""
+    def target(self, n) -> int:
+        """
+        计算从当前选中项移动n项后的索引
+
+        移动超过第一项/最后一项时先停在第一项/最后一项, 已经位于第一项/最后一项时才循环(menu_loop)
+
+        Args:
+            n: 移动的项数, 负数表示向上
+
+        Returns:
+            int: 子项索引
+        """
+        last_id = self.manager.current_menu.count_children-1
         child_id = self.selected.id
-        last_id = manager.current_menu.count_children-1
-        child_id = (last_id if child_id == 0 else child_id-1) if menu_loop else child_id
+        i = child_id+n
+        if i > last_id:
+            i = 0 if menu_loop and child_id == last_id else last_id
+        elif i < 0:
+            i = last_id if menu_loop and child_id == 0 else 0
+        return i
+
+    def select_index(self, i):
+        """
+        选择当前菜单中指定索引的子项
 
-        self.select(manager.current_menu.children[child_id])
+        Args:
+            i: 子项索引, 负数表示从末尾开始
+        """
+        menu = self.manager.current_menu
+        if i < 0: i += menu.count_children
+        self.select(menu.children[i])
+
+    def jump(self, n):
+        """
+        移动n项, 只播放一次选择器、滚动条和相机的动画
+
+        Args:
+            n: 移动的项数, 负数表示向上
+        """
+        i = self.target(n)
+        if i != self.selected.id:
+            self.select_index(i)
+
+    def up(self):
+        """选择上一个项目"""
+        self.jump(-1)
 
     def down(self):
         """选择下一个项目"""
-        child_id = self.selected.id
-        last_id = manager.current_menu.count_children-1
-        child_id = (0 if child_id == last_id else child_id + 1) if menu_loop else child_id
-
-        self.select(manager.current_menu.children[child_id])
+        self.jump(1)
 
 class ButtonEvent:
     """
     按钮事件处理类
     """
-    def __init__(self):
-        """初始化按钮事件处理器"""
+    def __init__(self, manager):
+        """
+        初始化按钮事件处理器
+
+        Args:
+            manager: 所属的管理器
+        """
+        self.manager = manager
         self.events = []
+        self.last_input = 0  # 最后一次按钮状态变化的时间
 
-    def add(self, btn_pin: int, link: callable, event: int=0, sleep_ms: int=0, mirror: bool=False):
+    def add(self, btn_pin: int, link: callable, event: int=0, sleep_ms: int=0, mirror: bool=False,
+            repeat: bool=False):
         """
         添加按钮事件
 
@@ -212,94 +323,255 @@ class ButtonEvent:
             event: 回调事件
             sleep_ms: 按钮的判断间隔时间(ms)
             mirror: 是否反转按钮状态的布尔值(如果按钮按下为true，请启用此项)
+            repeat: 按住按钮时是否重复触发, 重复触发时以步长调用link(step), 按住越久步长越大
+                    (例如manager.up/manager.down), 见配置中的btn_repeat_*
         Evnet:
             (当mirror为True时反转)
 
             - `1` - 当按钮按下时触发回调函数
-            - `0` - 当按钮松开时触发回调函数
+            - `0` - 当按钮松开时触发回调函数(发生过重复触发时不再触发)
         """
-        self.events.append([Pin(btn_pin, Pin.IN, Pin.PULL_UP), False, link, event, sleep_ms, time.ticks_ms(), mirror])
+        # [引脚, 是否按下, 回调, 事件, 间隔, 上次触发的时间, 反转, 重复触发, 下次重复触发的时间, 重复次数, 步长]
+        self.events.append([Pin(btn_pin, Pin.IN, Pin.PULL_UP), False, link, event, sleep_ms, self.manager.now, mirror,
+                            repeat, 0, 0, 1])
 
     def update(self):
         """更新按钮状态并处理事件"""
-        if manager.starting_up: return
+        if self.manager.starting_up: return
+        now = self.manager.now
         for btn_data in self.events:
             if btn_data[0].value() ^ btn_data[6]:
                 if not btn_data[1]: continue
                 btn_data[1] = False
+                self.last_input = now
                 if not btn_data[3]:
-                    if time.ticks_diff(time.ticks_ms(), btn_data[5]) < btn_data[4]: continue
-                    btn_data[5] = time.ticks_ms()
+                    if btn_data[9]: continue  # 按住时已经重复触发过
+                    if utime.ticks_diff(now, btn_data[5]) < btn_data[4]: continue
+                    btn_data[5] = now
                     btn_data[2]()
             else:
-                if btn_data[1]: continue
+                if btn_data[1]:
+                    if btn_data[7]: self.repeat(btn_data)
+                    continue
                 btn_data[1] = True
+                self.last_input = now
+                if btn_data[7]:
+                    btn_data[8] = utime.ticks_add(now, btn_repeat_delay)
+                    btn_data[9] = 0
+                    btn_data[10] = 1
                 if btn_data[3]:
-                    if time.ticks_diff(time.ticks_ms(), btn_data[5]) < btn_data[4]: continue
-                    btn_data[5] = time.ticks_ms()
+                    if utime.ticks_diff(now, btn_data[5]) < btn_data[4]: continue
+                    btn_data[5] = now
                     btn_data[2]()
 
+    def repeat(self, btn_data):
+        """
+        按住按钮时重复触发, 每重复btn_repeat_accel次步长翻倍
+
+        Args:
+            btn_data: 按钮事件
+        """
+        now = self.manager.now
+        if utime.ticks_diff(now, btn_data[8]) < 0: return
+        self.last_input = now
+        btn_data[8] = utime.ticks_add(now, btn_repeat_interval)
+        count = btn_data[9] = btn_data[9]+1
+        step = btn_data[10]
+        btn_data[2](step)
+        if count % btn_repeat_accel == 0 and step < btn_repeat_max_step:
+            btn_data[10] = step*2
+
+    def pending(self) -> bool:
+        """
+        检查是否有尚未处理的按钮状态变化(用于在休眠时立即唤醒)
+
+        Returns:
+            bool: 是否有按钮被按下或松开
+        """
+        for btn_data in self.events:
+            # btn_data[1]记录的是按钮是否处于按下状态
+            if (not btn_data[0].value() ^ btn_data[6]) != btn_data[1]:
+                return True
+        return False
+
+class VirtualClock:
+    """
+    虚拟时钟, 可以代替utime传给Manager(clock参数)
+
+    时间只在读取时(每次前进step毫秒, 管理器每帧读取一次)或调用advance/sleep_ms时前进, 与实际的运行速度无关:
+    很长的场景(例如持续2秒的对话框、滚动的文本)可以比实际时间更快地运行, 并且每次运行的每一帧都完全相同
+    """
+    def __init__(self, step=1000//target_fps, start=0):
+        """
+        初始化虚拟时钟
+
+        Args:
+            step: 每次读取后前进的时间 ms, 为0时只通过advance前进
+            start: 起始时间 ms
+        """
+        self.t = start
+        self.step = step
+
+    def ticks_ms(self) -> int:
+        """
+        读取当前时间(之后前进step毫秒)
+
+        Returns:
+            int: 时间 ms, 与utime.ticks_ms相同, 使用utime.ticks_diff比较
+        """
+        t = self.t
+        self.t = utime.ticks_add(t, self.step)
+        return t
+
+    def advance(self, ms):
+        """
+        前进指定的时间
+
+        Args:
+            ms: 时间 ms
+        """
+        self.t = utime.ticks_add(self.t, ms)
+
+    def sleep_ms(self, ms):
+        """休眠(立即返回, 只让时间前进)"""
+        self.advance(ms)
+
 class Manager:
     """
     管理器类，负责整个应用程序的管理
+
+    每个管理器就是一个独立的渲染上下文: 拥有自己的显示器、选择器、按钮事件、页面历史和帧率
+    多个管理器可以同时存在(例如一个设备上的两块屏幕), 字体和图标的缓存由所有管理器共享
     """
-    def __init__(self, driver):
+    def __init__(self, driver, band_h=band_h, clock=None):
         """
         初始化管理器
 
+        创建的页面和组件默认属于最近创建(或调用过activate)的管理器, 也可以通过manager参数指定
+
         Args:
             driver: 显示对象
+            band_h: 分块绘制时每块的高度(像素), 0表示使用完整的帧缓冲区, 见present
+            clock: 时钟, 提供ticks_ms和sleep_ms(默认为utime), 例如VirtualClock
         """
-        global manager, display
-        manager = self
-        display = driver
-        self.selector = Selector()
+        self.display: Display = driver
+        # 所有界面计时都使用此时钟, 每帧只读取一次(见now)
+        self.clock = clock if clock else utime
+        self.band_h = band_h
+        # 所有组件通过画布绘制, 超出裁剪矩形(例如页面的可视区域)的部分不会被绘制
+        if band_h:
+            if band_h % 8 or display_h % band_h:
+                raise ValueError('band_h must be a multiple of 8 and divide display_h')
+            band_buf = bytearray(display_w*band_h//8)
+            self.canvas = Canvas(framebuf.FrameBuffer(band_buf, display_w, band_h, framebuf.MONO_VLSB),
+                                 buffer=band_buf, buf_h=band_h)
+        else:
+            self.canvas = Canvas(driver)
+        # 硬件滚动: 通过显示器的起始行移动ListMenu的画面, 见present(分块绘制时不可用)
+        self.hw_scroll = hw_scroll and not band_h and callable(getattr(driver, 'set_start_line', None))
+        self.start_line = 0
+        self.render_frame = self.render  # 缓存绑定方法, 每帧调用时不分配内存
+        self.nav = 0  # 尚未处理的移动(up/down), 同一帧内的多次移动合并为一次, 见apply_nav
+        self.activate()
+        self.selector = Selector(self)
         self.starting_up = True
         self.load_list = []  # 在启动时会遍历列表中的元素，执行元素的init方法进行加载
+        # 上一次预加载完成时的页面和启动列表的长度, 见prefetch(分开保存, 空闲帧比较时不创建元组)
+        self.prefetched_target = None
+        self.prefetched_len = -1
+        # 按页面加载时继续扫描的位置: load_list中scan_index之前的项目都不属于scan_page, 见load
+        self.scan_page = None
+        self.scan_index = 0
+        self.unloads = 0  # 卸载页面的次数, 见release
+        self.reloads = 0  # 重新加载已卸载页面的次数
         self.count_fps = 0
         self.fps = 0
+        self.fps_time = self.clock.ticks_ms()
+        self.fps_text = '0'  # 缓存FPS文本, 仅在FPS变化时重新创建字符串
+        self.pacing = frame_pacing  # 是否在每帧之后休眠, 见pace
+        self.busy = True     # 界面是否在变化(动画/按键), 空闲时使用idle_fps
+        self.work_ms = 0     # 本秒内用于绘制的时间
+        self.paced_ms = 0    # 本秒内的总时间(绘制+休眠)
+        self.duty = 100      # 占空比(绘制时间的百分比)
+        self.now = self.fps_time  # 当前帧的时间, 每帧只读取一次
         self.history = []
+        self.pages = []  # 属于此管理器的页面和对话框, 用于memory_report
         self.display_on = True
         self.others = []
         self.custom_page = False
         self.current_menu: "ListMenu" | "IconMenu" | "Page" | None = None
-        self.icon_menu_dashline = _XDashLine()
-        self.btn_event = ButtonEvent()
-
-        if check_fps:
-            Timer(0, period=1000, callback=self.check_fps)
+        self.icon_menu_dashline = None  # 由第一个IconMenu创建
+        self.btn_event = ButtonEvent(self)
+        managers.append(self)
+        if debug_alloc:
+            self.alloc_stats = {}   # 位置 -> 累计分配的字节数
+            self.alloc_last = 0
+            self.alloc_frame = 0    # 当前帧分配的字节数
+            self.alloc_frames = 0   # 统计的总帧数
+            self.alloc_dirty = 0    # 发生了内存分配的帧数
+            self.alloc_max = 0      # 单帧最多分配的字节数
+
+    def activate(self):
+        """将此管理器设为默认管理器, 之后创建的页面和组件(未指定manager时)都属于此管理器"""
+        global default_manager
+        default_manager = self
 
     def add(self, child):
         self.others.append(child)
 
-    def up(self):
-        """处理向上按键"""
+    def up(self, n=1):
+        """
+        处理向上按键
+
+        选择器的移动在下一帧绘制前合并处理(见apply_nav), 同一帧内多次调用只播放一次动画
+
+        Args:
+            n: 次数(按住按钮重复触发时的步长)
+        """
         if self.custom_page:
             _func = self.current_menu.up
             if callable(_func):
-                _func()
+                for _ in range(n): _func()
             return
         selected = self.selector.selected
         if hasattr(selected, 'widget') and hasattr(selected.widget, 'up'):
             func = selected.widget.up
             if callable(func):
-                func()
+                # 支持步长的组件(ListSelect)只调用一次, 避免每一步都重新绘制文本
+                if getattr(selected.widget, 'multi_step', False): func(n)
+                else:
+                    for _ in range(n): func()
                 return
-        self.selector.up()
+        self.nav -= n
 
-    def down(self):
-        """处理向下按键"""
+    def down(self, n=1):
+        """
+        处理向下按键
+
+        Args:
+            n: 次数(按住按钮重复触发时的步长)
+        """
         if self.custom_page:
             _func = self.current_menu.down
-            if callable(_func): _func()
+            if callable(_func):
+                for _ in range(n): _func()
             return
         selected = self.selector.selected
         if hasattr(selected, 'widget') and hasattr(selected.widget, 'down'):
             func = selected.widget.down
             if callable(func):
-                func()
+                if getattr(selected.widget, 'multi_step', False): func(n)
+                else:
+                    for _ in range(n): func()
                 return
-        self.selector.down()
+        self.nav += n
+
+    def apply_nav(self):
+        """将尚未处理的移动合并为一次Selector.jump"""
+        nav = self.nav
+        if nav:
+            self.nav = 0
+            self.selector.jump(nav)
 
     def yes(self):
         """处理确认按键"""
@@ -308,6 +580,7 @@ class Manager:
             if callable(_func):
                 _func()
             return
+        self.apply_nav()
         link = self.selector.selected.link
         if callable(link):
             link()
@@ -320,18 +593,56 @@ class Manager:
         self.page(self.history[-1], record_history=False)
 
     # @timeit
-    def check_fps(self, _timer=None):
+    def check_fps(self):
         """检查并更新FPS"""
-        self.fps = self.count_fps
+        duty = self.duty
+        if self.pacing and self.paced_ms:
+            duty = self.work_ms * 100 // self.paced_ms
+            self.work_ms = self.paced_ms = 0
+        if self.fps != self.count_fps or self.duty != duty:
+            self.fps = self.count_fps
+            self.duty = duty
+            self.fps_text = '{} {}%'.format(self.fps, duty) if self.pacing else str(self.fps)
         self.count_fps = 0
 
-    def startup(self):
-        """启动加载函数"""
-        dis = display
+    def pace(self):
+        """
+        帧率控制: 在本帧剩余的时间内休眠
+
+        界面在变化(有动画或idle_delay内有按键)时按target_fps计算每帧的时间, 否则按idle_fps
+        休眠期间按钮状态变化会立即结束休眠
+        """
+        clock = self.clock
+        start = self.now
+        work = utime.ticks_diff(clock.ticks_ms(), start)
+        busy = self.busy or utime.ticks_diff(start, self.btn_event.last_input) < idle_delay
+        remaining = (1000 // target_fps if busy else 1000 // idle_fps) - work
+        if remaining > 0:
+            if pacing_lightsleep and lightsleep and clock is utime:
+                lightsleep(remaining)
+            else:
+                end = utime.ticks_add(start, work + remaining)
+                btn_event = self.btn_event
+                while not btn_event.pending():
+                    left = utime.ticks_diff(end, clock.ticks_ms())
+                    if left <= 0: break
+                    clock.sleep_ms(left if left < pacing_poll_ms else pacing_poll_ms)
+        self.work_ms += work
+        self.paced_ms += utime.ticks_diff(clock.ticks_ms(), start)
+
+    def startup(self, menu=None):
+        """
+        启动加载函数
+
+        Args:
+            menu: 第一个页面, lazy_load开启时只加载此页面
+        """
+        page = menu if lazy_load else None
         if not show_startup_page:
-            self.load()
+            self.load(page)
             self.starting_up = False
             return
+        from .libs import ufont
         text = ufont.bitmap_font()
         logo_w = text.init(logo_text)
         x = half_disw-logo_w//2
@@ -339,16 +650,19 @@ class Manager:
         pos = Pos(x=x, y=-10)
         pos.animation((x, y, logo_w, font_size))
         back = False
+        canvas = self.canvas
+        def draw_logo():
+            canvas.fill(0)
+            text.draw(canvas, logo_text, pos.x, pos.y, logo_w)
         while self.starting_up:
-            if pos.generator: pos.update()
-            dis.fill(0)
-            text.text(display.blit, logo_text, pos.x, pos.y)
+            Pos.now = self.now = self.clock.ticks_ms()
+            if pos.animating: pos.update()
+            self.present(draw_logo)
 #             display.rect(0, pos.y + y, display_w, 2)
-            dis.show()
-            if pos.generator: continue
+            if pos.animating: continue
             # 动画播放结束
             if not back:     # logo已经显示
-                self.load()  # 加载
+                self.load(page)  # 加载
                 back = True
                 pos.animation((x, -20, logo_w, font_size))    # 播放新的动画,让logo回到屏幕外
             else:
@@ -357,13 +671,100 @@ class Manager:
         collect()
 
     # @timeit
-    def load(self):
-        """加载启动列表中的项目"""
+    def load(self, page=None, limit=0) -> int:
+        """
+        加载启动列表中的项目
+
+        Args:
+            page: 只加载属于此页面的项目(以及不属于任何页面的项目, 例如对话框), None为全部加载
+            limit: 最多加载的项目数, 0为不限制
+
+        Returns:
+            int: 加载的项目数
+        """
         load_list = self.load_list
-        for _ in range(len(load_list)):
-            load_list[0].init()
-            self.load_list.pop(0)
+        count = 0
+        # 连续加载同一个页面时(预加载), 从上一次停下的位置继续, 每帧的耗时与启动列表的长度无关
+        i = self.scan_index if page is not None and page is self.scan_page else 0
+        self.scan_page = page
+        while i < len(load_list):
+            obj = load_list[i]
+            owner = owner_page(obj) if page is not None or unload_threshold else None
+            if page is not None and owner is not None and owner is not page:
+                i += 1
+                continue
+            obj.init()
+            load_list.pop(i)
+            if owner is not None and unload_threshold:
+                owner.loaded.append(obj)
+                if owner.unloaded:
+                    owner.unloaded = False
+                    self.reloads += 1
+            count += 1
+            if count == limit:
+                self.scan_index = i
+                return count
+        self.scan_index = i
+        collect()
+        return count
+
+    def release(self, menu) -> int:
+        """
+        内存不足(gc.mem_free()低于unload_threshold)时, 卸载不在屏幕上且不在历史记录中的页面
+
+        卸载的页面的项目回到启动列表, 下一次打开(或预加载)时重新加载
+
+        Args:
+            menu: 将要打开的页面
+
+        Returns:
+            int: 卸载的页面数
+        """
+        if mem_free() >= unload_threshold: return 0
+        resident = self.history + [menu, self.current_menu]
+        pages = [page for page in self.pages
+                 if isinstance(page, Page) and page.loaded and not any(page is obj for obj in resident)]
+        if not pages: return 0
+        # 字体和图标的缓存由所有管理器共用, 多个项目也可以共用同一个字符串或图标:
+        # 除了将要卸载的项目, 所有管理器的所有组件(包括load=False的标签)仍在使用的缓存项都保留
+        unloading = set(id(obj) for page in pages for obj in page.loaded)
+        keep = set()
+        for manager in managers:
+            for obj in manager.pages + manager.others:
+                used_assets(obj, unloading, keep)
+        for page in pages:
+            self.unload(page, keep)
         collect()
+        return len(pages)
+
+    def unload(self, page, keep=()):
+        """
+        卸载页面的文本和图标
+
+        Args:
+            page: 页面
+            keep: 不删除的缓存项, (id(缓存), 键)的集合
+        """
+        for obj in page.loaded:
+            for cache, key in obj.assets():
+                if key in cache and (id(cache), key) not in keep: del cache[key]
+            self.load_list.append(obj)
+        page.loaded = []
+        page.unloaded = True
+        self.unloads += 1
+
+    def prefetch(self):
+        """
+        预加载: 选择器停在指向其他页面的项目(item的page参数)上时, 在空闲帧中分几次加载该页面,
+        打开页面时不需要再加载, 切换动画不会卡顿
+        """
+        target = getattr(self.selector.selected, 'target', None)
+        if target is None: return
+        if target is self.prefetched_target and len(self.load_list) == self.prefetched_len: return
+        if self.load(target, prefetch_per_frame) < prefetch_per_frame:
+            # 已全部加载, 启动列表不变时不再检查
+            self.prefetched_target = target
+            self.prefetched_len = len(self.load_list)
 
     # @timeit
     def page(self, menu: "ListMenu" | "IconMenu" | "Page", record_history=True):
@@ -376,110 +777,224 @@ class Manager:
         """
         if self.starting_up:
             print('booting...')
-            self.startup()
+            self.startup(menu)
+        # 启动后创建的, 或lazy_load时尚未加载的项目
+        if self.load_list: self.load(menu)
         if record_history: self.history.append(menu)
-        if expand_ani:
-            if self.current_menu:
-                for i in self.current_menu.children:
-                    i.pos.x = 0
-                    i.pos.y = 0
-            for i in menu.children:
-                expand_ease = icon_expand_ease if menu.type == 1 else list_expand_ease
-                i.pos.animation((i.pos.dx, i.pos.dy), expand_speed, only_xy=True, ease_func=expand_ease)
+        if unload_threshold: self.release(menu)
+        self.nav = 0  # 尚未处理的移动属于之前的页面
         self.current_menu = menu
         if menu.type not in (0, 1):
             self.custom_page = True
-            return
-        self.custom_page = False
-        selector: Selector = self.selector
-        if not menu.count_children:
-            raise IndexError('a menu should have one or more items')
-        selector.drw = {0: drawer.round_rect,
-                        1: drawer.icon_selector}[menu.type]
-        selector.select(menu.children[menu.selected_id], update_cam=True)
+        else:
+            self.custom_page = False
+            selector: Selector = self.selector
+            if not menu.count_children:
+                raise IndexError('a menu should have one or more items')
+            selector.drw = {0: selector.shapes.round_rect,
+                            1: selector.shapes.icon_selector}[menu.type]
+            selector.select(menu.children[menu.selected_id], update_cam=True)
+        # 在选择之后播放, 此时已经知道相机的目标位置
+        if expand_ani: self.expand(menu)
+
+    def expand(self, menu):
+        """
+        播放页面的展开动画
+
+        只有目标相机窗口内(以及前后各expand_margin个)的子项从原点展开, 其余的子项保持在目标位置,
+        所以切换页面的耗时与菜单的大小无关
+
+        Args:
+            menu: 页面
+        """
+        cam = menu.camera
+        first, end = menu.visible_range(cam.tx, cam.ty)
+        first = max(0, first-expand_margin)
+        end = min(menu.count_children, end+expand_margin)
+        expand_ease = icon_expand_ease if menu.type == 1 else list_expand_ease
+        children = menu.children
+        for i in range(first, end):
+            pos = children[i].pos
+            pos.x = 0
+            pos.y = 0
+            pos.animation((pos.dx, pos.dy), only_xy=True, ease_func=expand_ease, duration=expand_duration)
+            # 从现在开始计时, 相机移动期间不在窗口内的子项到达窗口时动画已经结束
+            pos.start = self.now
+
+    def alloc_mark(self, where):
+        """
+        (调试) 统计自上一次标记以来分配的内存
+
+        在`debug_alloc`开启时由渲染循环调用, 第一次发现某个位置分配内存时会打印提示
+
+        Args:
+            where: 位置, 可以是阶段名称或组件对象
+        """
+        delta = mem_alloc() - self.alloc_last
+        if delta > 0:  # gc回收时差值为负, 忽略
+            self.alloc_frame += delta
+            stats = self.alloc_stats
+            if where not in stats:
+                print('[ALLOC]', alloc_name(where), delta, 'bytes')
+                stats[where] = 0
+            stats[where] += delta
+        # 重新读取, 不统计记录本身产生的分配
+        self.alloc_last = mem_alloc()
+
+    def alloc_report(self):
+        """
+        (调试) 打印并返回内存分配统计
+
+        Returns:
+            dict: 位置 -> 累计分配的字节数
+        """
+        print('frames: {}, allocating frames: {}, max: {} bytes/frame'.format(
+            self.alloc_frames, self.alloc_dirty, self.alloc_max))
+        for where, size in self.alloc_stats.items():
+            print('  {:<24} {:>8} bytes'.format(alloc_name(where), size))
+        return self.alloc_stats
+
+    def memory_report(self, verbose=True) -> dict:
+        """
+        估算内存占用, 按类别统计(用于确定内存预算, 或在长时间运行的测试中发现泄漏)
+
+        遍历所有页面、对话框及其组件, 以及字体、图标缓存和帧缓冲区, 大小按32位MicroPython估算
+
+        Args:
+            verbose: 是否打印
+
+        Returns:
+            dict: string bitmaps/glyph cache/icons/framebuffers/widget objects/history/load list(字节),
+                  strings/icon count/animating(数量), objects/object bytes(类型 -> 数量/字节),
+                  mem_free/mem_alloc/largest_free(字节), unloads/reloads(卸载/重新加载页面的次数)
+        """
+        from .libs import memory
+        result = memory.report(self)
+        if verbose:
+            for key in ('string bitmaps', 'glyph cache', 'icons', 'framebuffers', 'widget objects', 'history',
+                        'load list'):
+                print('  {:<24} {:>8} bytes'.format(key, result[key]))
+            for name, count in result['objects'].items():
+                print('    {:<22} {:>5} x {:>8} bytes'.format(name, count, result['object bytes'][name]))
+            print('strings: {}, icons: {}, animating: {}'.format(
+                result['strings'], result['icon count'], result['animating']))
+            print('free: {}, allocated: {}, largest free block: {}'.format(
+                result['mem_free'], result['mem_alloc'], result['largest_free']))
+            print('page unloads: {}, reloads: {}'.format(result['unloads'], result['reloads']))
+        return result
+
+    def band(self, y0, y1, oy):
+        """
+        准备绘制屏幕上的一个区域(所有画布)
+
+        Args:
+            y0: 区域的上边
+            y1: 区域的下边(不包括)
+            oy: 区域在帧缓冲区中的偏移, 见Canvas.begin
+        """
+        self.canvas.begin(y0, y1, oy)
+        if selector_fill: self.selector.canvas.begin(y0, y1, oy)
 
     # @timeit
-    def update(self, *_args):
-        """更新显示内容"""
-        if not self.display_on: return
-        if check_fps: self.count_fps += 1
-        self.btn_event.update()
-        display.fill(0)
+    def render(self):
+        """绘制当前区域(见band)的所有内容"""
+        canvas = self.canvas
+        canvas.fill(0)
         self.current_menu.update()
+        if debug_alloc: self.alloc_mark('menu')
         if not self.custom_page:
             self.selector.update()
-            if selector_fill: bufxor.xor(display.buffer, self.selector.buf)
-        display.fill_rect(0, 0, display_w, top_gap, 0)
-        display.fill_rect(0, top_gap, out_gap, display_h, 0)
-        display.fill_rect(right_mask_x, top_gap, out_gap, display_h, 0)
+            if selector_fill: kernels.xor(canvas.buffer, self.selector.buf)
+            if debug_alloc: self.alloc_mark('selector')
         if self.others:
             for i in self.others:
-                if i.pos.generator: i.pos.update()
+                if i.pos.animating: i.pos.update()
                 i.update()
+            if debug_alloc: self.alloc_mark('others')
         if check_fps:
-            display.fill_rect(0, 0, 30, 8, 0)
-            display.text(str(self.fps), 0, 0)
-        display.show()
-
-class XScrollBar:
-    """
-    水平滚动条类
-    """
-    def __init__(self):
-        """初始化水平滚动条"""
-        self.pos = Pos()
-
-    def update(self):
-        """更新滚动条显示"""
-        # x: out_gap
-        # y: top_gap
-        display.fill_rect(out_gap, xscrollbar_mask_y, xscrollbar_w, xscrollbar_mask_h, 0)
-        display.fill_rect(out_gap, top_gap, self.pos.w, self.pos.h, 1)
-
-    def update_val(self):
-        """更新滚动条值"""
-        menu = manager.current_menu
-        if menu.count_children == 1:
-            w = xscrollbar_w
-        else:
-            w = (menu.selected_id + 1 ) / menu.count_children * xscrollbar_w
-
-        self.pos.animation((out_gap, top_gap, round(w), xscrollbar_h), ease_func=scrollbar_ease)
-
-class YScrollBar:
-    """
-    垂直滚动条类
-    """
-    def __init__(self):
-        """初始化垂直滚动条"""
-        self.pos = Pos()
+            canvas.fill_rect(0, 0, len(self.fps_text)*8, 8, 0)
+            canvas.text(self.fps_text, 0, 0)
 
-    def update(self):
-        """更新滚动条显示"""
-        # x: yscrollbar_x
-        # y: top_gap
+    # @timeit
+    def update(self, *_args):
+        """更新显示内容"""
+        if not self.display_on: return
+        if debug_alloc:
+            self.alloc_frame = 0
+            self.alloc_last = mem_alloc()
+        now = self.now = Pos.now = self.clock.ticks_ms()
+        Pos.moved = False
+        if check_fps: self.count_fps += 1
+        # 每个管理器独立计算帧率(不使用硬件定时器, 多个管理器不会互相冲突)
+        if utime.ticks_diff(now, self.fps_time) >= 1000:
+            self.fps_time = now
+            self.check_fps()
+        self.btn_event.update()
+        if self.nav: self.apply_nav()
+        if debug_alloc: self.alloc_mark('input')
+        self.present(self.render_frame)
+        self.busy = Pos.moved
+        # 本帧没有动画时利用剩余的时间预加载
+        if prefetch_per_frame and not Pos.moved and self.load_list: self.prefetch()
+        if debug_alloc:
+            self.alloc_mark('show')
+            self.alloc_frames += 1
+            if self.alloc_frame:
+                self.alloc_dirty += 1
+                if self.alloc_frame > self.alloc_max: self.alloc_max = self.alloc_frame
+        if self.pacing: self.pace()
+
+    def present(self, render):
+        """
+        绘制一帧并发送到显示器
 
-        display.fill_rect(yscrollbar_mask_x, top_gap, yscrollbar_mask_w, yscrollbar_h, 0)
-        display.line(yscrollbar_line_x, top_gap, yscrollbar_line_x, yscrollbar_line_yh, 1)
-        display.line(yscrollbar_x, yscrollbar_bottom_line_y, yscrollbar_line_xw, yscrollbar_bottom_line_y, 1)
-        display.fill_rect(yscrollbar_x, top_gap, self.pos.w, self.pos.h, 1)
+        分块绘制(band_h)时, 依次在较小的缓冲区中绘制屏幕的每一块, 绘制后立即通过显示器的write_band发送,
+        帧缓冲区占用的内存与屏幕大小无关; 否则绘制完整的帧缓冲区后调用show
 
-    # @timeit
-    def update_val(self):
-        """更新滚动条值"""
-        menu = manager.current_menu
-        if menu.count_children == 1:
-            h = yscrollbar_h
+        Args:
+            render: 绘制函数, 绘制当前区域(见band)的所有内容
+        """
+        display = self.display
+        band_h = self.band_h
+        if band_h:
+            buffer = self.canvas.buffer
+            y = 0
+            while y < display_h:
+                self.band(y, y+band_h, -y)
+                render()
+                display.write_band(y, buffer)
+                y += band_h
+            return
+        start = 0
+        if self.hw_scroll:
+            # 列表滚动时移动显示器的起始行, 而不是移动缓冲区中的内容:
+            # 缓冲区与显示器的内存一致, 屏幕的第y行对应缓冲区的第(y+start)%display_h行,
+            # 列表内容在缓冲区中的位置不随滚动变化, 显示器驱动只需要发送变化的部分
+            menu = self.current_menu
+            if menu is not None and not self.custom_page and menu.type == 0:
+                cam = menu.camera
+                # 先更新相机的位置(按时间插值, 绘制时再次更新结果相同)
+                if cam.animating: cam.update()
+                start = cam.y % display_h
+            if start != self.start_line:
+                self.start_line = start
+                display.set_start_line(start)
+        if start:
+            # 屏幕被分成两部分, 分别位于缓冲区的底部和顶部
+            self.band(0, display_h-start, start)
+            render()
+            self.band(display_h-start, display_h, start-display_h)
+            render()
         else:
-            h = (menu.selected_id + 1 ) / menu.count_children * yscrollbar_h
-
-        self.pos.animation((yscrollbar_x, top_gap, yscrollbar_w, round(h)), ease_func=scrollbar_ease)
+            self.band(0, display_h, 0)
+            render()
+        display.show()
 
 class Page:
     """
     页面类
     """
-    def __init__(self, up=None, down=None, yes=None, page_type=-1):
+    def __init__(self, up=None, down=None, yes=None, page_type=-1, manager=None):
         """
         初始化页面
 
@@ -488,18 +1003,26 @@ class Page:
             down: 向下按键处理函数
             yes: 确认按键处理函数
             page_type: 页面类型
+            manager: 所属的管理器(默认为当前的默认管理器)
         """
+        self.manager: Manager = manager if manager else default_manager
+        self.manager.pages.append(self)
         self.type = page_type
         self.children = []
         self.count_children = 0
         self.camera = Pos()
         self.camera.w, self.camera.h = display_w, display_h
+        # 可视区域(屏幕坐标), 子项超出可视区域的部分不会被绘制
+        self.view = Pos(out_gap, top_gap, display_w-out_gap*2, dish_gap)
         self.up, self.down, self.yes = up, down, yes
         self.others = []
         self.scrollbar = None
         self.selected_id = 0
         self.x_offset = out_gap
         self.y_offset = top_gap
+        # 已加载的项目(只在unload_threshold开启时记录), 见Manager.release
+        self.loaded = []
+        self.unloaded = False
 
     def offset_pos(self, x, y):
         """
@@ -515,285 +1038,57 @@ class Page:
         return (x-self.camera.x+self.x_offset,
                 y-self.camera.y+self.y_offset)
 
-    def add(self, child):
+    def offset_x(self, x):
         """
-        添加子项到页面
+        计算偏移后的x坐标(不创建元组, 用于每帧的绘制)
 
         Args:
-            child: 要添加的子项
+            x: 原始x坐标
         """
-        child.id = self.count_children
-        self.children.append(child)
-        self.count_children += 1
-
-    def update(self):
-        """更新页面显示"""
-        for child in self.children:
-            if child.pos.generator: child.pos.update()
-            child.update()
-
-class ListMenu(Page):
-    """
-    列表菜单类
-    """
-    def __init__(self):
-        """初始化列表菜单"""
-        super().__init__(page_type=0)
-        self.scrollbar = YScrollBar()
-        self.others.append(self.scrollbar)
-        self.camera.h = list_max_h
-        self.x_offset = list_selector_left_space+1
-        self.y_offset = list_selector_top_space
+        return x-self.camera.x+self.x_offset
 
-    def update(self):
-        """更新菜单显示"""
-        if self.camera.generator: self.camera.update()
-        for child in self.children:
-            _pos = child.pos
-            _y = _pos.y-self.camera.y+top_gap
-            if _pos.generator: _pos.update()
-            if  _y>display_h or _y+_pos.h<0: continue
-            child.update()
-        for other in self.others:
-            if other.pos.generator: other.pos.update()
-            other.update()
-
-    # @timeit
-    def change_selection(self, child):
+    def offset_y(self, y):
         """
-        更改选中项
+        计算偏移后的y坐标(不创建元组, 用于每帧的绘制)
 
         Args:
-            child: 新的选中项
+            y: 原始y坐标
         """
-        pass
+        return y-self.camera.y+self.y_offset
 
-    # @timeit
-    def update_camera(self):
-        """更新相机位置"""
-        pos = manager.selector.selected.pos
-        cam = self.camera
-        y = pos.dy
-        yh = y + pos.h + list_space
-        x = cam.x
-        # 1是选择器的宽度
-        if y < cam.y:
-            cam.animation((x, y), camera_speed, only_xy=True, ease_func=camera_ease)
-        elif yh > cam.y+cam.h:
-            cam.animation((x, yh-dish_gap+1), camera_speed, only_xy=True, ease_func=camera_ease)
-
-    def add(self, child):
+    def visible_range(self, x, y) -> tuple[int, int]:
         """
-        添加子项到菜单
+        获取相机位于(x, y)时可见的子项范围
 
         Args:
-            child: 要添加的子项
-        """
-        child.parent = self
-        child.id = self.count_children
-        pos = child.pos
-        pos.dx = pos.x
-        dy = 0
-        for i in range(self.count_children):
-            dy += list_space+self.children[i].pos.h
-        pos.dy = dy
-        if not expand_ani: pos.y = pos.dy
-        self.children.append(child)
-        self.count_children += 1
-
-class IconMenu(Page):
-    """
-    图标菜单类
-    """
-    def __init__(self):
-        """初始化图标菜单"""
-        super().__init__(page_type=1)
-        self.scrollbar = XScrollBar()
-        self.title_label = Label(self, '', auto_add=False, offset_pos=False)
-        self.title_label.pos.y = display_h
-        self.others.append(self.title_label)
-        self.others.append(self.scrollbar)
-        self.others.append(manager.icon_menu_dashline)
-        self.camera.w = icon_max_w
-        self.x_offset = icon_selector_left_space
-        self.y_offset = icon_selector_top_space
-
-    def update(self):
-        """更新菜单显示"""
-        if self.camera.generator: self.camera.update()
-        for child in self.children:
-            _pos = child.pos
-            _x = _pos.x-self.camera.x+out_gap
-            if _pos.generator: _pos.update()
-            if  _x>display_w or _x+_pos.w<0: continue
-            child.update()
-        for other in self.others:
-            if other.pos.generator: other.pos.update()
-            other.update()
+            x: 相机x坐标
+            y: 相机y坐标
 
-    def change_selection(self, child):
+        Returns:
+            tuple: (第一个可见子项的索引, 最后一个可见子项的索引+1)
         """
-        更改选中项
-
-        Args:
-            child: 新的选中项
-        """
-        self.title_label.set_text(child.title)
-        pos = self.title_label.pos
-        pos.y = display_h
-        pos.x = half_disw - pos.w // 2
-        pos.dx = pos.x
-        pos.dy = display_h - pos.h - icon_title_bottom
-        pos.animation((pos.dx, pos.dy), only_xy=True, ease_func=icon_title_ease)
-
-    def update_camera(self):
-        """更新相机位置"""
-        pos = manager.selector.selected.pos
-        cam = self.camera
-        cam.animation((pos.dx-half_disw+pos.w//2, cam.y), camera_speed, only_xy=True, ease_func=camera_ease)
+        return 0, self.count_children
 
     def add(self, child):
         """
-        添加子项到菜单
+        添加子项到页面
 
         Args:
             child: 要添加的子项
         """
-        child.parent = self
         child.id = self.count_children
-        pos = child.pos
-        pos.dx = icon_item_space*self.count_children
-        pos.dy = pos.y
-        if not expand_ani: pos.x = pos.dx
         self.children.append(child)
         self.count_children += 1
 
-# class Dialog:
-#     def __init__(self):
-#         # TODO: 一个可以自定义的Dialog组件
-#         pass
-
-class TextDialog:
-    """
-    文本对话框类
-    """
-    def __init__(self, text: str='', duration=False):
-        """
-        初始化文本对话框
-
-        Args:
-            text: 显示的文本
-            duration: 显示持续时间
-        """
-        # 此类原来应继承于Dialog
-        self.type = 'TextDialog'
-        self.duration = duration if duration else dialog_default_duration
-        self.text = text
-        self.pos = Pos()
-        # TextDialog目前仅支持显示一个Label组件
-        self.child = Label(self, text, auto_add=False, offset_pos=False, load=False)
-        self.closing = False
-        self.opening = False
-        self.opened = False
-        self.open_time = False
-        self.appended = False
-        if self.child.pos.w > dialog_max_w:
-            print('Dialog text too long')
-        manager.load_list.append(self)
-
-    def open(self, text):
-        """
-        打开对话框并显示文本
-
-        Args:
-            text: 要显示的文本
-        """
-        self.set_text(text)
-        self.pop()
-
-    # @timeit
-    def init(self, reset_pos=True):
-        """
-        初始化对话框
-
-        Args:
-            reset_pos: 是否重置位置
-        """
-        self.child.init()
-        cpos = self.child.pos
-        pos = self.pos
-        if reset_pos:
-            pos.x = display_w
-            pos.y = dialog_out_gap
-        pos.w = min(dialog_max_w, cpos.w+dialog_in_gap_m2)
-        pos.h = cpos.h+dialog_in_gap_m2
-        pos.dx = max(dialog_max_x, dialog_base_x-cpos.w)
-        pos.dy = dialog_out_gap
-        if reset_pos:
-            cpos.x = display_w
-            cpos.y = dialog_out_gap+dialog_in_gap
-        cpos.dx = pos.dx+dialog_in_gap
-        cpos.dy = cpos.y
-
-    def set_text(self, text):
-        """
-        设置对话框文本
-
-        Args:
-            text: 新的文本内容
-        """
-        self.text = text
-        self.child.set_text(text)
-        self.init(False)
-        self.animation()
-
-    def animation(self):
-        """设置对话框动画"""
-        cpos = self.child.pos
-        pos = self.pos
-        pos.animation((pos.dx, pos.dy), dialog_speed, ease_func=dialog_ease, only_xy=True)
-        cpos.animation((cpos.dx, cpos.dy), dialog_speed, ease_func=dialog_ease, only_xy=True)
-
-    # @timeit
-    def pop(self):
-        """弹出对话框"""
-        self.animation()
-        self.opening = True
-        if not self.appended:
-            manager.others.append(self)
-            self.appended = True
-
-    # @timeit
-    def close(self, _timer=None):
-        """关闭对话框"""
-        self.closing = True
-        self.opened = False
-        cpos = self.child.pos
-        pos = self.pos
-        pos.animation((display_w, dialog_out_gap), dialog_speed, ease_func=dialog_ease, only_xy=True)
-        cpos.animation((display_w, dialog_out_gap+dialog_in_gap), dialog_speed, ease_func=dialog_ease, only_xy=True)
-
-    # @timeit
     def update(self):
-        """更新对话框显示"""
-        pos = self.pos
-        if self.opened and utime.ticks_diff(utime.ticks_ms(),self.open_time)>self.duration:
-            self.close()
-        if pos.generator: pos.update()
-        elif self.closing and pos.x == display_w:
-            self.appended = False
-            self.closing = False
-            manager.others.remove(self)
-        elif self.opening:
-            self.opening = False
-            self.opened = True
-            self.open_time = utime.ticks_ms()
-        drawer.round_rect(display, pos.x-2, pos.y-2, pos.w+5, pos.h+5, 0, 1)
-        if self.child.pos.generator: self.child.pos.update()
-        self.child.update()
-        _xw = pos.x+pos.w
-        display.fill_rect(_xw-2, pos.y-2, display_w-_xw+2, pos.h+4, 0)
-        drawer.round_rect(display, pos.x, pos.y, pos.w, pos.h, 1, 0)
+        """更新页面显示"""
+        canvas = self.manager.canvas
+        canvas.clip_to(self.view)
+        for child in self.children:
+            if child.pos.animating: child.pos.update()
+            child.update()
+            if debug_alloc: self.manager.alloc_mark(child)
+        canvas.unclip()
 
 class BaseWidget:
     """
@@ -807,393 +1102,53 @@ class BaseWidget:
             parent: 父组件
         """
         self.parent = parent
+        # 组件属于父组件的管理器(渲染上下文)
+        self.manager: Manager = parent.manager if parent else default_manager
         self.pos = Pos()
         self.id = 0
         self.type = -1
         self.link = link
         if add_self: parent.add(self)
 
-class Label(BaseWidget):
-    """
-    标签组件类
-    """
-    def __init__(self, parent, text=None, link=None, auto_add: bool=True, offset_pos: bool=True,
-                 always_scroll: bool=False, scroll_w: int | bool=False, try_scroll: bool=True,
-                 scroll_speed: int | bool=False, load: bool=True, font: str | bool=False, size: int | bool=False):
-        """
-        Label标签组件
-        Args:
-            parent(AnyWidget): 父组件
-            text(str): 显示的内容
-            link(callback): 单击后运行的函数
-            auto_add(bool): 是否自动调用父组件的add方法 (Builtin)
-            offset_pos(bool): 是否根据相机等偏移量进行坐标偏移 (Builtin)
-            always_scroll(bool): 是否在未被选中时进行滚动
-            scroll_w(int): 触发滚动文本的宽度阈值 (Builtin)
-            try_scroll(bool): 是否开启文本滚动
-            scroll_speed(int): 滚动速度(每秒偏移的像素)
-            load(int): 是否自动将self添加到manager的启动加载列表 (Builtin)
-        """
-        super().__init__(parent)
-        self.type = 0
-        self.font = ufont.bitmap_font(font, size)
-        self.pos.w = self.font.update_width(text)
-        self.text = text
-        self.title = text
-        self.link = link
-        self.link_ = link
-        self.pos.h = font_size if size is False else size
-        self.drw = self.font.text
-        self.xscroll = 0
-        self.offset = offset_pos
-        self.widget = None
-        self.always_scroll = always_scroll
-        self.try_scroll = try_scroll
-        self.last_time = False
-        self.scroll_w = disw_gap_bar if scroll_w is False else scroll_w
-        self.scroll_speed = string_scroll_speed if scroll_speed is False else scroll_speed
-        
-        # 在启动时加载字体
-        if load: manager.load_list.append(self)
-        if auto_add: parent.add(self)
-
-    def add(self, widget):
-        """
-        添加子组件
-
-        Args:
-            widget: 要添加的组件
-        """
-        self.link = self.widget_callback
-        self.widget = widget
-
-    def init(self):
-        """初始化标签，加载字体"""
-        # 耗时操作,会在启动时被manager调用加载
-        self.pos.w = self.font.init(self.text)
-
-    def widget_callback(self):
-        """组件回调函数"""
-        self.widget.widget_callback()
-        if callable(self.link_): self.link_()
-
-    def set_text(self, text):
-        """
-        设置标签文本
-
-        Args:
-            text: 新的文本内容
-        """
-        self.text = text
-        self.init()
-        selector = manager.selector
-        if selector.selected is self:
-            selector.select(self)
-
-    def scroll_text(self):
-        """滚动文本显示"""
-        _pos = self.pos
-        now = utime.ticks_ms()
-        if utime.ticks_diff(now, self.last_time) < base_ani_sleep: return
-        self.last_time = now
-        if manager.selector.selected is self or self.always_scroll or self.xscroll:
-            scr_w = self.scroll_w
-            _child_w = 0
-            if self.widget:
-                _child_w = self.widget.pos.w+widget_gap
-                scr_w -= _child_w
-            if _pos.w+out_gap > scr_w:
-                self.xscroll += self.scroll_speed
-                if manager.selector.selected is not self and abs(self.xscroll) < self.scroll_speed: self.xscroll = 0
-                elif self.xscroll > _pos.w: self.xscroll = -list_max_w+_child_w
-
-    # @timeit
-    def update(self):
-        """更新标签显示"""
-        if self.try_scroll:
-            self.scroll_text()
-        x, y = self.pos.x, self.pos.y
-        if self.offset:
-            x, y = manager.current_menu.offset_pos(x, y)
-        self.drw(display.blit, self.text, x-self.xscroll, y)
-        if self.widget: self.widget.update()
-
-class Icon(BaseWidget):
-    """
-    图标组件类
-    """
-    def __init__(self, parent, filepath=None, title='', link=None, auto_add: bool=True, offset_pos: bool=True):
-        """
-        初始化图标组件
-
-        Args:
-            parent: 父组件
-            filepath: 图片文件路径
-            title: 图标标题
-            link: 点击回调函数
-            auto_add: 是否自动添加到父组件
-            offset_pos: 是否使用偏移坐标
-        """
-        super().__init__(parent)
-        self.type = 1
-        self.pbm = upbm.pbm_image
-        self.filepath = filepath
-        self.link = link
-        self.pos.h, self.pos.w = icon_size, icon_size
-        self.drw = self.pbm.image
-        self.title = title
-        self.offset = offset_pos
-        # 在启动时加载图片
-        manager.load_list.append(self)
-        if auto_add: parent.add(self)
-
-    def init(self):
-        """初始化图标，加载图片"""
-        # 耗时操作,会在启动时被manager调用加载
-        self.pbm.init(self.filepath)
-
-    def set_image(self, filepath):
-        """
-        设置图标图片
-
-        Args:
-            filepath: 新的图片文件路径
-        """
-        self.filepath = filepath
-        self.pbm.init(filepath)
-
-    def update(self):
-        """更新图标显示"""
-        pos = self.pos
-        x, y = pos.x, pos.y
-        if self.offset:
-            x, y = manager.current_menu.offset_pos(x, y)
-        self.drw(display.blit, self.filepath, x, y)
-
-class CheckBox(BaseWidget):
+def owner_page(obj) -> "Page" | None:
     """
-    复选框组件类
-    """
-    def __init__(self, parent, default=False, link=None, base_x=False):
-        """
-        初始化复选框
-
-        Args:
-            parent: 父组件
-            default: 默认值
-            link: 回调函数
-            base_x: 基础x坐标
-        """
-        super().__init__(parent)
-        self.type = 2
-        self.value = default
-        self.link_ = link
-        self.base_x = base_x if base_x else list_max_w-list_selector_left_gap
-        pos = self.pos
-        pos.w = 8
-        pos.h = 8
-        pos.x = self.base_x-widget_gap-pos.w
-        pos.y = self.parent.pos.dy+half_list_item_space-4
-        self.parent.add(self)
-
-    def update(self):
-        """更新复选框显示"""
-        pos = self.pos
-        x, y = manager.current_menu.offset_pos(pos.x, pos.y)
-        display.fill_rect(x-widget_gap, y-5, disw_wgap-x, list_item_space, 0)  # mask
-        display.rect(x, y, pos.w, pos.h, 1)
-        if self.value: display.fill_rect(x+2, y+2, pos.w-4, pos.h-4, 1)
+    组件所属的页面
 
-    def widget_callback(self):
-        """组件回调函数"""
-        self.value = not self.value
-        if callable(self.link_): self.link_(self.value)
+    Args:
+        obj: 组件
 
-class ListSelect(BaseWidget):
-    """
-    列表选择器组件类
+    Returns:
+        沿parent向上找到的第一个页面, 不属于任何页面(例如对话框)时为None
     """
-    def __init__(self, parent, range_list, default_idx: int | bool=False, loop=False,
-                 link=None, change_link=None, flash_speed: int | bool=False, base_x=False):
-        """
-        初始化列表选择器
-
-        Args:
-            parent: 父组件
-            range_list: 选择范围列表
-            default_idx: 默认索引
-            loop: 是否循环选择
-            link: 回调函数
-            change_link: 值改变时的回调函数
-            flash_speed: 闪烁速度
-            base_x: 基础x坐标
-        """
-        super().__init__(parent)
-        self.type = 3
-        if not range_list: raise IndexError('a ListSelector Widget should has one or more items')
-        self.idx = 0 if default_idx is False else default_idx
-        self.max_idx = len(range_list)-1
-        self.value = range_list[self.idx]
-        self.range_list = range_list
-        self.activate = False
-        self.loop = loop
-        self.link_ = link
-        self.up_ = change_link
-        self.down_ = change_link
-        self.last_time = None
-        self.flash_status = False
-        self.flash_speed = flash_speed
-        if flash_speed is False:
-            self.flash_speed = widget_flash_speed
-        self.child = Label(self, text=str(self.value), auto_add=False, try_scroll=False, load=False)
-        self.up, self.down = None, None
-        self.base_x = base_x if base_x else list_max_w-list_selector_left_gap
-        manager.load_list.append(self)
-        self.parent.add(self)
-
-    def update(self):
-        """更新选择器显示"""
-        pos = self.pos
-        x, y = manager.current_menu.offset_pos(pos.x, pos.y)
-        display.fill_rect(x-widget_gap, y, pos.w+widget_gap_m2, list_item_space, 0)
-        now = utime.ticks_ms()
-        if not self.activate: self.flash_status = True  # 未被激活时不闪烁
-        elif utime.ticks_diff(now, self.last_time) > self.flash_speed:
-            self.flash_status = not self.flash_status
-            self.last_time = now
-
-        if self.flash_status:
-            self.child.update()
-
-    def init(self):
-        """初始化选择器"""
-        self.child.init()
-        pos = self.pos
-        cpos = self.child.pos
-        pos.w = cpos.w
-        pos.h = cpos.h
-        pos.x = self.base_x-widget_gap-pos.w
-        pos.y = self.parent.pos.dy
-        cpos.x = pos.x
-        cpos.y = pos.y
-
-    def set_text(self, value):
-        """
-        设置选择器文本
+    while obj is not None and not isinstance(obj, Page):
+        obj = getattr(obj, 'parent', None)
+    return obj
 
-        Args:
-            value: 新的值
-        """
-        self.value = value
-        self.child.set_text(str(value))
-        self.init()
-        if manager.selector.selected is self.parent:
-            manager.selector.select(self.parent)
-
-    def widget_callback(self):
-        """组件回调函数"""
-        self.activate = not self.activate
-        self.activate_widget(self.activate)
-
-    def activate_widget(self, status):
-        """
-        激活/取消激活组件
-
-        Args:
-            status: 激活状态
-        """
-        self.activate = status
-        if status:
-            self.up, self.down = self._up, self._down
-            self.last_time = utime.ticks_ms()
-        else:
-            self.up, self.down = None, None
-            if callable(self.link_): self.link_(self.idx)
-
-    def _down(self):
-        """向下选择"""
-        self.idx -= 1
-        if self.idx < 0:
-            self.idx = 0
-            if self.loop: self.idx = self.max_idx
-        if self.idx > self.max_idx:
-            self.idx = self.max_idx
-            if self.loop: self.idx = 0
-        self.set_text(self.range_list[self.idx])
-        if callable(self.down_): self.down_(self.idx)
-
-    def _up(self):
-        """向上选择"""
-        self.idx += 1
-        if self.idx < 0:
-            self.idx = 0
-            if self.loop: self.idx = self.max_idx
-        if self.idx > self.max_idx:
-            self.idx = self.max_idx
-            if self.loop: self.idx = 0
-        self.set_text(self.range_list[self.idx])
-        if callable(self.up_): self.up_(self.idx)
-
-class NumSelect(ListSelect):
-    """
-    数字选择器组件类
+def used_assets(obj, skip, keep):
     """
-    def __init__(self, parent, default_num=0, min_num=0, max_num=10, step=1, loop=False,
-                 link=None, change_link=None, flash_speed=False, base_x=False):
-        """
-        初始化数字选择器
+    收集组件及其子项(children, others, widget)加载时创建的缓存项, 见Manager.release
 
-        Args:
-            parent: 父组件
-            default_num: 默认数字
-            min_num: 最小值
-            max_num: 最大值
-            step: 步长
-            loop: 是否循环
-            link: 回调函数
-            change_link: 值改变时的回调函数
-            flash_speed: 闪烁速度
-            base_x: 基础x坐标
-        """
-        self.type = 4
-        num_list = [i for i in range(min_num, max_num+1, step)]
-        _change_link = change_link
-        _link = link
-        if callable(change_link): change_link = lambda v: _change_link(num_list[v])
-        if callable(link): link = lambda v: _link(num_list[v])
-        super().__init__(parent, num_list, num_list.index(default_num), loop, link, change_link, flash_speed, base_x)
-
-class _XDashLine:
-    """
-    内置水平虚线类
+    Args:
+        obj: 页面或组件
+        skip: 不收集的组件的id集合(将要卸载的项目)
+        keep: 结果, (id(缓存), 键)的集合
     """
-    def __init__(self):
-        """初始化虚线"""
-        self.type = 5
-
-        self.pos = Pos()  # 所有组件必须拥有Pos
-        fbuf = framebuf.FrameBuffer(bytearray(display_w), display_w, 1, framebuf.MONO_VLSB)
-        self.drw = fbuf.line
-        self.update = lambda: display.blit(fbuf, 0, dashline_h)
-
-        manager.load_list.append(self)
-
-    def init(self):
-        """初始化虚线显示"""
-        color = 0
-        x = 0
-        for _ in range(display_w // icon_dashline_split_length):
-            to_x = x + icon_dashline_split_length
-            self.drw(x, 0, to_x, 0, color)
-            x = to_x
-            color = not color
-        del x, to_x, color
-        collect()
+    if id(obj) in skip: return
+    assets = getattr(obj, 'assets', None)
+    if assets is not None:
+        for cache, key in assets(): keep.add((id(cache), key))
+    for child in getattr(obj, 'children', ()): used_assets(child, skip, keep)
+    for child in getattr(obj, 'others', ()): used_assets(child, skip, keep)
+    widget = getattr(obj, 'widget', None)
+    if widget is not None: used_assets(widget, skip, keep)
 
 def item(parent, *args, **kws) -> "None" | "Label" | "Icon":
     """
     创建项目组件
 
+    可以使用page参数指定项目打开的页面, 例如item(menu, '设置', page=settings): 确认时切换到该页面,
+    选中该项目时会在空闲帧中预加载该页面(见Manager.prefetch)
+
     Args:
         parent: 父组件
         *args: 位置参数
@@ -1202,10 +1157,15 @@ def item(parent, *args, **kws) -> "None" | "Label" | "Icon":
     Returns:
         创建的组件对象或None
     """
-    if isinstance(parent, ListMenu): return Label(parent, *args, **kws)
-    elif isinstance(parent, IconMenu): return Icon(parent, *args, **kws)
+    # 按页面类型判断, 避免为了isinstance而导入所有菜单模块
+    if parent.type == 0:
+        from .label import Label
+        return Label(parent, *args, **kws)
+    elif parent.type == 1:
+        from .icon_menu import Icon
+        return Icon(parent, *args, **kws)
     else: print('[WARNING] Item: Unknown menu type.')
     return None
 
-display: Display
-manager: Manager
\ No newline at end of file
+default_manager: Manager = None  # 默认管理器, 见Manager.activate
+managers = []  # 所有已创建的管理器(共用字体和图标缓存), 卸载页面时检查它们仍在使用的缓存项
\ No newline at end of file
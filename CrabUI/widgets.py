@@ -0,0 +1,284 @@
+"""
+widgets
+last edited: 2025.8.27
+"""
+from .config import *
+from .ui import BaseWidget
+from .label import Label
+import utime
+
+class CheckBox(BaseWidget):
+    """
+    复选框组件类
+    """
+    def __init__(self, parent, default=False, link=None, base_x=False):
+        """
+        初始化复选框
+
+        Args:
+            parent: 父组件
+            default: 默认值
+            link: 回调函数
+            base_x: 基础x坐标
+        """
+        super().__init__(parent)
+        self.type = 2
+        self.value = default
+        self.link_ = link
+        self.base_x = base_x if base_x else list_max_w-list_selector_left_gap
+        pos = self.pos
+        pos.w = 8
+        pos.h = 8
+        pos.x = self.base_x-widget_gap-pos.w
+        pos.y = self.parent.pos.dy+half_list_item_space-4
+        self.parent.add(self)
+
+    def update(self):
+        """更新复选框显示"""
+        pos = self.pos
+        menu = self.manager.current_menu
+        canvas = self.manager.canvas
+        x = menu.offset_x(pos.x)
+        y = menu.offset_y(pos.y)
+        canvas.rect(x, y, pos.w, pos.h, 1)
+        if self.value: canvas.fill_rect(x+2, y+2, pos.w-4, pos.h-4, 1)
+
+    def widget_callback(self):
+        """组件回调函数"""
+        self.value = not self.value
+        if callable(self.link_): self.link_(self.value)
+
+class ListSelect(BaseWidget):
+    """
+    列表选择器组件类
+    """
+    multi_step = True  # up/down接受步长参数, 见Manager.up
+
+    def __init__(self, parent, range_list, default_idx: int | bool=False, loop=False,
+                 link=None, change_link=None, flash_speed: int | bool=False, base_x=False, cache: bool=True):
+        """
+        初始化列表选择器
+
+        Args:
+            parent: 父组件
+            range_list: 选择范围列表
+            default_idx: 默认索引
+            loop: 是否循环选择
+            link: 回调函数
+            change_link: 值改变时的回调函数
+            flash_speed: 闪烁速度
+            base_x: 基础x坐标
+            cache: 文本是否使用字体的字符串缓存(见Label), 选项很多时设为False
+        """
+        super().__init__(parent)
+        self.type = 3
+        if not range_list: raise IndexError('a ListSelector Widget should has one or more items')
+        self.idx = 0 if default_idx is False else default_idx
+        self.max_idx = len(range_list)-1
+        self.value = range_list[self.idx]
+        self.range_list = range_list
+        self.activate = False
+        self.loop = loop
+        self.link_ = link
+        self.up_ = change_link
+        self.down_ = change_link
+        self.last_time = None
+        self.flash_status = False
+        self.flash_speed = flash_speed
+        if flash_speed is False:
+            self.flash_speed = widget_flash_speed
+        self.child = Label(self, text=str(self.value), auto_add=False, try_scroll=False, load=False, cache=cache)
+        self.up, self.down = None, None
+        self.base_x = base_x if base_x else list_max_w-list_selector_left_gap
+        self.manager.load_list.append(self)
+        self.parent.add(self)
+
+    def update(self):
+        """更新选择器显示"""
+        pos = self.pos
+        manager = self.manager
+        now = manager.now
+        if not self.activate: self.flash_status = True  # 未被激活时不闪烁
+        elif utime.ticks_diff(now, self.last_time) > self.flash_speed:
+            self.flash_status = not self.flash_status
+            self.last_time = now
+
+        if self.flash_status:
+            self.child.update()
+
+    def init(self):
+        """初始化选择器"""
+        self.child.init()
+        pos = self.pos
+        cpos = self.child.pos
+        pos.w = cpos.w
+        pos.h = cpos.h
+        pos.x = self.base_x-widget_gap-pos.w
+        pos.y = self.parent.pos.dy
+        cpos.x = pos.x
+        cpos.y = pos.y
+
+    def assets(self) -> tuple:
+        """
+        Returns:
+            tuple: 加载时创建的缓存项, 见Label.assets
+        """
+        return self.child.assets()
+
+    def set_text(self, value):
+        """
+        设置选择器文本
+
+        Args:
+            value: 新的值
+        """
+        self.value = value
+        # init会重新绘制文本(Label.init), 不调用child.set_text, 每次只绘制一次
+        self.child.text = str(value)
+        self.init()
+        if self.manager.selector.selected is self.parent:
+            self.manager.selector.select(self.parent)
+
+    def widget_callback(self):
+        """组件回调函数"""
+        self.activate = not self.activate
+        self.activate_widget(self.activate)
+
+    def activate_widget(self, status):
+        """
+        激活/取消激活组件
+
+        Args:
+            status: 激活状态
+        """
+        self.activate = status
+        if status:
+            self.up, self.down = self._up, self._down
+            self.last_time = self.manager.now
+        else:
+            self.up, self.down = None, None
+            if callable(self.link_): self.link_(self.idx)
+
+    def move(self, n) -> bool:
+        """
+        移动n项, 循环时越过两端从另一端继续, 否则停在两端
+
+        Args:
+            n: 移动的项数, 负数向下
+
+        Returns:
+            bool: 索引是否改变
+        """
+        idx = self.idx + n
+        if self.loop: idx %= self.max_idx+1
+        elif idx < 0: idx = 0
+        elif idx > self.max_idx: idx = self.max_idx
+        if idx == self.idx: return False
+        self.idx = idx
+        self.set_text(self.range_list[idx])
+        return True
+
+    def _down(self, n=1):
+        """
+        向下选择
+
+        Args:
+            n: 步长(按住按钮重复触发时逐渐增大, 只重新绘制一次)
+        """
+        if self.move(-n) and callable(self.down_): self.down_(self.idx)
+
+    def _up(self, n=1):
+        """
+        向上选择
+
+        Args:
+            n: 步长(按住按钮重复触发时逐渐增大, 只重新绘制一次)
+        """
+        if self.move(n) and callable(self.up_): self.up_(self.idx)
+
+class NumRange:
+    """
+    等差数列, 按(最小值, 步长, 索引)计算每一项, 不保存列表, 可以代替ListSelect的range_list
+    """
+    def __init__(self, min_num, max_num, step=1):
+        """
+        Args:
+            min_num: 最小值
+            max_num: 最大值(不是min_num+k*step时不包括)
+            step: 步长, 可以是小数
+        """
+        if step <= 0 or max_num < min_num: raise ValueError('bad range')
+        self.min = min_num
+        self.step = step
+        self.is_int = isinstance(min_num, int) and isinstance(step, int)
+        if self.is_int:
+            # max_num可以是小数, 数值仍为整数
+            self.count = int((max_num-min_num)//step)+1
+            self.digits = 0
+        else:
+            # 小数的位数与步长相同, 避免0.1+0.2显示为0.30000000000000004
+            self.count = int((max_num-min_num)/step+1e-9)+1
+            self.digits = len(('%.6f' % step).rstrip('0').partition('.')[2])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, idx):
+        if not 0 <= idx < self.count: raise IndexError('NumRange index out of range')
+        if self.is_int: return self.min+idx*self.step
+        return round(self.min+idx*self.step, self.digits)
+
+    def max_chars(self) -> int:
+        """
+        Returns:
+            int: 最长的数值的字符数(符号, 绝对值较大的一端的整数部分, 小数点和小数)
+        """
+        last = self[self.count-1]
+        chars = len(str(int(max(abs(self.min), abs(last)))))
+        if self.min < 0: chars += 1
+        if not self.is_int: chars += 1+max(self.digits, 1)  # 小数至少显示一位, 例如1.0
+        return chars
+
+    def index(self, value) -> int:
+        """
+        Args:
+            value: 数值
+
+        Returns:
+            int: 最接近value的项的索引, 超出范围时抛出ValueError
+        """
+        idx = round((value-self.min)/self.step)
+        if not 0 <= idx < self.count: raise ValueError('{} is not in range'.format(value))
+        return idx
+
+class NumSelect(ListSelect):
+    """
+    数字选择器组件类
+    """
+    def __init__(self, parent, default_num=0, min_num=0, max_num=10, step=1, loop=False,
+                 link=None, change_link=None, flash_speed=False, base_x=False):
+        """
+        初始化数字选择器
+
+        Args:
+            parent: 父组件
+            default_num: 默认数字
+            min_num: 最小值
+            max_num: 最大值
+            step: 步长, 可以是小数(显示的小数位数与步长相同)
+            loop: 是否循环
+            link: 回调函数
+            change_link: 值改变时的回调函数
+            flash_speed: 闪烁速度
+            base_x: 基础x坐标
+        """
+        self.type = 4
+        num_range = NumRange(min_num, max_num, step)
+        _change_link = change_link
+        _link = link
+        if callable(change_link): change_link = lambda v: _change_link(num_range[v])
+        if callable(link): link = lambda v: _link(num_range[v])
+        super().__init__(parent, num_range, num_range.index(default_num), loop, link, change_link, flash_speed,
+                         base_x, cache=False)
+        # 缓冲区按最宽的值预先分配, 调整数值时不再分配内存
+        self.child.capacity = num_range.max_chars()*self.child.font.half_font_size
@@ -0,0 +1,93 @@
+"""
+animation allocation check
+验证动画期间的每一帧都不分配内存: 在两个页面之间切换, 播放展开动画(以及选择器、相机的动画),
+绘制时禁用gc, 比较前后的gc.mem_alloc()
+
+在开发板或MicroPython unix port上运行, 例如:
+    micropython -X heapsize=8M benchmarks/alloc_check.py
+    micropython -X heapsize=8M benchmarks/alloc_check.py -n 60
+
+参数:
+    -n N        每次切换页面后绘制的帧数(默认30, 展开动画的时长约为expand_duration)
+
+每个页面输出:
+    frames      绘制的帧数(其中animated帧有动画)
+    alloc       这些帧分配的字节数(应为0)
+有分配时以状态1退出, 最后一行输出JSON
+
+last edited: 2025.8.27
+"""
+import gc
+import sys
+import framebuf
+
+import paths
+paths.setup()
+
+import CrabUI as ui
+
+DISPLAY_W = 128
+DISPLAY_H = 64
+
+class FakeDisplay(framebuf.FrameBuffer):
+    """虚拟显示器, show不输出任何内容"""
+    def __init__(self, w=DISPLAY_W, h=DISPLAY_H):
+        self.buffer = bytearray((h+7)//8*w)
+        super().__init__(self.buffer, w, h, framebuf.MONO_VLSB)
+
+    def show(self):
+        pass
+
+def measure(manager, menu, frames) -> dict:
+    """
+    切换到menu, 再绘制frames帧, 只统计绘制期间分配的内存
+
+    Args:
+        manager: 管理器
+        menu: 页面
+        frames: 帧数
+
+    Returns:
+        dict: 结果
+    """
+    manager.page(menu)
+    gc.collect()
+    gc.disable()
+    base = gc.mem_alloc()
+    animated = 0
+    for _ in range(frames):
+        manager.update()
+        if ui.Pos.moved: animated += 1
+    alloc = gc.mem_alloc()-base
+    gc.enable()
+    return {'frames': frames, 'animated': animated, 'alloc': alloc}
+
+def main():
+    frames = 30
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == '-n':
+        frames = int(args[1])
+    manager = ui.Manager(FakeDisplay(), clock=ui.VirtualClock())
+    lists = ui.ListMenu()
+    for i in range(30):
+        ui.item(lists, 'item {}'.format(i))
+    icons = ui.IconMenu()
+    for i in range(10):
+        ui.item(icons, 'files/a.pbm' if i % 2 else 'files/b.pbm', 'icon {}'.format(i))
+    manager.page(lists)
+    # 第一次切换时创建缓动表等缓存, 不计入结果
+    for menu in (icons, lists):
+        measure(manager, menu, frames)
+    results = []
+    print('{:<10} {:>7} {:>9} {:>7}'.format('page', 'frames', 'animated', 'alloc'))
+    for name, menu in (('IconMenu', icons), ('ListMenu', lists)):
+        result = measure(manager, menu, frames)
+        result['page'] = name
+        print('{:<10} {:>7} {:>9} {:>7}'.format(name, frames, result['animated'], result['alloc']))
+        results.append(result)
+    import json
+    print(json.dumps(results))
+    if any(result['alloc'] > 0 or not result['animated'] for result in results):
+        sys.exit(1)
+
+main()
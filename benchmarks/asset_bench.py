@@ -0,0 +1,198 @@
+"""
+compressed asset benchmark
+比较压缩(tools/compress_assets.py)与未压缩的图标和字体: 文件大小、载入/读取耗时和常驻内存,
+以及单独的图标文件与图集(tools/make_atlas.py)
+
+在开发板或MicroPython unix port上运行(需要deflate模块), 例如:
+    micropython -X heapsize=8M benchmarks/asset_bench.py
+    mpremote run benchmarks/asset_bench.py
+
+压缩的文件临时写入examples/files, 结束后删除
+    icon        图标: 文件大小, init耗时, 每次绘制获取图像的耗时(保持压缩时包括解压), 缓存占用的内存
+    font        字体: 文件大小, 读取一个字形的平均耗时(顺序和随机两种访问方式, 不使用字形缓存)
+    atlas       ATLAS_ICONS个图标: 文件数, 全部init的耗时和缓存占用的内存
+最后一行输出JSON
+
+last edited: 2025.8.27
+"""
+import gc
+import os
+import sys
+import time
+import random
+import struct
+
+import paths
+paths.setup('tools')
+
+import compress_assets
+import make_atlas
+from CrabUI import config
+from CrabUI.libs import upbm, ufont, kernels
+
+FILES = 'files/'
+READS = 500
+ATLAS_ICONS = 50
+
+def read(path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def sparse_icon() -> bytes:
+    """空心方框和一条横线的30x30图标(大部分为空白, 常见的图标)"""
+    stride = 4
+    pixels = bytearray(stride * 30)
+    for y in range(30):
+        for x in range(30):
+            if x in (2, 27) and 2 <= y <= 27 or y in (2, 15, 27) and 2 <= x <= 27:
+                pixels[y*stride + x//8] |= 0x80 >> (x % 8)
+    return b'P4\n30 30\n' + bytes(pixels)
+
+def bench_icon(name, path, keep) -> dict:
+    """
+    Args:
+        name: 名称
+        path: 图标文件
+        keep: 压缩的图标是否保持压缩(icon_keep_compressed)
+
+    Returns:
+        dict: 结果
+    """
+    upbm.icon_keep_compressed = keep
+    pbm = upbm.PBMImage()
+    gc.collect()
+    base = gc.mem_alloc()
+    t = time.ticks_us()
+    pbm.init(path)
+    load = time.ticks_diff(time.ticks_us(), t)
+    gc.collect()
+    kept = gc.mem_alloc() - base
+    t = time.ticks_us()
+    for _ in range(READS):
+        pbm.fbuf(path)
+    draw = time.ticks_diff(time.ticks_us(), t) / READS
+    return {'asset': name, 'size': os.stat(path)[6], 'load_us': load, 'draw_us': draw, 'kept': kept}
+
+def bench_font(name, path, indices) -> dict:
+    """
+    Args:
+        name: 名称
+        path: 字体文件
+        indices: (顺序访问的字形序号, 随机访问的字形序号)
+
+    Returns:
+        dict: 结果
+    """
+    font = ufont.BMFont(path, config.font_size)
+    dst = bytearray(font.bitmap_size)
+    result = {'asset': name, 'size': os.stat(path)[6]}
+    for key, order in zip(('seq_us', 'random_us'), indices):
+        gc.collect()
+        t = time.ticks_us()
+        for index in order:
+            font.read_record(index, dst)
+        result[key] = time.ticks_diff(time.ticks_us(), t) / len(order)
+    font.font.close()
+    return result
+
+def bench_atlas(name, paths) -> dict:
+    """
+    Args:
+        name: 名称
+        paths: 所有图标的路径
+
+    Returns:
+        dict: 结果
+    """
+    pbm = upbm.PBMImage()
+    gc.collect()
+    base = gc.mem_alloc()
+    t = time.ticks_us()
+    for path in paths:
+        pbm.init(path)
+    load = time.ticks_diff(time.ticks_us(), t)
+    gc.collect()
+    files = len(set(path.split('#')[0] for path in paths))
+    return {'asset': name, 'files': files, 'load_us': load, 'kept': gc.mem_alloc() - base}
+
+def check_font(raw_path, packed_path, count):
+    """压缩字体的每个字形都与原字体相同"""
+    raw = ufont.BMFont(raw_path, config.font_size)
+    packed = ufont.BMFont(packed_path, config.font_size)
+    a = bytearray(raw.bitmap_size)
+    b = bytearray(raw.bitmap_size)
+    for index in range(count):
+        raw.read_record(index, a)
+        packed.read_record(index, b)
+        if a != b: raise AssertionError('glyph {} differs'.format(index))
+    raw.font.close()
+    packed.font.close()
+
+def main():
+    random.seed(1)
+    print('rle_decode:', kernels.backends['rle_decode'])
+    temp = []
+    icons = []
+    for name, data in (('sparse', sparse_icon()), ('a', read(FILES + 'a.pbm'))):
+        raw = FILES + 'bench_{}.pbm'.format(name)
+        packed = FILES + 'bench_{}.rle.pbm'.format(name)
+        write(raw, data)
+        write(packed, compress_assets.compress_pbm(data))
+        temp += [raw, packed]
+        icons += [(name, raw, False), (name + ' rle', packed, False), (name + ' rle keep', packed, True)]
+    # 图集: 两种大小的图标交替
+    sources = []
+    for i in range(ATLAS_ICONS):
+        data = sparse_icon() if i % 2 else read(FILES + 'a.pbm')
+        sources.append(('i{}'.format(i), data))
+    atlas = FILES + 'bench.atlas'
+    write(atlas, make_atlas.make_atlas(sources))
+    temp.append(atlas)
+    separate = []
+    for name, data in sources:
+        path = FILES + 'bench_{}.pbm'.format(name)
+        write(path, data)
+        separate.append(path)
+    temp += separate
+    del sources
+    font_raw = config.font_path
+    font_packed = FILES + 'bench_font.z.bmf'
+    data = read(font_raw)
+    count = (struct.unpack('>I', b'\x00' + data[4:7])[0] - 16) // 2
+    write(font_packed, compress_assets.compress_bmf(data))
+    del data
+    temp.append(font_packed)
+    gc.collect()
+    results = []
+    try:
+        print('{:<16} {:>7} {:>9} {:>9} {:>6}'.format('icon', 'size', 'load', 'draw', 'kept'))
+        for name, path, keep in icons:
+            result = bench_icon(name, path, keep)
+            print('{:<16} {:>7} {:>7}us {:>7.2f}us {:>6}'.format(
+                name, result['size'], result['load_us'], result['draw_us'], result['kept']))
+            results.append(result)
+        check_font(font_raw, font_packed, min(count, 2000))
+        start = random.getrandbits(16) % (count - READS)
+        indices = (list(range(start, start + READS)), [random.getrandbits(16) % count for _ in range(READS)])
+        print('{:<16} {:>7} {:>9} {:>9}'.format('font', 'size', 'seq', 'random'))
+        for name, path in (('bmf', font_raw), ('bmf deflate', font_packed)):
+            result = bench_font(name, path, indices)
+            print('{:<16} {:>7} {:>7.1f}us {:>7.1f}us'.format(name, result['size'], result['seq_us'], result['random_us']))
+            results.append(result)
+        print('{:<16} {:>7} {:>9} {:>9}'.format('atlas', 'files', 'load', 'kept'))
+        for name, paths in (('separate', separate), ('atlas', [atlas + '#i{}'.format(i) for i in range(ATLAS_ICONS)])):
+            result = bench_atlas(name, paths)
+            print('{:<16} {:>7} {:>7}us {:>9}'.format(name, result['files'], result['load_us'], result['kept']))
+            results.append(result)
+    finally:
+        upbm.icon_keep_compressed = config.icon_keep_compressed
+        for path in temp:
+            os.remove(path)
+    import json
+    print(json.dumps(results))
+
+main()
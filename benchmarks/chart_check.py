@@ -0,0 +1,62 @@
+"""
+chart redraw check
+验证Chart(见CrabUI/chart.py)只在纵轴范围改变时重新绘制整条曲线: 在较小的范围内波动的样本,
+无论纵轴的哪一端固定, 重新绘制的次数都应很少, 不能每个样本都重新绘制
+
+在开发板或MicroPython unix port上运行, 例如:
+    micropython benchmarks/chart_check.py
+    mpremote run benchmarks/chart_check.py
+
+每种配置输出:
+    redraws     重新绘制的次数(应不超过MAX_REDRAWS)
+    lo/hi       最后的纵轴范围
+有配置超过MAX_REDRAWS时以状态1退出, 最后一行输出JSON
+
+last edited: 2025.8.27
+"""
+import sys
+import random
+import framebuf
+
+import paths
+paths.setup()
+
+import CrabUI as ui
+
+SAMPLES = 200
+MAX_REDRAWS = 8
+CONFIGS = (
+    {},
+    {'min_value': 0},
+    {'max_value': 200},
+    {'min_value': 0, 'max_value': 200},
+)
+
+class StubDisplay(framebuf.FrameBuffer):
+    """只保存画面的显示器"""
+    def __init__(self):
+        self.buffer = bytearray(128*64//8)
+        super().__init__(self.buffer, 128, 64, framebuf.MONO_VLSB)
+
+    def show(self):
+        pass
+
+def main():
+    random.seed(1)
+    ui.Manager(StubDisplay(), clock=ui.VirtualClock())
+    root = ui.ListMenu()
+    data = [90 + random.getrandbits(8) % 11 for _ in range(SAMPLES)]
+    results = []
+    print('{:<36} {:>8} {:>6} {:>6}'.format('config', 'redraws', 'lo', 'hi'))
+    for config in CONFIGS:
+        chart = ui.Chart(root, w=32, h=16, **config)
+        for value in data:
+            chart.add(value)
+        print('{:<36} {:>8} {:>6} {:>6}'.format(str(config), chart.redraws, chart.lo, chart.hi))
+        results.append({'config': str(config), 'redraws': chart.redraws, 'lo': chart.lo, 'hi': chart.hi})
+    import json
+    print(json.dumps(results))
+    if any(result['redraws'] > MAX_REDRAWS for result in results):
+        sys.exit(1)
+
+main()
@@ -0,0 +1,75 @@
+"""
+measure import time and memory of each CrabUI module
+测量每个模块的导入耗时与内存占用
+
+在开发板上运行(CrabUI需位于sys.path中), 例如:
+    mpremote run benchmarks/import_cost.py
+
+第一行是包本身(`__init__`, 包括ui核心, config和drawer), 这是任何程序都要付出的开销
+canvas和libs.kernels由ui核心导入, 计入第一行(输出already imported, 列出是为了确认它们没有变成延迟加载)
+其余模块按依赖顺序依次导入, 因此每一行只统计该模块自身的开销:
+    time    导入耗时(ms)
+    peak    导入过程中分配的内存(禁用gc时测得, 包括编译产生的临时对象)
+    kept    gc.collect()后仍常驻的内存
+最后一行输出JSON, 方便比较不同版本
+
+last edited: 2025.8.27
+"""
+import gc
+import sys
+import time
+
+PACKAGE = 'CrabUI'
+if len(sys.argv) > 1:
+    PACKAGE = sys.argv[1]
+
+# 依赖顺序: 先导入被依赖的模块
+MODULES = (
+    'canvas',
+    'libs.kernels',
+    'libs.ufont',
+    'libs.upbm',
+    'label',
+    'list_menu',
+    'icon_menu',
+    'widgets',
+    'dialog',
+    'chart',
+    'libs.memory',
+)
+
+def measure(name):
+    """
+    导入一个模块并返回 (耗时ms, 峰值字节, 常驻字节)
+
+    Args:
+        name: 模块全名
+    """
+    gc.collect()
+    base = gc.mem_alloc()
+    gc.disable()
+    t = time.ticks_us()
+    __import__(name)
+    delta = time.ticks_diff(time.ticks_us(), t)
+    peak = gc.mem_alloc() - base
+    gc.enable()
+    gc.collect()
+    return delta / 1000, peak, gc.mem_alloc() - base
+
+def main():
+    results = {}
+    print('{:<12} {:>9} {:>8} {:>8}'.format('module', 'time', 'peak', 'kept'))
+    for name in ('',) + MODULES:
+        full = PACKAGE + '.' + name if name else PACKAGE
+        if full in sys.modules:
+            print('{:<12} (already imported)'.format(name or '__init__'))
+            continue
+        ms, peak, kept = measure(full)
+        results[name or '__init__'] = {'ms': ms, 'peak': peak, 'kept': kept}
+        print('{:<12} {:>7.2f}ms {:>8} {:>8}'.format(name or '__init__', ms, peak, kept))
+    gc.collect()
+    print('total alloc:', gc.mem_alloc(), 'free:', gc.mem_free())
+    import json
+    print(json.dumps(results))
+
+main()
@@ -0,0 +1,122 @@
+"""
+hot kernel check
+比较libs/kernels.py中每个计算的所有可用实现(natmod/viper/native/python): 结果必须与Python实现相同, 并测量耗时
+
+在开发板或MicroPython unix port上运行, 例如:
+    micropython benchmarks/kernel_check.py
+    mpremote run benchmarks/kernel_check.py
+
+每个计算和实现输出:
+    time        每次调用的平均耗时(us)
+    mismatch    结果与Python实现不同的输入数(应为0)
+第一行是导入时选择的实现(kernels.backends), 最后一行输出JSON
+
+last edited: 2025.8.27
+"""
+import gc
+import sys
+import time
+import random
+import framebuf
+
+import paths
+paths.setup()
+
+from CrabUI import ease_table, config
+from CrabUI.libs import kernels
+
+REPEAT = 20
+
+def random_bytes(n) -> bytearray:
+    return bytearray(random.getrandbits(8) for _ in range(n))
+
+def xor_cases():
+    """(参数, 比较的缓冲区)的列表, 包括长度不是4的倍数的缓冲区"""
+    cases = []
+    for n in (1024, 1027, 5, 0):
+        buf = random_bytes(n)
+        cases.append(((buf, random_bytes(n)), 0))
+    return cases
+
+def text_width_cases():
+    strings = ('CrabUI v', '设置', '很长很长的文本 long text 123', '', 'a中b文c', '€½°')
+    return [((string, 8, 16), None) for string in strings] + [((string, 6, 12), None) for string in strings]
+
+def glyph_run_cases():
+    cases = []
+    glyphs = random_bytes(32*8)
+    for fmt in (framebuf.MONO_HLSB, framebuf.MONO_VLSB):
+        for string, x, y in (('ab中文', 0, 0), ('Crab', 3, 5), ('中文ab', -7, -3), ('边界裁剪', 50, 10), ('abcdefghi', 0, 0)):
+            cases.append(((bytearray(64*24//8), fmt, 64, 24, string, glyphs, 16, 32, x, y), 0))
+    glyphs = random_bytes(24*4)
+    cases.append(((bytearray(40*16//8), framebuf.MONO_HLSB, 40, 16, 'a中b文', glyphs, 12, 24, 1, 2), 0))
+    return cases
+
+def rle_decode_cases():
+    """包括随机数据(控制字节和被截断的数据)、目标缓冲区写满和按行异或的情况"""
+    cases = []
+    for n, m, stride in ((64, 300, 0), (200, 120, 0), (1, 10, 0), (0, 10, 0), (50, 0, 0), (64, 300, 4), (200, 120, 3)):
+        cases.append(((bytearray(m), random_bytes(n), stride), 0))
+    cases.append(((bytearray(16), b'\x85\x00\x02abc\x80\xff', 0), 0))
+    cases.append(((bytearray(16), b'\x85\x00\x02abc\x80\xff', 2), 0))
+    return cases
+
+def ease_cases():
+    cases = []
+    for func in (config.ease_out_circ, config.ease_in_out_back):
+        table = ease_table(func)
+        for duration in (1, 7, 160, 400):
+            for elapsed in range(0, duration, max(1, duration//17)):
+                cases.append(((table, elapsed, duration), None))
+    return cases
+
+CASES = {
+    'xor': xor_cases,
+    'text_width': text_width_cases,
+    'glyph_run': glyph_run_cases,
+    'rle_decode': rle_decode_cases,
+    'ease': ease_cases,
+}
+
+def copy_args(args):
+    """复制参数中的可变缓冲区, 每个实现使用相同的输入"""
+    return tuple(bytearray(arg) if isinstance(arg, bytearray) else arg for arg in args)
+
+def run(func, cases):
+    """
+    对每个输入调用一次, 记录结果, 再测量总耗时
+
+    Returns:
+        tuple: (结果列表, 每次调用的平均耗时us)
+    """
+    results = []
+    for args, out in cases:
+        args = copy_args(args)
+        value = func(*args)
+        results.append((value, None if out is None else bytes(args[out])))
+    calls = [copy_args(args) for args, _ in cases]
+    gc.collect()
+    t = time.ticks_us()
+    for _ in range(REPEAT):
+        for args in calls:
+            func(*args)
+    delta = time.ticks_diff(time.ticks_us(), t)
+    return results, delta / (REPEAT*max(1, len(cases)))
+
+def main():
+    random.seed(1)
+    print('backends:', kernels.backends)
+    print('{:<11} {:<7} {:>10} {:>9}'.format('kernel', 'tier', 'time', 'mismatch'))
+    results = []
+    for name, impls in kernels.implementations.items():
+        cases = CASES[name]()
+        reference, _ = run(impls[-1][1], cases)  # 最后一个总是Python实现
+        for tier, func in impls:
+            values, us = run(func, cases)
+            mismatch = sum(1 for a, b in zip(values, reference) if a != b)
+            print('{:<11} {:<7} {:>8.2f}us {:>9}'.format(name, tier, us, mismatch))
+            results.append({'kernel': name, 'tier': tier, 'us': us, 'mismatch': mismatch})
+    import json
+    print(json.dumps(results))
+
+main()
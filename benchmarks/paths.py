@@ -0,0 +1,24 @@
+"""
+benchmark paths
+测试脚本共用的路径设置: 把仓库根目录加入sys.path, 并切换到examples目录(字体和图标文件位于examples/files)
+
+MicroPython的__file__是运行时给出的相对路径(例如benchmarks/ui_bench.py), 所以按本文件的位置计算根目录,
+并转换为绝对路径, 切换目录后sys.path中的路径仍然有效
+
+last edited: 2025.8.27
+"""
+import os
+import sys
+
+ROOT = __file__.rsplit('/', 1)[0] + '/..' if '/' in __file__ else '..'
+if not ROOT.startswith('/'): ROOT = os.getcwd().rstrip('/') + '/' + ROOT
+
+def setup(*dirs):
+    """
+    Args:
+        *dirs: 同时加入sys.path的子目录, 例如'tools'
+    """
+    sys.path.insert(0, ROOT)
+    for name in dirs:
+        sys.path.insert(0, ROOT + '/' + name)
+    os.chdir(ROOT + '/examples')
@@ -0,0 +1,159 @@
+"""
+hardware scroll check
+验证hw_scroll(显示器起始行)的画面, 并比较开启前后发送到显示器的数据量
+
+使用模拟的SSD1306(examples/oled.py的子类), 模拟显示器内存、窗口命令和起始行,
+每一帧把显示器实际显示的画面(按起始行旋转后的显示器内存)与不使用硬件滚动绘制的画面比较
+
+在MicroPython unix port上运行, 例如:
+    micropython -X heapsize=8M benchmarks/scroll_check.py
+    micropython -X heapsize=8M benchmarks/scroll_check.py -n 600
+
+参数:
+    -n N        帧数(默认300)
+
+每种配置输出:
+    bytes       平均每帧发送的数据字节数
+    mismatch    画面不一致的帧数(应为0)
+最后一行输出JSON
+
+last edited: 2025.8.27
+"""
+import gc
+import os
+import sys
+import framebuf
+
+import paths
+paths.setup('examples')
+
+import oled
+
+PACKAGE = 'CrabUI'
+DISPLAY_W = 128
+DISPLAY_H = 64
+
+class StubPanel(oled.SSD1306):
+    """模拟的SSD1306, 只记录命令和数据, 并维护显示器内存"""
+    def __init__(self, w=DISPLAY_W, h=DISPLAY_H):
+        self.ram = bytearray(h//8*w)
+        self.ram_fbuf = framebuf.FrameBuffer(self.ram, w, h, framebuf.MONO_VLSB)
+        self.screen = bytearray(h//8*w)
+        self.screen_fbuf = framebuf.FrameBuffer(self.screen, w, h, framebuf.MONO_VLSB)
+        self.line = 0
+        self.col0 = self.col1 = self.page0 = self.page1 = 0
+        self.sent = 0
+        super().__init__(False, w, h)
+
+    def write_cmd(self, cmd):
+        if oled.SET_DISP_START_LINE <= cmd < oled.SET_DISP_START_LINE + 64:
+            self.line = cmd - oled.SET_DISP_START_LINE
+
+    def write_cmds(self, buf):
+        # 只有设置窗口时使用write_cmds
+        self.col0, self.col1, self.page0, self.page1 = buf[1], buf[2], buf[4], buf[5]
+
+    def write_data(self, buf):
+        self.sent += len(buf)
+        w = self.col1 - self.col0 + 1
+        for i in range(len(buf)):
+            page = self.page0 + i // w
+            if page > self.page1: break
+            self.ram[page*self.w + self.col0 + i % w] = buf[i]
+
+    def visible(self):
+        """
+        显示器实际显示的画面
+
+        Returns:
+            bytearray: 屏幕的第y行为显示器内存的第(y+line)%h行
+        """
+        fb = self.screen_fbuf
+        fb.fill(0)
+        fb.blit(self.ram_fbuf, 0, -self.line)
+        fb.blit(self.ram_fbuf, 0, self.h - self.line)
+        return self.screen
+
+def load_ui(scroll):
+    """
+    重新导入CrabUI, 并在导入前修改配置
+
+    Args:
+        scroll: hw_scroll的值
+
+    Returns:
+        CrabUI模块
+    """
+    for name in list(sys.modules):
+        if name == PACKAGE or name.startswith(PACKAGE + '.'):
+            del sys.modules[name]
+    gc.collect()
+    config = __import__(PACKAGE + '.config', None, None, ('hw_scroll',))
+    # 导入config时会先导入整个包, 所以再次删除其他模块, 让它们在修改配置后重新导入
+    for name in list(sys.modules):
+        if name.startswith(PACKAGE) and name != PACKAGE + '.config':
+            del sys.modules[name]
+    config.hw_scroll = scroll
+    config.show_startup_page = False
+    config.check_fps = False
+    return __import__(PACKAGE)
+
+def run(ui, frames):
+    """
+    滚动一个较长的ListMenu
+
+    使用较宽且不滚动的文本: 较窄的行只有少数列变化, 驱动本来就只发送这些列, 硬件滚动的收益不大
+
+    Args:
+        ui: CrabUI模块
+        frames: 帧数
+
+    Returns:
+        dict: 结果
+    """
+    panel = StubPanel()
+    manager = ui.Manager(panel, clock=ui.VirtualClock())
+    root = ui.ListMenu()
+    for i in range(100):
+        ui.item(root, '{} 很长很长的文本 long text'.format(i), try_scroll=False)
+    manager.page(root)
+    for _ in range(10):
+        manager.update()
+    # 参考画面: 不使用起始行, 绘制到另一个缓冲区
+    ref = bytearray(DISPLAY_H//8*DISPLAY_W)
+    ref_canvas = ui.Canvas(framebuf.FrameBuffer(ref, DISPLAY_W, DISPLAY_H, framebuf.MONO_VLSB), buffer=ref)
+    panel.sent = 0
+    mismatch = 0
+    for frame in range(frames):
+        if frame % 3 == 0:
+            if frame % 600 < 300: manager.down()
+            else: manager.up()
+        manager.update()
+        canvas = manager.canvas
+        manager.canvas = ref_canvas
+        manager.band(0, DISPLAY_H, 0)
+        manager.render()
+        manager.canvas = canvas
+        if panel.visible() != ref:
+            mismatch += 1
+    return {'bytes': panel.sent//frames, 'mismatch': mismatch}
+
+def main():
+    frames = 300
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == '-n':
+        frames = int(args[1])
+    results = []
+    print('{:<10} {:>8} {:>8}'.format('hw_scroll', 'bytes', 'mismatch'))
+    for scroll in (False, True):
+        ui = load_ui(scroll)
+        result = run(ui, frames)
+        print('{:<10} {:>8} {:>8}'.format(int(scroll), result['bytes'], result['mismatch']))
+        result['hw_scroll'] = int(scroll)
+        result['frames'] = frames
+        results.append(result)
+        gc.collect()
+    import json
+    print(json.dumps(results))
+
+main()
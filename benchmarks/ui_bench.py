@@ -0,0 +1,221 @@
+"""
+scripted UI benchmarks
+使用固定的界面场景和按键脚本测量渲染性能
+界面使用虚拟时钟(每帧前进1000/target_fps毫秒), 每个场景每一帧的画面与运行速度无关
+
+在MicroPython unix port上运行(使用虚拟显示器, 不需要开发板), 例如:
+    micropython -X heapsize=8M benchmarks/ui_bench.py
+    micropython -X heapsize=8M benchmarks/ui_bench.py -n 500 list_1000 icons_50
+也可以通过mpremote在开发板上运行(内存足够时)
+
+参数:
+    -n N        每个场景绘制的帧数(默认300)
+    --fill=X    selector_fill: 0, 1 或 both(默认both, 1需要能导入bufxor)
+    其余参数     要运行的场景名称(默认全部)
+
+每个场景输出:
+    fps         帧率(只统计Manager.update的耗时, 不包括帧之间的gc.collect)
+    p50/p95/max 帧耗时 ms
+    alloc       平均每帧分配的字节数(绘制时禁用gc测得)
+    dirty       发生了内存分配的帧数
+    heap        堆内存的最高值(字节)
+最后一行输出JSON, 方便比较不同版本
+
+last edited: 2025.8.27
+"""
+import gc
+import os
+import sys
+import time
+from array import array
+import framebuf
+
+import paths
+paths.setup()
+
+PACKAGE = 'CrabUI'
+DISPLAY_W = 128
+DISPLAY_H = 64
+
+class FakeDisplay(framebuf.FrameBuffer):
+    """虚拟显示器, show不输出任何内容"""
+    def __init__(self, w=DISPLAY_W, h=DISPLAY_H):
+        self.buffer = bytearray((h+7)//8*w)
+        super().__init__(self.buffer, w, h, framebuf.MONO_VLSB)
+
+    def show(self):
+        pass
+
+def load_ui(fill):
+    """
+    重新导入CrabUI, 并在导入前修改配置
+
+    Args:
+        fill: selector_fill的值
+
+    Returns:
+        CrabUI模块, 无法导入时返回None
+    """
+    for name in list(sys.modules):
+        if name == PACKAGE or name.startswith(PACKAGE + '.'):
+            del sys.modules[name]
+    gc.collect()
+    config = __import__(PACKAGE + '.config', None, None, ('selector_fill',))
+    # 导入config时会先导入整个包, 所以再次删除其他模块, 让它们在修改配置后重新导入
+    for name in list(sys.modules):
+        if name.startswith(PACKAGE) and name != PACKAGE + '.config':
+            del sys.modules[name]
+    # 其他模块在导入时复制config中的值, 所以在重新导入前修改即可
+    config.selector_fill = fill
+    config.show_startup_page = False
+    try:
+        return __import__(PACKAGE)
+    except ImportError as e:
+        print('  skipped (fill={}): {}'.format(int(fill), e))
+        return None
+
+# 场景: 创建界面, 返回每帧调用的按键脚本 drive(manager, frame)
+
+def list_1000(ui, manager):
+    """1000行的ListMenu, 持续向下滚动"""
+    root = ui.ListMenu()
+    for i in range(1000):
+        ui.item(root, 'item {}'.format(i))
+    manager.page(root)
+    def drive(m, frame):
+        if frame % 3 == 0: m.down()
+    return drive
+
+def long_labels(ui, manager):
+    """所有行都在滚动的长文本"""
+    root = ui.ListMenu()
+    for i in range(20):
+        ui.Label(root, '{} 很长很长的文本, 需要滚动才能完整显示 long text'.format(i), always_scroll=True)
+    manager.page(root)
+    def drive(m, frame):
+        if frame % 20 == 0: m.down()
+    return drive
+
+def icons_50(ui, manager):
+    """50个图标的IconMenu, 先向右再向左"""
+    root = ui.IconMenu()
+    for i in range(50):
+        ui.item(root, 'files/a.pbm' if i % 2 else 'files/b.pbm', 'icon {}'.format(i))
+    manager.page(root)
+    def drive(m, frame):
+        if frame % 4 == 0:
+            if frame % 400 < 200: m.down()
+            else: m.up()
+    return drive
+
+def dialog_spam(ui, manager):
+    """连续弹出TextDialog"""
+    root = ui.ListMenu()
+    for i in range(5):
+        ui.item(root, 'row {}'.format(i))
+    dia = ui.TextDialog('?')
+    texts = ('ok', '已保存', 'error 42', '亮度: 100', 'hello world')
+    manager.page(root)
+    def drive(m, frame):
+        if frame % 2 == 0: dia.open(texts[frame//2 % len(texts)])
+    return drive
+
+def num_select(ui, manager):
+    """激活NumSelect后连续增加数值"""
+    root = ui.ListMenu()
+    ui.NumSelect(ui.item(root, 'number'), 0, 0, 1000, loop=True)
+    for i in range(5):
+        ui.item(root, 'row {}'.format(i))
+    manager.page(root)
+    def drive(m, frame):
+        if frame == 0: m.yes()
+        else: m.up()
+    return drive
+
+SCENARIOS = (list_1000, long_labels, icons_50, dialog_spam, num_select)
+
+def run(ui, scenario, frames):
+    """
+    运行一个场景
+
+    Args:
+        ui: CrabUI模块
+        scenario: 场景函数
+        frames: 帧数
+
+    Returns:
+        dict: 测量结果
+    """
+    # 虚拟时钟: 每帧前进相同的时间, 每次运行绘制的画面都相同, 只有测得的耗时不同
+    manager = ui.Manager(FakeDisplay(), clock=ui.VirtualClock())
+    drive = scenario(ui, manager)
+    for _ in range(10):  # 预热, 完成启动时的动画和加载
+        manager.update()
+    times = array('i', bytes(4*frames))  # 预先分配, 测量时不分配内存
+    gc.collect()
+    total_alloc = 0
+    dirty = 0
+    heap = 0
+    for frame in range(frames):
+        drive(manager, frame)
+        gc.collect()
+        gc.disable()
+        base = gc.mem_alloc()
+        t = time.ticks_us()
+        manager.update()
+        times[frame] = time.ticks_diff(time.ticks_us(), t)
+        used = gc.mem_alloc()
+        gc.enable()
+        if used > heap: heap = used
+        if used > base:
+            total_alloc += used - base
+            dirty += 1
+    ordered = sorted(times)
+    total = sum(ordered)
+    return {'fps': frames*1000000//total if total else 0,
+            'p50': ordered[frames//2]/1000,
+            'p95': ordered[min(frames-1, frames*95//100)]/1000,
+            'max': ordered[-1]/1000,
+            'alloc': total_alloc//frames,
+            'dirty': dirty,
+            'heap': heap}
+
+def main():
+    frames = 300
+    fills = (False, True)
+    names = []
+    args = sys.argv[1:]
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '-n':
+            i += 1
+            frames = int(args[i])
+        elif arg.startswith('--fill='):
+            value = arg[7:]
+            fills = (False, True) if value == 'both' else (value == '1',)
+        else:
+            names.append(arg)
+        i += 1
+    results = []
+    print('{:<12} {:>4} {:>6} {:>8} {:>7} {:>7} {:>7} {:>5} {:>8}'.format(
+        'scenario', 'fill', 'fps', 'p50', 'p95', 'max', 'alloc', 'dirty', 'heap'))
+    for fill in fills:
+        ui = load_ui(fill)
+        if ui is None: continue
+        for scenario in SCENARIOS:
+            name = scenario.__name__
+            if names and name not in names: continue
+            result = run(ui, scenario, frames)
+            print('{:<12} {:>4} {:>6} {:>6.2f}ms {:>5.2f}ms {:>5.2f}ms {:>7} {:>5} {:>8}'.format(
+                name, int(fill), result['fps'], result['p50'], result['p95'], result['max'],
+                result['alloc'], result['dirty'], result['heap']))
+            result['scenario'] = name
+            result['fill'] = int(fill)
+            result['frames'] = frames
+            results.append(result)
+            gc.collect()
+    import json
+    print(json.dumps(results))
+
+main()
@@ -1,7 +1,23 @@
 """
 MicroPython SSD1306 OLED driver, I2C and SPI interfaces
 
-last edited: 2025.8.3
+show() only transfers the pages (8-pixel rows) that changed since the last
+frame: a shadow copy of the transmitted frame is compared page by page and
+each run of changed pages is sent as one window (one batched command
+transfer + one data transfer). A page where only a narrow range of columns
+changed is sent on its own with just those columns (rounded out to SPAN_COLS
+columns, so the column views are reused instead of sliced every frame). Pass
+diff=False to always
+send the whole frame and save the shadow buffer's RAM.
+
+set_start_line() scrolls the panel in hardware: screen row y shows buffer row
+(y + line) % height, so content that only moved vertically does not have to be
+sent again (used by CrabUI when config.hw_scroll is on).
+
+write_band() sends a band rendered into a separate small buffer (used by
+CrabUI when config.band_h is set).
+
+last edited: 2025.8.27
 """
 
 from micropython import const
@@ -26,15 +42,38 @@ SET_PRECHARGE = const(0xD9)
 SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
 
+# narrow page changes are widened to multiples of this many columns, so only a
+# few distinct column views exist and each one is created once (see send_frame)
+SPAN_COLS = const(16)
+
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
-    def __init__(self, external_vcc, display_w, display_h):
+    def __init__(self, external_vcc, display_w, display_h, diff=True):
         self.external_vcc = external_vcc
         self.w, self.h = display_w, display_h
         self.pages = self.h // 8
         self.buffer = bytearray(self.h//8*self.w)
         super().__init__(self.buffer, self.w, self.h, framebuf.MONO_VLSB, self.w)
+        # window commands, reused for every transfer
+        self.window_cmd = bytearray(6)
+        self.window_cmd[0] = SET_COL_ADDR
+        self.window_cmd[1] = 0
+        self.window_cmd[2] = self.w - 1
+        self.window_cmd[3] = SET_PAGE_ADDR
+        # page diffing: shadow copy of the last transmitted frame
+        self.diff = diff
+        self.full = True  # the next show() sends the whole frame
+        self.start_line = 0  # start line requested by set_start_line()
+        self.sent_line = 0   # start line currently used by the panel
+        buf = memoryview(self.buffer)
+        self.page_views = [buf[p * self.w:(p + 1) * self.w] for p in range(self.pages)]
+        self.spans = {}  # (first page, last page) -> memoryview, created on first use
+        self.col_spans = {}  # (page, first column, last column) -> memoryview, created on first use
+        if diff:
+            self.shadow = bytearray(len(self.buffer))
+            shadow = memoryview(self.shadow)
+            self.shadow_views = [shadow[p * self.w:(p + 1) * self.w] for p in range(self.pages)]
         self.init_display()
         self.poweron()
 
@@ -88,36 +127,127 @@ class SSD1306(framebuf.FrameBuffer):
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
+    def invalidate(self):
+        """Send the whole frame on the next show() (e.g. after the panel was reset)"""
+        self.full = True
+        self.sent_line = -1
+
+    def set_start_line(self, line):
+        """Show buffer row `line` at the top of the screen, applied on the next show()"""
+        self.start_line = line % self.h
+
+    def write_window(self, first, last, col0=0, data=None):
+        """Transfer pages first..last (inclusive) of the buffer, or `data` starting at column col0"""
+        cmd = self.window_cmd
+        if data is None:
+            cmd[1] = 0
+            cmd[2] = self.w - 1
+        else:
+            cmd[1] = col0
+            cmd[2] = col0 + len(data) - 1
+        cmd[4] = first
+        cmd[5] = last
+        self.write_cmds(cmd)
+        if data is None:
+            key = first * self.pages + last
+            data = self.spans.get(key)
+            if data is None:
+                data = self.spans[key] = memoryview(self.buffer)[first * self.w:(last + 1) * self.w]
+        self.write_data(data)
+
+    def write_band(self, y, buf):
+        """Transfer a band rendered outside of the frame buffer (CrabUI band mode)
+
+        buf holds whole pages in MONO_VLSB order starting at row y (a multiple of 8).
+        The frame buffer and the shadow are not used, so the next show() sends everything.
+        """
+        cmd = self.window_cmd
+        cmd[1] = 0
+        cmd[2] = self.w - 1
+        cmd[4] = y // 8
+        cmd[5] = y // 8 + len(buf) // self.w - 1
+        self.write_cmds(cmd)
+        self.write_data(buf)
+        self.full = True
+
     def show(self):
-        x0 = 0
-        x1 = self.w - 1
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.send_frame()
+        # the start line is changed after the data so the new rows are already in place
+        if self.start_line != self.sent_line:
+            self.sent_line = self.start_line
+            self.write_cmd(SET_DISP_START_LINE | self.start_line)
+
+    def send_frame(self):
+        last = self.pages - 1
+        if self.full or not self.diff:
+            self.full = False
+            self.write_window(0, last)
+            if self.diff:
+                self.shadow[:] = self.buffer
+            return
+        page_views = self.page_views
+        shadow_views = self.shadow_views
+        w = self.w
+        first = -1  # first page of the pending run of fully changed pages
+        for p in range(self.pages):
+            page = page_views[p]
+            shadow = shadow_views[p]
+            if page == shadow:
+                if first >= 0:
+                    self.write_window(first, p - 1)
+                    first = -1
+                continue
+            # changed columns of this page
+            c0 = 0
+            while page[c0] == shadow[c0]:
+                c0 += 1
+            c1 = w - 1
+            while page[c1] == shadow[c1]:
+                c1 -= 1
+            shadow[:] = page  # the other columns are equal already; no slice is created
+            if c1 - c0 + 1 > w // 2:
+                # wide change: sent with neighbouring pages as one window
+                if first < 0:
+                    first = p
+                continue
+            if first >= 0:
+                self.write_window(first, p - 1)
+                first = -1
+            # narrow change (e.g. a scrollbar or a counter): only its columns are sent
+            c0 -= c0 % SPAN_COLS
+            c1 = min(w - 1, c1 - c1 % SPAN_COLS + SPAN_COLS - 1)
+            key = (p * w + c0) * w + c1
+            data = self.col_spans.get(key)
+            if data is None:
+                data = self.col_spans[key] = page[c0:c1 + 1]
+            self.write_window(p, p, c0, data)
+        if first >= 0:
+            self.write_window(first, last)
 
 class DisplayI2C(SSD1306):
-    def __init__(self, i2c, display_w, display_h, addr=0x3C, external_vcc=False):
+    def __init__(self, i2c, display_w, display_h, addr=0x3C, external_vcc=False, diff=True):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
-        super().__init__(external_vcc, display_w, display_h)
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0: the rest of the transfer is commands
+        super().__init__(external_vcc, display_w, display_h, diff)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
 
+    def write_cmds(self, buf):
+        self.cmd_list[1] = buf
+        self.i2c.writevto(self.addr, self.cmd_list)
+
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
 
 class DisplaySPI(SSD1306):
-    def __init__(self, spi, dc, res, cs, display_w, display_h, external_vcc=False):
+    def __init__(self, spi, dc, res, cs, display_w, display_h, external_vcc=False, diff=True):
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
         cs.init(cs.OUT, value=1)
@@ -126,6 +256,7 @@ class DisplaySPI(SSD1306):
         self.dc = dc
         self.res = res
         self.cs = cs
+        self.temp = bytearray(1)
         import time
 
         self.res(1)
@@ -134,13 +265,17 @@ class DisplaySPI(SSD1306):
         time.sleep_ms(10)
         self.res(1)
         del time
-        super().__init__(external_vcc, display_w, display_h)
+        super().__init__(external_vcc, display_w, display_h, diff)
 
     def write_cmd(self, cmd):
+        self.temp[0] = cmd
+        self.write_cmds(self.temp)
+
+    def write_cmds(self, buf):
         self.cs(1)
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(buf)
         self.cs(1)
 
     def write_data(self, buf):
@@ -0,0 +1,125 @@
+"""
+MicroPython ST7789 (RGB565, SPI) driver for CrabUI's band mode
+
+The driver has no frame buffer: CrabUI renders each band into a small
+monochrome buffer (config.band_h rows) and calls write_band(), which expands
+it to RGB565 with a two-colour palette and streams it into the matching
+window of the panel. Peak RAM is display_w * band_h * 2 bytes for the colour
+line buffer, whatever the panel size (a full 240x240 RGB565 frame would be
+115 KB).
+
+    dis = st7789.ST7789(spi, Pin(16), Pin(17), Pin(18), 240, 240, band_h=16)
+    manager = ui.Manager(dis, band_h=16)
+
+display_w/display_h in CrabUI/config.py must match the panel.
+
+last edited: 2025.8.27
+"""
+
+from micropython import const
+import framebuf
+import time
+
+SWRESET = const(0x01)
+SLPOUT = const(0x11)
+NORON = const(0x13)
+INVON = const(0x21)
+DISPON = const(0x29)
+CASET = const(0x2A)
+RASET = const(0x2B)
+RAMWR = const(0x2C)
+MADCTL = const(0x36)
+COLMOD = const(0x3A)
+
+def rgb565(r, g, b):
+    """Colour in the panel's byte order (framebuf stores RGB565 little-endian, the panel reads big-endian)"""
+    c = (r & 0xF8) << 8 | (g & 0xFC) << 3 | b >> 3
+    return (c & 0xFF) << 8 | c >> 8
+
+class ST7789:
+    def __init__(self, spi, dc, res, cs, w, h, band_h=16, fg=rgb565(255, 255, 255), bg=rgb565(0, 0, 0),
+                 x_offset=0, y_offset=0):
+        dc.init(dc.OUT, value=0)
+        res.init(res.OUT, value=1)
+        cs.init(cs.OUT, value=1)
+        self.spi = spi
+        self.dc = dc
+        self.res = res
+        self.cs = cs
+        self.w = w
+        self.h = h
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        # colour line buffer for one band
+        self.line = bytearray(w * band_h * 2)
+        self.line_fbuf = framebuf.FrameBuffer(self.line, w, band_h, framebuf.RGB565)
+        # palette: 0 -> background, 1 -> foreground
+        self.palette = framebuf.FrameBuffer(bytearray(4), 2, 1, framebuf.RGB565)
+        self.set_colors(fg, bg)
+        self.cmd = bytearray(1)
+        self.window = bytearray(4)
+        self.band_h = band_h
+        self.src = None  # mono FrameBuffer over the band passed to write_band, created on first use
+        self.src_buf = None
+        self.init_display()
+
+    def init_display(self):
+        self.res(0)
+        time.sleep_ms(10)
+        self.res(1)
+        time.sleep_ms(120)
+        self.write_cmd(SWRESET)
+        time.sleep_ms(150)
+        self.write_cmd(SLPOUT)
+        time.sleep_ms(10)
+        self.write_cmd(COLMOD, b"\x55")  # 16 bits per pixel
+        self.write_cmd(MADCTL, b"\x00")
+        self.write_cmd(INVON)
+        self.write_cmd(NORON)
+        self.write_cmd(DISPON)
+
+    def set_colors(self, fg, bg):
+        """Colours used for set and clear pixels (see rgb565())"""
+        self.palette.pixel(0, 0, bg)
+        self.palette.pixel(1, 0, fg)
+
+    def write_cmd(self, cmd, data=None):
+        self.cmd[0] = cmd
+        self.cs(0)
+        self.dc(0)
+        self.spi.write(self.cmd)
+        if data is not None:
+            self.dc(1)
+            self.spi.write(data)
+        self.cs(1)
+
+    def set_window(self, x0, y0, x1, y1):
+        window = self.window
+        x0 += self.x_offset
+        x1 += self.x_offset
+        window[0] = x0 >> 8
+        window[1] = x0 & 0xFF
+        window[2] = x1 >> 8
+        window[3] = x1 & 0xFF
+        self.write_cmd(CASET, window)
+        y0 += self.y_offset
+        y1 += self.y_offset
+        window[0] = y0 >> 8
+        window[1] = y0 & 0xFF
+        window[2] = y1 >> 8
+        window[3] = y1 & 0xFF
+        self.write_cmd(RASET, window)
+
+    def write_band(self, y, buf):
+        """Expand a MONO_VLSB band (rows y..y+band_h-1) to RGB565 and send it"""
+        src = self.src
+        if src is None or self.src_buf is not buf:
+            src = self.src = framebuf.FrameBuffer(buf, self.w, self.band_h, framebuf.MONO_VLSB)
+            self.src_buf = buf
+        self.line_fbuf.blit(src, 0, 0, -1, self.palette)
+        self.set_window(0, y, self.w - 1, y + self.band_h - 1)
+        self.write_cmd(RAMWR, self.line)
+
+    def show(self):
+        # everything is sent by write_band()
+        pass
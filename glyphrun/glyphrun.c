@@ -0,0 +1,96 @@
+// glyphrun.c
+/*
+Copyright (c) 2025 kaixin168sxz
+*/
+
+#include "py/dynruntime.h"
+
+// 与framebuf的格式常量相同
+#define FMT_MONO_VLSB (0)
+#define FMT_MONO_HLSB (3)
+
+// 把一串字形合成到目标缓冲区(按位或, 与key为0的blit相同)
+// 字形为MONO_HLSB格式, 每个占用glyph_bytes字节, 每行(size+7)/8字节
+// ASCII字符前进半个字宽, 其他字符前进一个字宽
+static mp_int_t composite(uint8_t *dst, mp_int_t fmt, mp_int_t dst_w, mp_int_t dst_h,
+                          const uint8_t *str, size_t str_len, const uint8_t *glyphs, size_t glyphs_len,
+                          mp_int_t size, mp_int_t glyph_bytes, mp_int_t x, mp_int_t y) {
+    mp_int_t stride = (size + 7) >> 3;
+    mp_int_t dst_stride = (dst_w + 7) >> 3;
+    size_t offset = 0;
+    for (size_t i = 0; i < str_len; i++) {
+        uint8_t c = str[i];
+        if ((c & 0xc0) == 0x80) {
+            continue;  // UTF-8的后续字节
+        }
+        if (offset + glyph_bytes > glyphs_len) {
+            break;
+        }
+        const uint8_t *glyph = glyphs + offset;
+        offset += glyph_bytes;
+        for (mp_int_t row = 0; row < size; row++) {
+            mp_int_t py = y + row;
+            if (py < 0 || py >= dst_h) {
+                continue;
+            }
+            const uint8_t *src = glyph + row * stride;
+            for (mp_int_t col = 0; col < size; col++) {
+                if (!(src[col >> 3] & (0x80 >> (col & 7)))) {
+                    continue;
+                }
+                mp_int_t px = x + col;
+                if (px < 0 || px >= dst_w) {
+                    continue;
+                }
+                if (fmt == FMT_MONO_HLSB) {
+                    dst[py * dst_stride + (px >> 3)] |= 0x80 >> (px & 7);
+                } else {
+                    dst[(py >> 3) * dst_w + px] |= 1 << (py & 7);
+                }
+            }
+        }
+        x += c < 0x80 ? size >> 1 : size;
+    }
+    return x;
+}
+
+// run(dst, fmt, dst_w, dst_h, string, glyphs, size, glyph_bytes, x, y) -> int
+// 返回合成结束后的x坐标
+static mp_obj_t glyphrun_run(size_t n_args, const mp_obj_t *args) {
+    mp_buffer_info_t dst_buf, glyphs_buf;
+    mp_get_buffer_raise(args[0], &dst_buf, MP_BUFFER_WRITE);
+    mp_get_buffer_raise(args[5], &glyphs_buf, MP_BUFFER_READ);
+    size_t str_len;
+    const char *str = mp_obj_str_get_data(args[4], &str_len);
+
+    mp_int_t fmt = mp_obj_get_int(args[1]);
+    mp_int_t dst_w = mp_obj_get_int(args[2]);
+    mp_int_t dst_h = mp_obj_get_int(args[3]);
+    if (fmt != FMT_MONO_HLSB && fmt != FMT_MONO_VLSB) {
+        mp_raise_ValueError(MP_ERROR_TEXT("unsupported format"));
+    }
+    size_t need = fmt == FMT_MONO_HLSB ? (size_t)(((dst_w + 7) >> 3) * dst_h) : (size_t)(((dst_h + 7) >> 3) * dst_w);
+    if (dst_buf.len < need) {
+        mp_raise_ValueError(MP_ERROR_TEXT("buffer too small"));
+    }
+
+    mp_int_t x = composite((uint8_t *)dst_buf.buf, fmt, dst_w, dst_h,
+                           (const uint8_t *)str, str_len, (const uint8_t *)glyphs_buf.buf, glyphs_buf.len,
+                           mp_obj_get_int(args[6]), mp_obj_get_int(args[7]),
+                           mp_obj_get_int(args[8]), mp_obj_get_int(args[9]));
+    return mp_obj_new_int(x);
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(glyphrun_run_obj, 10, 10, glyphrun_run);
+
+// 模块初始化函数（入口点）
+mp_obj_t mpy_init(mp_obj_fun_bc_t *self, size_t n_args, size_t n_kw, mp_obj_t *args) {
+    MP_DYNRUNTIME_INIT_ENTRY
+
+    // 设置模块名
+    mp_store_global(MP_QSTR___name__, MP_OBJ_NEW_QSTR(MP_QSTR_glyphrun));
+
+    // 导出函数：glyphrun.run = ...
+    mp_store_global(MP_QSTR_run, MP_OBJ_FROM_PTR(&glyphrun_run_obj));
+
+    MP_DYNRUNTIME_INIT_EXIT
+}
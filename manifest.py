@@ -0,0 +1,8 @@
+# 将CrabUI冻结进固件 (frozen bytecode), 在构建固件时使用:
+#   make BOARD=... FROZEN_MANIFEST=/path/to/CrabUI/manifest.py
+# 冻结后模块直接从flash执行, 导入时无需编译, 也不占用编译所需的内存
+# 注意: libs/bufxor.mpy, libs/glyphrun.mpy和libs/shapes.mpy是原生模块(natmod), 无法冻结, 需要单独复制到设备上
+# (它们都是可选的, 不存在时使用viper/native/Python实现, 见libs/kernels.py)
+include("$(PORT_DIR)/boards/manifest.py")
+
+package("CrabUI", opt=3)
@@ -0,0 +1,182 @@
+// shapes.c
+/*
+Copyright (c) 2025 kaixin168sxz
+*/
+
+#include "py/dynruntime.h"
+
+// 与framebuf的格式常量相同
+#define FMT_MONO_VLSB (0)
+#define FMT_MONO_HLSB (3)
+
+// 图形类型, 与drawer.py中的SHAPE_*相同
+#define SHAPE_FILL_RECT (0)
+#define SHAPE_ROUND_RECT (1)
+#define SHAPE_ICON_SELECTOR (2)
+#define SHAPE_DASH (3)
+
+// 每个图形占用的int16个数: op, x, y, w, h, c, a, b
+#define SHAPE_SIZE (8)
+
+typedef struct _target_t {
+    uint8_t *buf;
+    mp_int_t fmt;
+    mp_int_t w;
+    // 裁剪矩形, 右边和下边不包括在内
+    mp_int_t x0, y0, x1, y1;
+} target_t;
+
+static void fill_rect(const target_t *t, mp_int_t x, mp_int_t y, mp_int_t w, mp_int_t h, mp_int_t c) {
+    mp_int_t xe = x + w;
+    mp_int_t ye = y + h;
+    if (x < t->x0) {
+        x = t->x0;
+    }
+    if (y < t->y0) {
+        y = t->y0;
+    }
+    if (xe > t->x1) {
+        xe = t->x1;
+    }
+    if (ye > t->y1) {
+        ye = t->y1;
+    }
+    if (x >= xe || y >= ye) {
+        return;
+    }
+    if (t->fmt == FMT_MONO_HLSB) {
+        mp_int_t stride = (t->w + 7) >> 3;
+        for (mp_int_t py = y; py < ye; py++) {
+            uint8_t *row = t->buf + py * stride;
+            for (mp_int_t px = x; px < xe; px++) {
+                uint8_t mask = 0x80 >> (px & 7);
+                if (c) {
+                    row[px >> 3] |= mask;
+                } else {
+                    row[px >> 3] &= ~mask;
+                }
+            }
+        }
+    } else {
+        for (mp_int_t py = y; py < ye; py++) {
+            uint8_t *row = t->buf + (py >> 3) * t->w;
+            uint8_t mask = 1 << (py & 7);
+            for (mp_int_t px = x; px < xe; px++) {
+                if (c) {
+                    row[px] |= mask;
+                } else {
+                    row[px] &= ~mask;
+                }
+            }
+        }
+    }
+}
+
+static void draw_shape(const target_t *t, const int16_t *s, mp_int_t oy) {
+    mp_int_t x = s[1], y = s[2] + oy, w = s[3], h = s[4], c = s[5], a = s[6], b = s[7];
+    switch (s[0]) {
+        case SHAPE_FILL_RECT:
+            fill_rect(t, x, y, w, h, c);
+            break;
+        case SHAPE_ROUND_RECT:
+            // a: 是否填充
+            if (a) {
+                fill_rect(t, x + 1, y, w - 2, 1, c);
+                fill_rect(t, x, y + 1, w, h - 2, c);
+                fill_rect(t, x + 1, y + h - 1, w - 2, 1, c);
+            } else {
+                fill_rect(t, x + 1, y, w - 2, 1, c);
+                fill_rect(t, x, y + 1, 1, h - 1, c);
+                fill_rect(t, x + w - 1, y + 1, 1, h - 1, c);
+                fill_rect(t, x + 1, y + h, w - 2, 1, c);
+            }
+            break;
+        case SHAPE_ICON_SELECTOR: {
+            // a: 角的长度, b: 与图标的间距
+            mp_int_t xs = x - b, ys = y - b, xw = x + w, yh = y + h;
+            fill_rect(t, xs, ys, a + 1, 1, c);
+            fill_rect(t, xs, ys + 1, 1, a, c);
+            fill_rect(t, xw - a, ys, a + 1, 1, c);
+            fill_rect(t, xw, ys + 1, 1, a, c);
+            fill_rect(t, xs, yh, a + 1, 1, c);
+            fill_rect(t, xs, yh - a, 1, a + 1, c);
+            fill_rect(t, xw - a, yh, a + 1, 1, c);
+            fill_rect(t, xw, yh - a, 1, a + 1, c);
+            break;
+        }
+        case SHAPE_DASH:
+            // 水平虚线, a: 每一段的长度, 从空白段开始
+            if (a <= 0) {
+                break;
+            }
+            for (mp_int_t px = x + a; px < x + w; px += a * 2) {
+                fill_rect(t, px, y, px + a > x + w ? x + w - px : a, 1, c);
+            }
+            break;
+    }
+}
+
+// draw(buf, fmt, w, h, ops, count, x0, y0, x1, y1, oy)
+// 依次绘制ops(array('h'))中的前count个图形, 图形的y坐标加上oy,
+// 只绘制裁剪矩形(x0, y0, x1, y1, 帧缓冲区坐标)内的像素
+static mp_obj_t shapes_draw(size_t n_args, const mp_obj_t *args) {
+    mp_buffer_info_t buf_info, ops_info;
+    mp_get_buffer_raise(args[0], &buf_info, MP_BUFFER_WRITE);
+    mp_get_buffer_raise(args[4], &ops_info, MP_BUFFER_READ);
+
+    target_t t;
+    t.buf = (uint8_t *)buf_info.buf;
+    t.fmt = mp_obj_get_int(args[1]);
+    t.w = mp_obj_get_int(args[2]);
+    mp_int_t h = mp_obj_get_int(args[3]);
+    if (t.fmt != FMT_MONO_HLSB && t.fmt != FMT_MONO_VLSB) {
+        mp_raise_ValueError(MP_ERROR_TEXT("unsupported format"));
+    }
+    size_t need = t.fmt == FMT_MONO_HLSB ? (size_t)(((t.w + 7) >> 3) * h) : (size_t)(((h + 7) >> 3) * t.w);
+    if (buf_info.len < need) {
+        mp_raise_ValueError(MP_ERROR_TEXT("buffer too small"));
+    }
+    size_t count = mp_obj_get_int(args[5]);
+    if (count * SHAPE_SIZE * sizeof(int16_t) > ops_info.len) {
+        mp_raise_ValueError(MP_ERROR_TEXT("ops too short"));
+    }
+
+    // 裁剪矩形不能超出缓冲区
+    t.x0 = mp_obj_get_int(args[6]);
+    t.y0 = mp_obj_get_int(args[7]);
+    t.x1 = mp_obj_get_int(args[8]);
+    t.y1 = mp_obj_get_int(args[9]);
+    if (t.x0 < 0) {
+        t.x0 = 0;
+    }
+    if (t.y0 < 0) {
+        t.y0 = 0;
+    }
+    if (t.x1 > t.w) {
+        t.x1 = t.w;
+    }
+    if (t.y1 > h) {
+        t.y1 = h;
+    }
+
+    mp_int_t oy = mp_obj_get_int(args[10]);
+    const int16_t *ops = (const int16_t *)ops_info.buf;
+    for (size_t i = 0; i < count; i++) {
+        draw_shape(&t, ops + i * SHAPE_SIZE, oy);
+    }
+    return mp_const_none;
+}
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(shapes_draw_obj, 11, 11, shapes_draw);
+
+// 模块初始化函数（入口点）
+mp_obj_t mpy_init(mp_obj_fun_bc_t *self, size_t n_args, size_t n_kw, mp_obj_t *args) {
+    MP_DYNRUNTIME_INIT_ENTRY
+
+    // 设置模块名
+    mp_store_global(MP_QSTR___name__, MP_OBJ_NEW_QSTR(MP_QSTR_shapes));
+
+    // 导出函数：shapes.draw = ...
+    mp_store_global(MP_QSTR_draw, MP_OBJ_FROM_PTR(&shapes_draw_obj));
+
+    MP_DYNRUNTIME_INIT_EXIT
+}
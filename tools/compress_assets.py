@@ -0,0 +1,195 @@
+"""
+compress icons and fonts
+压缩图标和字体, 在电脑上运行(CPython 3), 也可以在支持deflate压缩的MicroPython上运行
+
+    python tools/compress_assets.py examples/files/a.pbm examples/files/output.bmf
+    python tools/compress_assets.py --block 6 -o out/ examples/files/output.bmf
+
+图标(.pbm, P4格式) -> name.rle.pbm(R4格式): 头部与P4相同, 数据为每行与上一行异或后RLE压缩的P4数据,
+    适合大片空白或线条较多的图标
+字体(.bmf) -> name.z.bmf: 字形按块(默认每32个一块)用deflate压缩, 读取字形时只解压所在的块
+    (MicroPython 1.21以上的deflate模块, 字形较密的中文字体RLE几乎没有效果)
+
+使用压缩的文件只需修改路径(Icon的filepath, config.font_path或bitmap_font的参数), 格式由文件头判断
+
+参数:
+    -o DIR      输出目录(默认与输入文件相同)
+    --block N   字体每块2^N个字形(默认5), 越大压缩率越高, 读取一个字形时解压的数据也越多
+    --wbits N   deflate窗口2^N字节(默认9, 9~15), 解压时需要同样大小的内存
+
+last edited: 2025.8.27
+"""
+import sys
+import struct
+
+try:
+    import zlib
+except ImportError:
+    zlib = None
+    import io
+    import deflate
+
+RLE_MAGIC = b'R4'
+
+def rle_encode(data) -> bytes:
+    """
+    RLE压缩, 解压见CrabUI/libs/kernels.py的rle_decode
+
+    控制字节c < 0x80: 之后的c+1个字节原样复制; c >= 0x80: 之后的一个字节重复c-0x7e次(2~129)
+
+    Args:
+        data: 原始数据
+
+    Returns:
+        bytes: 压缩的数据
+    """
+    out = bytearray()
+    literal = bytearray()
+    n = len(data)
+    i = 0
+    while i < n:
+        j = i + 1
+        while j < n and data[j] == data[i] and j - i < 129:
+            j += 1
+        # 长度为2的重复只在不打断原样复制时使用
+        if j - i >= 3 or (j - i == 2 and not literal):
+            while literal:
+                out.append(len(literal[:128]) - 1)
+                out += literal[:128]
+                literal = literal[128:]
+            out.append(j - i + 0x7e)
+            out.append(data[i])
+            i = j
+        else:
+            literal.append(data[i])
+            i += 1
+    while literal:
+        out.append(len(literal[:128]) - 1)
+        out += literal[:128]
+        literal = literal[128:]
+    return bytes(out)
+
+def deflate_raw(data, wbits) -> bytes:
+    """
+    deflate压缩(没有头部和校验), 与deflate.DeflateIO(stream, deflate.RAW, wbits)对应
+
+    Args:
+        data: 原始数据
+        wbits: 窗口大小为2^wbits字节
+
+    Returns:
+        bytes: 压缩的数据
+    """
+    if zlib:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -wbits)
+        return compressor.compress(data) + compressor.flush()
+    stream = io.BytesIO()
+    with deflate.DeflateIO(stream, deflate.RAW, wbits) as f:
+        f.write(data)
+    return stream.getvalue()
+
+def compress_pbm(data) -> bytes:
+    """
+    P4格式的PBM图像 -> R4格式
+
+    Args:
+        data: PBM文件的内容
+
+    Returns:
+        bytes: R4文件的内容
+    """
+    magic, rest = data.split(b'\n', 1)
+    if magic.strip() != b'P4':
+        raise ValueError('only binary (P4) PBM files are supported')
+    size, pixels = rest.split(b'\n', 1)
+    # 每行与上一行异或: 与上一行相同的部分变为0, 可以压缩成很短的重复
+    stride = (int(size.split()[0]) + 7) // 8
+    delta = bytearray(pixels)
+    for i in range(stride, len(pixels)):
+        delta[i] ^= pixels[i - stride]
+    return RLE_MAGIC + b'\n' + size + b'\n' + rle_encode(delta)
+
+def compress_bmf(data, block_shift=5, wbits=9) -> bytes:
+    """
+    压缩BMF字体
+
+    布局: 头部(16字节, 保留字节9=1, 10=block_shift, 11=wbits)和字符表与原文件相同,
+    之后是每块的起始位置(4字节, 大端, 从文件开头计算)和压缩的块
+
+    Args:
+        data: BMF文件的内容
+        block_shift: 每块2^block_shift个字形
+        wbits: deflate窗口2^wbits字节
+
+    Returns:
+        bytes: 压缩的字体
+    """
+    header = bytearray(data[:16])
+    if header[9]:
+        raise ValueError('font is already compressed')
+    start_bitmap = struct.unpack('>I', b'\x00' + data[4:7])[0]
+    bitmap_size = data[8]
+    count = (start_bitmap - 16) // 2
+    block = bitmap_size << block_shift
+    blocks = [deflate_raw(data[start_bitmap+i:start_bitmap+i+block], wbits)
+              for i in range(0, count * bitmap_size, block)]
+    header[9] = 1
+    header[10] = block_shift
+    header[11] = wbits
+    out = bytearray(header)
+    out += data[16:start_bitmap]
+    offset = start_bitmap + 4 * len(blocks)
+    for compressed in blocks:
+        out += struct.pack('>I', offset)
+        offset += len(compressed)
+    for compressed in blocks:
+        out += compressed
+    return bytes(out)
+
+def output_path(path, out_dir, suffix) -> str:
+    """name.ext -> [out_dir/]name.suffix.ext"""
+    head, _, name = path.rpartition('/')
+    base, _, ext = name.rpartition('.')
+    if out_dir is not None: head = out_dir.rstrip('/')
+    return (head + '/' if head else '') + base + '.' + suffix + '.' + ext
+
+def main():
+    args = sys.argv[1:]
+    out_dir = None
+    block_shift = 5
+    wbits = 9
+    paths = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '-o':
+            i += 1
+            out_dir = args[i]
+        elif arg == '--block':
+            i += 1
+            block_shift = int(args[i])
+        elif arg == '--wbits':
+            i += 1
+            wbits = int(args[i])
+        else:
+            paths.append(arg)
+        i += 1
+    if not paths:
+        print(__doc__)
+        return
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.bmf'):
+            result = compress_bmf(data, block_shift, wbits)
+            dst = output_path(path, out_dir, 'z')
+        else:
+            result = compress_pbm(data)
+            dst = output_path(path, out_dir, 'rle')
+        with open(dst, 'wb') as f:
+            f.write(result)
+        print('{} -> {}: {} -> {} bytes ({:.0f}%)'.format(path, dst, len(data), len(result),
+                                                          100 * len(result) / max(1, len(data))))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+make icon atlas
+把多个PBM图标(P4格式)合并为一个图集文件(A4格式, 见CrabUI/libs/upbm.py), 在电脑上运行(CPython 3)
+
+    python tools/make_atlas.py -o examples/files/icons.atlas examples/files/a.pbm examples/files/b.pbm
+
+图标按参数的顺序上下排列, 名称为文件名(不含扩展名), 使用时路径为"图集路径#名称":
+    ui.Icon(menu, 'files/icons.atlas#a', 'title')
+所有图标只需打开一次文件, 数据保存在一个缓冲区中
+
+last edited: 2025.8.27
+"""
+import sys
+
+ATLAS_MAGIC = b'A4'
+
+def read_pbm(data) -> tuple:
+    """
+    Args:
+        data: P4格式PBM文件的内容
+
+    Returns:
+        tuple: (宽度, 高度, 图像数据)
+    """
+    magic, size, pixels = data.split(b'\n', 2)
+    if magic.strip() != b'P4':
+        raise ValueError('only binary (P4) PBM files are supported')
+    w, h = (int(n) for n in size.split())
+    return w, h, pixels[:(w + 7) // 8 * h]
+
+def make_atlas(icons) -> bytes:
+    """
+    Args:
+        icons: [(名称, P4格式PBM文件的内容), ...]
+
+    Returns:
+        bytes: 图集文件的内容
+    """
+    images = [(name,) + read_pbm(data) for name, data in icons]
+    for name, _, _, _ in images:
+        if not name or ' ' in name or '#' in name:
+            raise ValueError('bad icon name: {!r}'.format(name))
+    width = max(w for _, w, _, _ in images)
+    stride = (width + 7) // 8
+    height = sum(h for _, _, h, _ in images)
+    header = [ATLAS_MAGIC, '{} {} {}'.format(width, height, len(images)).encode()]
+    sheet = bytearray()
+    y = 0
+    for name, w, h, pixels in images:
+        header.append('{} {} {} {}'.format(name, y, w, h).encode())
+        row = (w + 7) // 8
+        for i in range(h):
+            # 较窄的图标每行补0到图集的宽度
+            sheet += pixels[i*row:(i+1)*row] + bytes(stride - row)
+        y += h
+    return b'\n'.join(header) + b'\n' + bytes(sheet)
+
+def main():
+    args = sys.argv[1:]
+    if len(args) < 3 or args[0] != '-o':
+        print(__doc__)
+        return
+    icons = []
+    for path in args[2:]:
+        with open(path, 'rb') as f:
+            icons.append((path.rsplit('/', 1)[-1].rsplit('.', 1)[0], f.read()))
+    data = make_atlas(icons)
+    with open(args[1], 'wb') as f:
+        f.write(data)
+    print('{} icons -> {}: {} bytes'.format(len(icons), args[1], len(data)))
+
+if __name__ == '__main__':
+    main()